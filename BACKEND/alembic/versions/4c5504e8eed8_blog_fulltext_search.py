@@ -0,0 +1,82 @@
+"""blog fulltext search
+
+Revision ID: 4c5504e8eed8
+Revises: 62a605128921
+Create Date: 2026-10-18 10:12:41.502113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c5504e8eed8'
+down_revision: Union[str, Sequence[str], None] = '62a605128921'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Başlık (A) > özet (B) > içerik (C) ağırlıkları
+BLOG_VECTOR_SQL = """
+    setweight(to_tsvector('turkish_unaccent', coalesce({p}title, '')), 'A') ||
+    setweight(to_tsvector('turkish_unaccent', coalesce({p}preview, '')), 'B') ||
+    setweight(to_tsvector('turkish_unaccent', coalesce({p}content, '')), 'C')
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # unaccent + Türkçe kök bulucu: "öğrenme" ile "ogrenmek" aynı kökte eşleşir
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'turkish_unaccent') THEN
+                CREATE TEXT SEARCH CONFIGURATION turkish_unaccent (COPY = turkish);
+                ALTER TEXT SEARCH CONFIGURATION turkish_unaccent
+                    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, turkish_stem;
+            END IF;
+        END
+        $$;
+        """
+    )
+
+    op.add_column('blogs', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    # unaccent IMMUTABLE olmadığı için GENERATED kolon kullanılamıyor; tetikleyici ile tutuluyor
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION blogs_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {BLOG_VECTOR_SQL.format(p='NEW.')};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER blogs_search_vector_trg
+        BEFORE INSERT OR UPDATE OF title, preview, content ON blogs
+        FOR EACH ROW EXECUTE FUNCTION blogs_search_vector_update();
+        """
+    )
+
+    # Mevcut kayıtları doldur
+    op.execute(f"UPDATE blogs SET search_vector = {BLOG_VECTOR_SQL.format(p='')}")
+
+    op.create_index('ix_blogs_search_vector', 'blogs', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_blogs_search_vector', table_name='blogs')
+    op.execute("DROP TRIGGER IF EXISTS blogs_search_vector_trg ON blogs")
+    op.execute("DROP FUNCTION IF EXISTS blogs_search_vector_update()")
+    op.drop_column('blogs', 'search_vector')
+    op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS turkish_unaccent")
+    # unaccent eklentisi başka nesneler tarafından kullanılıyor olabilir; bırakılıyor
@@ -0,0 +1,65 @@
+"""community trigram search
+
+Revision ID: 9e1d7b3f2a60
+Revises: 4c5504e8eed8
+Create Date: 2026-10-18 11:03:27.918254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e1d7b3f2a60'
+down_revision: Union[str, Sequence[str], None] = '4c5504e8eed8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRGM_COLUMNS = ('first_name', 'last_name', 'email')
+
+
+def _index_name(col: str) -> str:
+    return f'ix_community_applications_{col}_trgm'
+
+
+def _drop_invalid(name: str) -> None:
+    # Yarıda kalan CONCURRENTLY işlemi geçersiz (INVALID) indeks bırakır;
+    # IF NOT EXISTS onu atlayacağı için önce silinir. `alembic --sql` (offline)
+    # modunda sorgulanacak veritabanı yoktur.
+    if op.get_context().as_sql:
+        return
+    invalid = op.get_bind().execute(
+        sa.text(
+            "SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {'name': name},
+    ).first()
+    if invalid:
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # pg_trgm GIN indeksleri hem ILIKE '%q%' hem de benzerlik (%, <%) operatörlerini karşılar.
+    # GIN kurulumu büyük tabloda uzun sürer; CONCURRENTLY başvuru yazmalarını
+    # kilitlemez ama transaction içinde çalışamaz (bkz. c8d2f6a4e917)
+    with op.get_context().autocommit_block():
+        for col in TRGM_COLUMNS:
+            _drop_invalid(_index_name(col))
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {_index_name(col)} '
+                f'ON community_applications USING gin ({col} gin_trgm_ops)'
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for col in TRGM_COLUMNS:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {_index_name(col)}')
+    # pg_trgm eklentisi başka nesneler tarafından kullanılıyor olabilir; bırakılıyor
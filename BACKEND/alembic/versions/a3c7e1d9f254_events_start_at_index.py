@@ -0,0 +1,32 @@
+"""events start_at index
+
+Revision ID: a3c7e1d9f254
+Revises: e5a9c3f1b8d4
+Create Date: 2026-10-18 19:12:44.083519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c7e1d9f254'
+down_revision: Union[str, Sequence[str], None] = 'e5a9c3f1b8d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # /events/upcoming (start_at >= now() ORDER BY start_at LIMIT n) indeksi
+    # c8d2f6a4e917'de CONCURRENTLY kurulan ix_events_start_at_id'dir. Burada
+    # kilitli (CONCURRENTLY olmayan) bir indeks kurulup hemen ardından
+    # silinmesin diye bu revizyon boştur; zincir bozulmasın diye durur.
+    pass
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    pass
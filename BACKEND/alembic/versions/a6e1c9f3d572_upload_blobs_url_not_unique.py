@@ -0,0 +1,35 @@
+"""upload blobs url not unique
+
+Revision ID: a6e1c9f3d572
+Revises: f2b8d4a6c1e3
+Create Date: 2026-10-19 10:05:12.447120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6e1c9f3d572'
+down_revision: Union[str, Sequence[str], None] = 'f2b8d4a6c1e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # url artık temiz kopyanın adresi; sadece meta verisi farklı iki yükleme
+    # aynı temiz dosyayı paylaşabilir. GC ve tekrar yükleme kontrolü url ile arar.
+    op.drop_constraint('upload_blobs_url_key', 'upload_blobs', type_='unique')
+    op.create_index('ix_upload_blobs_url', 'upload_blobs', ['url'])
+    # Eski kod türetme hatasında boş liste yazıyordu; tekrar denenebilsin diye
+    # tamamlanmamış sayılır (hareketli GIF'ler ilk yeniden yüklemede tekrar [] olur)
+    op.execute("UPDATE upload_blobs SET variants = NULL WHERE variants::text = '[]'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_upload_blobs_url', table_name='upload_blobs')
+    op.create_unique_constraint('upload_blobs_url_key', 'upload_blobs', ['url'])
@@ -0,0 +1,34 @@
+"""table versions
+
+Revision ID: b3d5f7a9c164
+Revises: a6e1c9f3d572
+Create Date: 2026-10-19 11:20:44.901337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d5f7a9c164'
+down_revision: Union[str, Sequence[str], None] = 'a6e1c9f3d572'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Satırlar ilk yazmada upsert ile oluşur (bkz. app/versions.py)
+    op.create_table(
+        'table_versions',
+        sa.Column('table_name', sa.String(length=100), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('table_name'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('table_versions')
@@ -0,0 +1,44 @@
+"""image variants
+
+Revision ID: b7e2c4a91d35
+Revises: 9e1d7b3f2a60
+Create Date: 2026-10-18 14:05:12.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c4a91d35'
+down_revision: Union[str, Sequence[str], None] = '9e1d7b3f2a60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# tablo -> türev kolonu (görsel kolonunun yanında tutulur, bkz. app/images.py)
+VARIANT_COLUMNS = [
+    ('timeline_events', 'image_variants'),
+    ('events', 'cover_image_variants'),
+    ('gallery_events', 'image_variants'),
+    ('posters', 'image_variants'),
+    ('blogs', 'cover_image_variants'),
+    ('teams', 'photo_variants'),
+    ('journey_people', 'photo_variants'),
+    ('crew_members', 'photo_variants'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Mevcut kayıtlar NULL kalır: türevi olmayan görsel, istemcide sadece orijinal URL ile gösterilir
+    for table, column in VARIANT_COLUMNS:
+        op.add_column(table, sa.Column(column, sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in reversed(VARIANT_COLUMNS):
+        op.drop_column(table, column)
@@ -0,0 +1,38 @@
+"""admin token revocation
+
+Revision ID: c1e4a8f2d6b9
+Revises: b3d5f7a9c164
+Create Date: 2026-10-19 13:02:37.118254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1e4a8f2d6b9'
+down_revision: Union[str, Sequence[str], None] = 'b3d5f7a9c164'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Mevcut token'larda `ver` yoktur ve 0 sayılır; geçerli kalırlar
+    op.add_column('admins', sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'))
+    op.create_table(
+        'revoked_tokens',
+        sa.Column('token_hash', sa.String(length=64), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('token_hash'),
+    )
+    op.create_index(op.f('ix_revoked_tokens_expires_at'), 'revoked_tokens', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_revoked_tokens_expires_at'), table_name='revoked_tokens')
+    op.drop_table('revoked_tokens')
+    op.drop_column('admins', 'token_version')
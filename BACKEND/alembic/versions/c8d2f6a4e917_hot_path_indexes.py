@@ -0,0 +1,70 @@
+"""hot path indexes
+
+Revision ID: c8d2f6a4e917
+Revises: a3c7e1d9f254
+Create Date: 2026-10-18 19:48:03.662190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8d2f6a4e917'
+down_revision: Union[str, Sequence[str], None] = 'a3c7e1d9f254'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (ad, tablo, kolonlar, WHERE) — sıralar crud sorgularının ORDER BY'ı ile aynıdır
+INDEXES = [
+    # /events listesi: ORDER BY start_at DESC, id DESC (geriye tarama) ve
+    # /events/upcoming: start_at >= now() ORDER BY start_at.
+    ('ix_events_start_at_id', 'events', 'start_at, id', None),
+    ('ix_blogs_date_id', 'blogs', 'date DESC, id DESC', None),
+    ('ix_posters_active_order', 'posters', 'is_active, order_index, id', None),
+    ('ix_crew_members_category_order', 'crew_members', 'category, order_index, created_at, id', None),
+    ('ix_journey_people_year_created', 'journey_people', 'year DESC, created_at, id', None),
+    ('ix_gallery_events_date', 'gallery_events', 'date DESC', None),
+    # Öne çıkan takımlar azınlıktır; kısmi indeks sadece onları tutar
+    ('ix_teams_featured', 'teams', 'id', 'is_featured'),
+    ('ix_community_applications_status_created', 'community_applications', 'status, created_at DESC, id DESC', None),
+]
+
+
+def _drop_invalid(name: str) -> None:
+    # Yarıda kalan CONCURRENTLY işlemi geçersiz (INVALID) indeks bırakır;
+    # IF NOT EXISTS onu atlayacağı için önce silinir. `alembic --sql` (offline)
+    # modunda sorgulanacak veritabanı yoktur.
+    if op.get_context().as_sql:
+        return
+    invalid = op.get_bind().execute(
+        sa.text(
+            "SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {'name': name},
+    ).first()
+    if invalid:
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY tablo yazmalarını kilitlemez ama transaction içinde çalışamaz
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            _drop_invalid(name)
+            predicate = f' WHERE {where}' if where else ''
+            op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns}){predicate}')
+        # a3c7e1d9f254'ün eski hâlini uygulamış veritabanlarında kalan tek kolonlu indeks
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_events_start_at')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _, _, _ in reversed(INDEXES):
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
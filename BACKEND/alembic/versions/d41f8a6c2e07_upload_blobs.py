@@ -0,0 +1,41 @@
+"""upload blobs
+
+Revision ID: d41f8a6c2e07
+Revises: b7e2c4a91d35
+Create Date: 2026-10-18 15:42:37.904511
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f8a6c2e07'
+down_revision: Union[str, Sequence[str], None] = 'b7e2c4a91d35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Eski uuid adlı dosyalar yerinde kalır; dizine sadece yeni yüklemeler girer
+    op.create_table(
+        'upload_blobs',
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('url', sa.String(length=255), nullable=False),
+        sa.Column('content_type', sa.String(length=50), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('variants', sa.JSON(), nullable=True),
+        sa.Column('upload_count', sa.Integer(), nullable=False, server_default='1'),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('last_uploaded_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('sha256'),
+        sa.UniqueConstraint('url'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('upload_blobs')
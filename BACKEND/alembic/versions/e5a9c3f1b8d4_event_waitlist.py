@@ -0,0 +1,40 @@
+"""event waitlist
+
+Revision ID: e5a9c3f1b8d4
+Revises: d41f8a6c2e07
+Create Date: 2026-10-18 18:05:12.417362
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a9c3f1b8d4'
+down_revision: Union[str, Sequence[str], None] = 'd41f8a6c2e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'event_waitlist',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=150), nullable=True),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('event_id', 'email', name='uq_event_waitlist_event_email'),
+    )
+    op.create_index(op.f('ix_event_waitlist_event_id'), 'event_waitlist', ['event_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_event_waitlist_event_id'), table_name='event_waitlist')
+    op.drop_table('event_waitlist')
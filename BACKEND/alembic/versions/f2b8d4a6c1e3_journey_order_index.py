@@ -0,0 +1,48 @@
+"""journey order index
+
+Revision ID: f2b8d4a6c1e3
+Revises: c8d2f6a4e917
+Create Date: 2026-10-18 21:12:40.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8d4a6c1e3'
+down_revision: Union[str, Sequence[str], None] = 'c8d2f6a4e917'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('journey_people', sa.Column('order_index', sa.Integer(), nullable=True))
+    # Mevcut görünen sıra korunur: yıl içinde created_at, id → 1, 2, 3...
+    op.execute(
+        'UPDATE journey_people AS jp SET order_index = ranked.position '
+        'FROM (SELECT id, row_number() OVER (PARTITION BY year ORDER BY created_at, id) AS position '
+        'FROM journey_people) AS ranked '
+        'WHERE jp.id = ranked.id'
+    )
+    # Gruplu liste artık year DESC, order_index, created_at, id ile sıralanır
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_journey_people_year_order '
+            'ON journey_people (year DESC, order_index, created_at, id)'
+        )
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_journey_people_year_created')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_journey_people_year_created '
+            'ON journey_people (year DESC, created_at, id)'
+        )
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_journey_people_year_order')
+    op.drop_column('journey_people', 'order_index')
@@ -0,0 +1,296 @@
+# app/cache.py
+"""
+Herkese açık GET uçları için süreç içi (in-process) yanıt önbelleği.
+
+Pydantic ile bir kez serileştirilmiş JSON baytları, rota + sorgu dizesi
+anahtarıyla saklanır. Kayıtlar TTL ile eskir, kapasite dolunca en az
+kullanılan (LRU) kayıt atılır. Her kayıt bağlı olduğu tabloların içerik
+sürümlerini (`app/versions.py`) taşır. Sürümler veritabanındadır. Her
+worker onları en fazla VERSIONS_REFRESH_INTERVAL saniyede bir tek sorguyla
+tazeler. Bu worker'daki yazma kaydı hemen geçersiz kılar; başka bir
+worker'daki yazma ise en geç bu aralık sonunda geçersiz kılar.
+
+Her kayıt için gövdenin özetinden güçlü bir ETag üretilir. İstemci aynı
+ETag'i `If-None-Match` ile gönderirse sorgu ve serileştirme yapılmadan
+`304 Not Modified` döner. ETag içerikten türediği için tüm worker'larda
+aynıdır. Sıkıştırılmış gösterim bayt bayt farklı olduğundan her kodlama
+kendi güçlü ETag'ini alır (`"<özet>-br"`, `"<özet>-gzip"`); bu yüzden
+karşılaştırma da istemciye gönderilen değerle yapılır.
+
+Sonucu belli bir anda kendiliğinden değişen görünümler (ör. yaklaşan
+etkinlikler: en yakın etkinliğin saati geçince listeden düşer) `expires`
+ile kaydın ömrünü o ana kadar kısaltır. `max_age` verilirse yanıt
+`Cache-Control: public, max-age` ve `Expires` ile tarayıcı/CDN'de de
+önbelleklenebilir; süre kaydın kalan ömrünü hiçbir zaman aşmaz.
+
+Yanıt sıkıştırması da burada yapılır (bkz. app/compression.py): istemcinin
+kabul ettiği kodlamadaki gövde kayıtla birlikte saklanır, aynı JSON her
+isabette yeniden sıkıştırılmaz.
+
+Not: Önbelleğin kendisi (gövdeler) her uvicorn worker'ında ayrıdır; sadece
+geçerlilik kararı ortak sürümlere dayanır. İsabetli istekler sorgu
+çalıştırmaz; aralığı dolduran tek bir istek sürüm okumasını öder.
+"""
+import hashlib
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from . import versions
+from .compression import COMPRESSION_MIN_SIZE, compress, encode_for
+from .pagination import Page, page_headers
+
+# --- ENV ---
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "300"))  # saniye
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+
+
+@dataclass
+class CacheEntry:
+    body: bytes
+    etag: str
+    versions: Dict[str, int]
+    expires_at: float
+    headers: Optional[Dict[str, str]] = None
+    encoded: Dict[str, bytes] = field(default_factory=dict)  # kodlama -> sıkışık gövde
+
+    def is_fresh(self, now: float, current: Dict[str, int]) -> bool:
+        if self.expires_at <= now:
+            return False
+        return all(current.get(t, 0) == v for t, v in self.versions.items())
+
+
+class ResponseCache:
+    """TTL + LRU tahliyeli, thread-safe bayt önbelleği."""
+
+    def __init__(self, max_entries: int = 512, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: str, current: Dict[str, int]) -> Optional[CacheEntry]:
+        """`current`: bu istekte okunan tablo sürümleri (bkz. `request_versions`)."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if not entry.is_fresh(now, current):
+                del self._entries[key]
+                self.invalidations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(
+        self,
+        key: str,
+        body: bytes,
+        snapshot: Dict[str, int],
+        ttl: Optional[float] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> CacheEntry:
+        """
+        `snapshot`, veri okunmadan ÖNCE alınmış tablo sürümleridir. Okuma
+        sürerken bir yazma olduysa kayıt bir sonraki `get`'te eski sayılır.
+        """
+        entry = CacheEntry(
+            body=body,
+            etag=make_etag(body),
+            versions=snapshot,
+            expires_at=time.monotonic() + (self.ttl if ttl is None else ttl),
+            headers=headers,
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def invalidate(self, *tables: str) -> int:
+        """Verilen tablolara bağlı kayıtları hemen siler (sürümleri de artırır)."""
+        versions.bump(*tables)
+        table_set = set(tables)
+        with self._lock:
+            keys = [k for k, e in self._entries.items() if table_set & e.versions.keys()]
+            for k in keys:
+                del self._entries[k]
+            self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": RESPONSE_CACHE_ENABLED,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "versions": versions.all_versions(),
+            }
+
+
+response_cache = ResponseCache(max_entries=RESPONSE_CACHE_MAX_ENTRIES, ttl=RESPONSE_CACHE_TTL)
+
+
+# --- SERİLEŞTİRME ---
+@lru_cache(maxsize=None)
+def _adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def serialize(schema: Any, data: Any) -> bytes:
+    """ORM nesnelerini verilen şemaya göre doğrudan JSON baytlarına çevirir."""
+    adapter = _adapter(schema)
+    return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+
+
+# --- ETAG ---
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def coded_etag(etag: str, coding: str) -> str:
+    """Sıkıştırılmış gösterimin güçlü ETag'i: `"<özet>"` -> `"<özet>-<kodlama>"`."""
+    return etag[:-1] + "-" + coding + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match zayıf karşılaştırma kullanır: W/"x" ile "x" eşittir
+    candidates = (c.strip() for c in if_none_match.split(","))
+    return any((c[2:] if c.startswith("W/") else c) == etag for c in candidates)
+
+
+def _render(schema: Any, data: Any, envelope: Optional[Callable[[Page], Any]] = None):
+    # Sayfalı sonuçlarda gövde kayıtlardır (ya da `envelope` ile sarılmış hali);
+    # cursor ve toplam başlıkta taşınır
+    if isinstance(data, Page):
+        body = envelope(data) if envelope else data.items
+        return serialize(schema, body), page_headers(data)
+    return serialize(schema, data), None
+
+
+def _freshness_headers(entry: CacheEntry, max_age: Optional[int]) -> Dict[str, str]:
+    if max_age is None:
+        return {"Cache-Control": "no-cache"}
+    # Kaydın geçerliliği bittiği anda istemcide de bitmeli (aşağı yuvarlanır)
+    seconds = max(0, min(max_age, math.floor(entry.expires_at - time.monotonic())))
+    return {
+        "Cache-Control": f"public, max-age={seconds}",
+        "Expires": formatdate(time.time() + seconds, usegmt=True),
+    }
+
+
+async def request_versions(request: Request) -> Dict[str, int]:
+    """
+    Bu isteğin kararlarında kullanılan tablo sürümleri. Görünüm worker başına
+    en fazla VERSIONS_REFRESH_INTERVAL saniyede bir veritabanından tazelenir;
+    isteklerin çoğu sorgu çalıştırmaz (bkz. app/versions.py).
+    """
+    values = getattr(request.state, "table_versions", None)
+    if values is None:
+        values = request.state.table_versions = await versions.refresh_async()
+    return values
+
+
+def cache_key(request: Request) -> str:
+    # Sorgu parametreleri sıralanır: ?a=1&b=2 ile ?b=2&a=1 aynı kaydı kullanır
+    query = urlencode(sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{query}"
+
+
+async def cached_json_response(
+    request: Request,
+    tables: Iterable[str],
+    schema: Any,
+    load: Callable[[], Awaitable[Any]],
+    envelope: Optional[Callable[[Page], Any]] = None,
+    expires: Optional[Callable[[Any], Optional[float]]] = None,
+    max_age: Optional[int] = None,
+) -> Response:
+    """
+    Önbellekte varsa hazır baytları döndürür; yoksa `await load()` ile veriyi
+    çeker, serileştirir ve saklar. `load` sadece MISS durumunda çağrılır;
+    isabetli istekler veritabanına gitmez. İstemcinin ETag'i
+    güncelse gövde yerine 304 döner.
+
+    `expires(data)`: yüklenen verinin kaç saniye sonra kendiliğinden
+    değişeceği (None: zamana bağlı değil). `max_age`: yanıtın istemcide
+    önbelleklenebileceği en uzun süre (None: her istekte ETag ile doğrulanır).
+    """
+    tables = tuple(tables)
+    # Önbellek kapalıyken de okunur: sayım önbelleği (app/pagination.py) güncel sürümü görsün
+    current = await request_versions(request)
+    if not RESPONSE_CACHE_ENABLED:
+        data = await load()
+        body, extra = _render(schema, data, envelope)
+        lifetime = expires(data) if expires else None
+        expires_at = time.monotonic() + (RESPONSE_CACHE_TTL if lifetime is None else lifetime)
+        entry = CacheEntry(body=body, etag=make_etag(body), versions={}, expires_at=expires_at, headers=extra)
+        status = "BYPASS"
+    else:
+        key = cache_key(request)
+        entry = response_cache.get(key, current)
+        status = "HIT"
+        if entry is None:
+            status = "MISS"
+            snapshot = versions.snapshot(tables, current)
+            data = await load()
+            body, extra = _render(schema, data, envelope)
+            lifetime = expires(data) if expires else None
+            ttl = None if lifetime is None else max(0.0, min(response_cache.ttl, lifetime))
+            entry = response_cache.set(key, body, snapshot, ttl=ttl, headers=extra)
+
+    headers = {"ETag": entry.etag, "X-Cache": status, **(entry.headers or {})}
+    headers.update(_freshness_headers(entry, max_age))
+    headers["Vary"] = "Accept-Encoding"
+    body = entry.body
+    choice = encode_for(request.url.path, request.headers.get("accept-encoding"))
+    if choice is not None and len(body) >= COMPRESSION_MIN_SIZE:
+        coding, level = choice
+        encoded = entry.encoded.get(coding)
+        if encoded is None:
+            # Eşzamanlı iki MISS aynı değeri yazar; kilit gerekmez
+            encoded = entry.encoded[coding] = compress(body, coding, level)
+        body = encoded
+        headers["Content-Encoding"] = coding
+        headers["ETag"] = coded_etag(entry.etag, coding)
+
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
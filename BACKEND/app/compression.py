@@ -0,0 +1,229 @@
+# app/compression.py
+"""
+İçerik türüne duyarlı, pazarlıklı (negotiated) yanıt sıkıştırma.
+
+Eski `GZipMiddleware` her yanıtı (zaten sıkıştırılmış JPEG/PNG/WebP dahil)
+gzip'lemeye çalışıyordu. Burada:
+
+- Kodlama `Accept-Encoding`'e göre seçilir: br > zstd > gzip (q değerleri
+  eşitse sunucu tercihi). brotli ve zstd opsiyoneldir; paketler kurulu
+  değilse (`pip install brotli zstandard`) sadece gzip kullanılır.
+- Sadece metin tabanlı türler (JSON, HTML, JS, CSS, SVG, XML...) sıkıştırılır.
+  Görsel/video/arşiv gibi zaten sıkışık gövdeler ve `Content-Encoding`
+  taşıyan yanıtlar (ör. /public'teki .br/.gz kardeşleri) olduğu gibi geçer.
+- Seviye rota önekine göre ayarlanabilir (ROUTE_LEVELS). Dinamik yanıtlarda
+  varsayılanlar hız odaklıdır; büyük ve önbelleklenen listelerde daha yüksek
+  seviye bir kez ödenir.
+- `app/cache.py` önbellekten dönen gövdeleri kendisi sıkıştırır ve sıkışık
+  hali kayıtla birlikte saklar; isabetli isteklerde tekrar sıkıştırma yapılmaz.
+  Bu yanıtlar `Content-Encoding` taşıdığı için middleware onları atlar.
+"""
+import os
+import zlib
+from typing import Dict, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .static import accepted_encodings
+
+try:  # opsiyonel
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:  # opsiyonel
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# --- ENV ---
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # bayt; altı sıkıştırılmaz
+
+# Kodlama -> varsayılan seviye (gzip 1-9, br 0-11, zstd 1-22)
+DEFAULT_LEVELS: Dict[str, int] = {
+    "br": int(os.getenv("COMPRESSION_BR_LEVEL", "4")),
+    "zstd": int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3")),
+    "gzip": int(os.getenv("COMPRESSION_GZIP_LEVEL", "6")),
+}
+
+# Rota öneki -> seviye ayarı. Kodlama belirtilmezse varsayılan kullanılır;
+# boş sözlük yerine None verilirse o önekte sıkıştırma kapalıdır.
+ROUTE_LEVELS: Dict[str, Optional[Dict[str, int]]] = {
+    "/blogs": {"br": 6, "zstd": 6},   # uzun metin + yanıt önbelleğinde tutulur
+    "/home": {"br": 6, "zstd": 6},
+    "/public": None,                  # statik dosyalar: kardeş .br/.gz ya da ters vekil (app/static.py)
+}
+
+# Sıkıştırılabilir türler (parametresiz, küçük harf)
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/xhtml+xml",
+    "application/manifest+json",
+    "image/svg+xml",
+}
+EXCLUDED_TYPES = {"text/event-stream"}  # akış: tamponlanmamalı
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Sunucunun tercih sırasıyla desteklediği kodlamalar."""
+    codings = []
+    if brotli is not None:
+        codings.append("br")
+    if zstandard is not None:
+        codings.append("zstd")
+    codings.append("gzip")
+    return tuple(codings)
+
+
+AVAILABLE_ENCODINGS = available_encodings()
+
+
+def levels_for(path: str) -> Optional[Dict[str, int]]:
+    """Yol için kodlama seviyeleri; None ise bu yolda sıkıştırma yapılmaz."""
+    for prefix, levels in ROUTE_LEVELS.items():
+        if path == prefix or path.startswith(prefix + "/"):
+            return None if levels is None else {**DEFAULT_LEVELS, **levels}
+    return DEFAULT_LEVELS
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """İstemcinin kabul ettiği, en yüksek q'lu sunucu kodlaması (yoksa None)."""
+    accepted = accepted_encodings(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in AVAILABLE_ENCODINGS:
+        q = accepted.get(coding, wildcard)
+        if q > best_q:  # eşitlikte tercih sırası korunur
+            best, best_q = coding, q
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    media = (content_type or "").split(";", 1)[0].strip().lower()
+    if not media or media in EXCLUDED_TYPES:
+        return False
+    return (
+        media.startswith("text/")
+        or media in COMPRESSIBLE_TYPES
+        or media.endswith("+json")
+        or media.endswith("+xml")
+    )
+
+
+class _Encoder:
+    """Akan gövdeyi parça parça sıkıştırır."""
+
+    def __init__(self, coding: str, level: int):
+        self.coding = coding
+        if coding == "br":
+            self._obj = brotli.Compressor(quality=level)
+        elif coding == "zstd":
+            self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+        else:
+            self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31: gzip başlığı
+
+    def compress(self, data: bytes) -> bytes:
+        if self.coding == "br":
+            return self._obj.process(data)
+        return self._obj.compress(data)
+
+    def finish(self) -> bytes:
+        if self.coding == "br":
+            return self._obj.finish()
+        return self._obj.flush()
+
+
+def compress(data: bytes, coding: str, level: int) -> bytes:
+    encoder = _Encoder(coding, level)
+    return encoder.compress(data) + encoder.finish()
+
+
+def encode_for(path: str, accept_encoding: Optional[str]) -> Optional[Tuple[str, int]]:
+    """Bu istek için (kodlama, seviye); sıkıştırma yapılmayacaksa None."""
+    levels = levels_for(path)
+    if levels is None:
+        return None
+    coding = negotiate(accept_encoding)
+    if coding is None:
+        return None
+    return coding, levels[coding]
+
+
+# --- MIDDLEWARE ---
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        choice = encode_for(scope["path"], Headers(scope=scope).get("accept-encoding"))
+        if choice is None:
+            return await self.app(scope, receive, send)
+        await _CompressionResponder(self.app, choice[0], choice[1], self.minimum_size)(scope, receive, send)
+
+
+class _CompressionResponder:
+    def __init__(self, app: ASGIApp, coding: str, level: int, minimum_size: int):
+        self.app = app
+        self.coding = coding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.send: Send = None
+        self.start_message: Optional[Message] = None
+        self.passthrough = False
+        self.encoder: Optional[_Encoder] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Başlıklar gövdenin ilk parçası görülene kadar bekletilir
+            headers = Headers(raw=message["headers"])
+            self.start_message = message
+            self.passthrough = "content-encoding" in headers or not is_compressible(headers.get("content-type"))
+            if self.passthrough:
+                await self.send(message)
+            return
+        if message_type != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body and len(body) < self.minimum_size:
+                self.passthrough = True
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+            self.encoder = _Encoder(self.coding, self.level)
+            headers["Content-Encoding"] = self.coding
+            # Sıkışık gösterim bayt bayt aynı değildir; güçlü ETag zayıfa çevrilir
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = "W/" + etag
+            if not more_body:
+                body = self.encoder.compress(body) + self.encoder.finish()
+                headers["Content-Length"] = str(len(body))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            # Akış: uzunluk önceden bilinmez
+            del headers["Content-Length"]
+            await self.send(self.start_message)
+
+        chunk = self.encoder.compress(body)
+        if not more_body:
+            chunk += self.encoder.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -0,0 +1,3 @@
+# Yazmalar tablo sürümlerini kendi transaction'larında artırsın diye oturum
+# olayları crud ile birlikte yüklenir (bkz. app/versions.py)
+from .. import versions  # noqa: F401
@@ -1,31 +1,133 @@
 # backend/app/crud/blog.py
-from typing import List, Optional, Tuple
+from typing import Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import select, desc, or_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, desc, func, null, cast, Double
 from app.models import Blog
+from app.pagination import (
+    Page, keyset_after, make_page, total_mode, known_total, remember_total, with_window_total, TOTAL_WINDOW,
+    count_version, count_version_async,
+)
 from app.schemas.blog import BlogCreate, BlogUpdate
 
+# --- TAM METİN ARAMA ---
+# `blogs.search_vector` tetikleyiciyle tutulur (başlık A, özet B, içerik C ağırlıklı)
+# ve GIN indekslidir. Sorgu da aynı Türkçe + unaccent yapılandırmasıyla çözülür.
+SEARCH_CONFIG = "turkish_unaccent"  # PG diyalekti ilk argümanı ::regconfig olarak cast eder
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2"
+
+# --- LİSTE PROJEKSİYONU ---
+# Kart listesi `content` kolonunu hiç çekmez. Özeti olmayan yazılar için
+# içeriğin sadece ilk PREVIEW_FALLBACK_CHARS karakteri veritabanında kesilir.
+PREVIEW_FALLBACK_CHARS = 200
+_BASE_COLUMNS = (Blog.id, Blog.title, Blog.author, Blog.category, Blog.cover_image, Blog.cover_image_variants, Blog.date)
+CARD_COLUMNS = _BASE_COLUMNS + (
+    func.coalesce(Blog.preview, func.substr(Blog.content, 1, PREVIEW_FALLBACK_CHARS)).label("preview"),
+)
+# Tam kayıt (admin düzenleme ekranı): preview olduğu gibi döner, aksi halde kayıtta geri yazılırdı
+FULL_COLUMNS = _BASE_COLUMNS + (Blog.preview, Blog.content)
+
+def _list_stmts(
+    q: Optional[str],
+    category: Optional[str],
+    page: int,
+    page_size: int,
+    cursor: Optional[str],
+    highlight: bool = False,
+    include_content: bool = False,
+):
+    """
+    Satırlar kart kolonları (+ istenirse `content`) ile `rank` ve `highlight`
+    kolonlarını taşır. Arama yoksa rank ve highlight NULL'dır ve liste (date, id)
+    ile sıralanır; arama varsa önce ts_rank'e göre sıralanır ve cursor
+    anahtarına rank da girer.
+
+    Dönen `mode`, toplamın nasıl bulunacağıdır (bkz. app/pagination.py);
+    `count_stmt` sadece toplam sayfa sorgusundan çıkmazsa çalıştırılır.
+    """
+    columns = FULL_COLUMNS if include_content else CARD_COLUMNS
+    q = (q or "").strip()
+    if q:
+        tsq = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        # ts_rank real döner; cursor'da birebir geri okunabilsin diye double'a çevrilir
+        rank = cast(func.ts_rank(Blog.search_vector, tsq), Double)
+        # ts_headline pahalıdır; sadece istenirse ve sadece dönen sayfa için hesaplanır
+        snippet = func.ts_headline(SEARCH_CONFIG, Blog.content, tsq, HEADLINE_OPTIONS) if highlight else null()
+        stmt = select(*columns, rank.label("rank"), snippet.label("highlight")).where(Blog.search_vector.op("@@")(tsq))
+        sort_key = (rank, Blog.date, Blog.id)
+    else:
+        stmt = select(*columns, null().label("rank"), null().label("highlight"))
+        sort_key = (Blog.date, Blog.id)
+
+    if category:
+        stmt = stmt.where(Blog.category == category)
+
+    filtered = bool(q or category)
+    if filtered:
+        count_stmt = select(func.count()).select_from(stmt.with_only_columns(Blog.id).subquery())
+    else:
+        count_stmt = select(func.count()).select_from(Blog)
+    mode = total_mode(filtered, cursor)
+    if mode == TOTAL_WINDOW:
+        stmt = with_window_total(stmt)
+    stmt = stmt.order_by(*(desc(c) for c in sort_key))
+    # cursor varsa keyset, yoksa eski page/page_size (OFFSET) modu
+    if cursor:
+        stmt = keyset_after(stmt, sort_key, cursor)
+    else:
+        stmt = stmt.offset((page - 1) * page_size)
+    return stmt.limit(page_size + 1), count_stmt, mode
+
+def _row_key(row):
+    if row.rank is None:
+        return (row.date, row.id)
+    return (row.rank, row.date, row.id)
+
 def list_blogs(
     db: Session,
     q: Optional[str] = None,
     category: Optional[str] = None,
     page: int = 1,
     page_size: int = 12,
-) -> Tuple[List[Blog], int]:
-    stmt = select(Blog)
-    if category:
-        stmt = stmt.where(Blog.category == category)
-    if q:
-        like = f"%{q}%"
-        stmt = stmt.where(or_(Blog.title.ilike(like), Blog.preview.ilike(like), Blog.content.ilike(like)))
-    total = db.scalar(select(func.count()).select_from(stmt.subquery()))  # toplam
-    stmt = stmt.order_by(desc(Blog.date), desc(Blog.id)).offset((page - 1) * page_size).limit(page_size)
-    rows = db.execute(stmt).scalars().all()
-    return rows, (total or 0)
+    cursor: Optional[str] = None,
+    highlight: bool = False,
+    include_content: bool = False,
+) -> Page:
+    """Sayfanın öğeleri ORM nesnesi değil, kart kolonlarını taşıyan satırlardır."""
+    stmt, count_stmt, mode = _list_stmts(q, category, page, page_size, cursor, highlight, include_content)
+    rows = db.execute(stmt).all()
+    result = make_page(rows, page_size, _row_key)
+    version = count_version("blogs")
+    result.total = known_total(mode, rows, "blogs", version, first_page=page == 1 and not cursor)
+    if result.total is None:
+        result.total = remember_total(mode, "blogs", version, db.scalar(count_stmt) or 0)
+    return result
+
+async def list_blogs_async(
+    db: AsyncSession,
+    q: Optional[str] = None,
+    category: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 12,
+    cursor: Optional[str] = None,
+    highlight: bool = False,
+    include_content: bool = False,
+) -> Page:
+    stmt, count_stmt, mode = _list_stmts(q, category, page, page_size, cursor, highlight, include_content)
+    rows = (await db.execute(stmt)).all()
+    result = make_page(rows, page_size, _row_key)
+    version = await count_version_async("blogs")
+    result.total = known_total(mode, rows, "blogs", version, first_page=page == 1 and not cursor)
+    if result.total is None:
+        result.total = remember_total(mode, "blogs", version, (await db.scalar(count_stmt)) or 0)
+    return result
 
 def get_blog(db: Session, blog_id: int) -> Optional[Blog]:
     return db.get(Blog, blog_id)
 
+async def get_blog_async(db: AsyncSession, blog_id: int) -> Optional[Blog]:
+    return await db.get(Blog, blog_id)
+
 def create_blog(db: Session, data: BlogCreate) -> Blog:
     obj = Blog(**data.model_dump())
     db.add(obj)
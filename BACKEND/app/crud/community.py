@@ -1,7 +1,12 @@
+from sqlalchemy import func, literal, or_
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app import models
+from app.pagination import (
+    Page, keyset_after, make_page, total_mode, known_total, remember_total, with_window_total, TOTAL_WINDOW,
+    count_version,
+)
 from app.schemas.community import (
     CommunityApplicationCreate,
 )
@@ -21,8 +26,12 @@ def list_applications(
     limit: int = 100,
     status: Optional[str] = None,
     q: Optional[str] = None,  # ad/soyad/email arama
-) -> List[models.CommunityApplication]:
-    query = db.query(models.CommunityApplication).order_by(models.CommunityApplication.created_at.desc())
+    cursor: Optional[str] = None,  # verilirse keyset (created_at, id) modu
+) -> Page:
+    query = db.query(models.CommunityApplication).order_by(
+        models.CommunityApplication.created_at.desc(),
+        models.CommunityApplication.id.desc(),
+    )
 
     if status:
         query = query.filter(models.CommunityApplication.status == status)
@@ -35,7 +44,56 @@ def list_applications(
             (models.CommunityApplication.email.ilike(like))
         )
 
-    return query.offset(skip).limit(limit).all()
+    filtered = bool(status or q)
+    count_query = query.order_by(None).with_entities(func.count(models.CommunityApplication.id))
+    mode = total_mode(filtered, cursor)
+    if mode == TOTAL_WINDOW:
+        # Toplam, sayfa ile aynı sorguda: satırlar (başvuru, total_count) olur
+        query = with_window_total(query)
+
+    if cursor:
+        query = keyset_after(
+            query, (models.CommunityApplication.created_at, models.CommunityApplication.id), cursor
+        )
+    else:
+        query = query.offset(skip)
+
+    rows = query.limit(limit + 1).all()
+    version = count_version("community_applications")
+    total = known_total(mode, rows, "community_applications", version, first_page=skip == 0 and not cursor)
+    if mode == TOTAL_WINDOW:
+        rows = [r[0] for r in rows]
+    page = make_page(rows, limit, lambda a: (a.created_at, a.id))
+    if total is None:
+        total = remember_total(mode, "community_applications", version, count_query.scalar() or 0)
+    page.total = total
+    return page
+
+
+def search_applications(
+    db: Session,
+    q: str,
+    limit: int = 20,
+    status: Optional[str] = None,
+) -> List[models.CommunityApplication]:
+    """
+    Yazım hatasına dayanıklı admin araması (pg_trgm). `q <% kolon` kelime
+    benzerliği operatörü ve ILIKE, trigram GIN indekslerinden karşılanır;
+    sonuçlar en benzer kolona göre sıralanır ve `limit` ile sınırlıdır.
+    """
+    App = models.CommunityApplication
+    term = literal(q.strip())
+    columns = (App.first_name, App.last_name, App.email)
+    like = f"%{q.strip()}%"
+
+    query = db.query(App).filter(
+        or_(*(term.op("<%")(c) for c in columns), *(c.ilike(like) for c in columns))
+    )
+    if status:
+        query = query.filter(App.status == status)
+
+    score = func.greatest(*(func.word_similarity(term, c) for c in columns))
+    return query.order_by(score.desc(), App.created_at.desc(), App.id.desc()).limit(limit).all()
 
 
 def get_application(db: Session, app_id: int) -> Optional[models.CommunityApplication]:
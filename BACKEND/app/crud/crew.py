@@ -1,24 +1,22 @@
 # crud/crew.py
 
-from sqlalchemy import func
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List, Dict
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Dict, Sequence
 from collections import defaultdict
 
 from ..models import CrewMember
 from ..schemas.crew import CrewMemberCreate, CrewMemberUpdate
+from .ordering import bulk_reorder, next_position
 
 # YENİ BİR EKİP ÜYESİ OLUŞTUR
 # - order_index verilmezse: aynı kategorideki max(order_index)+1 atanır → en sona gelir
+#   (alt sorgu INSERT'in içinde çalışır, ayrı bir max() sorgusu yoktur)
 def create_crew_member(db: Session, member: CrewMemberCreate) -> CrewMember:
     data = member.model_dump()
     if data.get("order_index") is None:
-        max_idx = (
-            db.query(func.coalesce(func.max(CrewMember.order_index), 0))
-            .filter(CrewMember.category == data["category"])
-            .scalar()
-        )
-        data["order_index"] = int(max_idx) + 1
+        data["order_index"] = next_position(CrewMember, CrewMember.category == data["category"])
 
     db_member = CrewMember(**data)
     db.add(db_member)
@@ -28,22 +26,26 @@ def create_crew_member(db: Session, member: CrewMemberCreate) -> CrewMember:
 
 # TÜM EKİP ÜYELERİNİ KATEGORİYE GÖRE GRUPLANMIŞ GETİR
 # - Stabil sıralama: category, order_index (NULLS LAST), created_at, id
-def get_all_crew_members_grouped(db: Session) -> Dict[str, List[CrewMember]]:
-    members = (
-        db.query(CrewMember)
-        .order_by(
-            CrewMember.category.asc(),
-            CrewMember.order_index.asc().nulls_last(),
-            CrewMember.created_at.asc(),
-            CrewMember.id.asc(),
-        )
-        .all()
+def _grouped_stmt():
+    return select(CrewMember).order_by(
+        CrewMember.category.asc(),
+        CrewMember.order_index.asc().nulls_last(),
+        CrewMember.created_at.asc(),
+        CrewMember.id.asc(),
     )
+
+def _group_by_category(members) -> Dict[str, List[CrewMember]]:
     grouped_members = defaultdict(list)
     for member in members:
         grouped_members[member.category].append(member)
     return dict(grouped_members)
 
+def get_all_crew_members_grouped(db: Session) -> Dict[str, List[CrewMember]]:
+    return _group_by_category(db.scalars(_grouped_stmt()).all())
+
+async def get_all_crew_members_grouped_async(db: AsyncSession) -> Dict[str, List[CrewMember]]:
+    return _group_by_category((await db.scalars(_grouped_stmt())).all())
+
 # BİR EKİP ÜYESİNİ GÜNCELLE
 # - Kategori değiştiyse ve order_index verilmediyse: yeni kategoride en sona al
 # - order_index açıkça verilmişse: doğrudan uygula
@@ -65,18 +67,23 @@ def update_crew_member(db: Session, member_id: int, member_update: CrewMemberUpd
         and update_data["category"] != old_category
         and "order_index" not in update_data
     ):
-        max_idx = (
-            db.query(func.coalesce(func.max(CrewMember.order_index), 0))
-            .filter(CrewMember.category == db_member.category)
-            .scalar()
-        )
-        db_member.order_index = int(max_idx) + 1
+        db_member.order_index = next_position(CrewMember, CrewMember.category == db_member.category)
 
     db.add(db_member)
     db.commit()
     db.refresh(db_member)
     return db_member
 
+# BİR KATEGORİYİ TOPLU SIRALA (sürükle-bırak)
+# - Tek UPDATE + tek commit; başka kategorideki id'lere dokunulmaz
+# - Sadece güncellenen üyeler yeni sıralarıyla döner
+def reorder_category(db: Session, category: str, ids_in_order: Sequence[int]) -> List[CrewMember]:
+    members = bulk_reorder(db, CrewMember, ids_in_order, scope=(CrewMember.category == category,))
+    for obj in members:
+        db.expunge(obj)
+    db.commit()
+    return members
+
 # BİR EKİP ÜYESİNİ SİL
 def delete_crew_member(db: Session, member_id: int) -> bool:
     db_member = db.query(CrewMember).filter(CrewMember.id == member_id).first()
@@ -1,8 +1,10 @@
 from typing import List, Tuple, Optional, Union
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app import models
 from app.schemas import event_suggestions as schemas
+from app.pagination import Page, keyset_after, make_page, cached_count, count_version, store_count
 
 
 def create_suggestion(db: Session, data: schemas.EventSuggestionCreate) -> models.EventSuggestion:
@@ -14,12 +16,25 @@ def create_suggestion(db: Session, data: schemas.EventSuggestionCreate) -> model
     return obj
 
 
-def list_suggestions(db: Session, skip: int = 0, limit: int = 50) -> Tuple[List[models.EventSuggestion], int]:
-    """Önerileri sayfalı döndürür (son eklenen ilk gelir)."""
-    q = db.query(models.EventSuggestion).order_by(models.EventSuggestion.created_at.desc())
-    total = q.count()
-    items = q.offset(skip).limit(limit).all()
-    return items, total
+def list_suggestions(db: Session, skip: int = 0, limit: int = 50, cursor: Optional[str] = None) -> Page:
+    """Önerileri sayfalı döndürür (son eklenen ilk gelir). cursor verilirse keyset modu kullanılır."""
+    q = db.query(models.EventSuggestion).order_by(
+        models.EventSuggestion.created_at.desc(),
+        models.EventSuggestion.id.desc(),
+    )
+    if cursor:
+        q = keyset_after(q, (models.EventSuggestion.created_at, models.EventSuggestion.id), cursor)
+    else:
+        q = q.offset(skip)
+    page = make_page(q.limit(limit + 1).all(), limit, lambda s: (s.created_at, s.id))
+
+    # Filtresiz liste: toplam her istekte COUNT yerine sürüme bağlı önbellekten
+    version = count_version("event_suggestions")
+    page.total = cached_count("event_suggestions", version)
+    if page.total is None:
+        count = db.query(func.count(models.EventSuggestion.id)).scalar()
+        page.total = store_count("event_suggestions", version, count)
+    return page
 
 
 def get_suggestion(db: Session, suggestion_id: int) -> Optional[models.EventSuggestion]:
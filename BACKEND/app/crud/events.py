@@ -1,36 +1,91 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from sqlalchemy import select, func, update
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from app.models import Event
+from app.models import Event, EventWaitlist
+from app.pagination import Page, keyset_after, make_page, cached_count, count_version, count_version_async, store_count
 from app.schemas.events import EventCreate, EventUpdate
+from app.schemas.image import dump_variants
 from datetime import datetime as dt
 
 def get_event(db: Session, event_id: int) -> Optional[Event]:
-    return db.query(Event).filter(Event.id == event_id).first()
+    return db.get(Event, event_id)
+
+async def get_event_async(db: AsyncSession, event_id: int) -> Optional[Event]:
+    return await db.get(Event, event_id)
 
 def get_event_by_slug(db: Session, slug: str) -> Optional[Event]:
-    return db.query(Event).filter(Event.slug == slug).first()
+    return db.scalars(select(Event).where(Event.slug == slug)).first()
 
-def get_events(db: Session, skip: int = 0, limit: int = 100) -> List[Event]:
-    return (
-        db.query(Event)
-        .order_by(Event.start_at.desc())
-        .offset(skip).limit(limit).all()
-    )
+async def get_event_by_slug_async(db: AsyncSession, slug: str) -> Optional[Event]:
+    return (await db.scalars(select(Event).where(Event.slug == slug))).first()
+
+# Sayfalama: cursor verilirse keyset (start_at, id), verilmezse eski OFFSET modu.
+# Her iki modda da bir fazla satır çekilir ki sonraki sayfanın cursor'ı üretilebilsin.
+EVENT_KEY = (Event.start_at, Event.id)
+
+def _events_stmt(skip: int, limit: int, cursor: Optional[str]):
+    stmt = select(Event).order_by(Event.start_at.desc(), Event.id.desc())
+    if cursor:
+        stmt = keyset_after(stmt, EVENT_KEY, cursor)
+    else:
+        stmt = stmt.offset(skip)
+    return stmt.limit(limit + 1)
+
+def _event_key(ev: Event):
+    return (ev.start_at, ev.id)
+
+# Liste filtresiz olduğu için toplam, sürüme bağlı önbellekli sayımdan gelir
+_COUNT_STMT = select(func.count()).select_from(Event)
+
+def get_events(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Page:
+    rows = db.scalars(_events_stmt(skip, limit, cursor)).all()
+    page = make_page(rows, limit, _event_key)
+    version = count_version("events")
+    page.total = cached_count("events", version)
+    if page.total is None:
+        page.total = store_count("events", version, db.scalar(_COUNT_STMT))
+    return page
+
+async def get_events_async(db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Page:
+    rows = (await db.scalars(_events_stmt(skip, limit, cursor))).all()
+    page = make_page(rows, limit, _event_key)
+    version = await count_version_async("events")
+    page.total = cached_count("events", version)
+    if page.total is None:
+        page.total = store_count("events", version, await db.scalar(_COUNT_STMT))
+    return page
 
 # --- DÜZELTİLEN KISIM BURASI ---
-def get_upcoming_events(db: Session, limit: int = 3) -> List[Event]:
+def _upcoming_stmt(limit: int):
     """
     Sadece gelecekteki (şu anki zamandan büyük veya eşit) etkinlikleri getirir.
-    En yakın tarihe göre (artan) sıralar.
+    En yakın tarihe göre (artan) sıralar. `ix_events_start_at` ile aralık
+    taraması + sıralı okuma yapılır, LIMIT'te durulur.
     """
     return (
-        db.query(Event)
-        .filter(Event.start_at >= dt.now())  # Sadece gelecekteki etkinlikler
-        .order_by(Event.start_at.asc())      # En yakından uzağa sırala
+        select(Event)
+        .where(Event.start_at >= dt.now())  # Sadece gelecekteki etkinlikler
+        .order_by(Event.start_at.asc())     # En yakından uzağa sırala
         .limit(limit)
-        .all()
     )
+
+def seconds_until_upcoming_changes(upcoming: List[Event]) -> Optional[float]:
+    """
+    Yaklaşan etkinlik listesi, yazma olmadıkça ancak ilk (en yakın) etkinliğin
+    saati geçince değişir: o etkinlik düşer, limit doluysa sıradaki girer.
+    Liste boşsa zamana bağlı değişiklik yoktur (None).
+    """
+    if not upcoming:
+        return None
+    return max(0.0, (upcoming[0].start_at - dt.now()).total_seconds())
+
+def get_upcoming_events(db: Session, limit: int = 3) -> List[Event]:
+    return db.scalars(_upcoming_stmt(limit)).all()
+
+async def get_upcoming_events_async(db: AsyncSession, limit: int = 3) -> List[Event]:
+    return (await db.scalars(_upcoming_stmt(limit))).all()
 # -------------------------------
 
 def _unique_slug(db: Session, slug: str) -> str:
@@ -48,6 +103,7 @@ def create_event(db: Session, payload: EventCreate) -> Event:
         title=payload.title,
         description=payload.description,
         cover_image_url=cover_img,
+        cover_image_variants=dump_variants(payload.cover_image_variants),
         start_at=payload.start_at,
         location=payload.location,
         category=payload.category,
@@ -69,7 +125,7 @@ def create_event(db: Session, payload: EventCreate) -> Event:
     return ev
 
 ALLOWED_UPDATE_FIELDS = {
-    "title","description","cover_image_url","start_at","location",
+    "title","description","cover_image_url","cover_image_variants","start_at","location",
     "category","capacity","whatsapp_link","slug","tags"
 }
 
@@ -94,4 +150,61 @@ def delete_event(db: Session, event_id: int) -> Optional[Event]:
         return None
     db.delete(ev)
     db.commit()
-    return ev
\ No newline at end of file
+    return ev
+
+
+# --- KAYIT (KONTENJAN) ---
+# Yer, tek bir koşullu UPDATE ile alınır: okuma-değiştirme-yazma yoktur ve
+# satır kilidi sadece bu ifade ile hemen ardından gelen COMMIT arasında
+# tutulur. Aynı satıra yüzlerce eşzamanlı istek gelse de Postgres her
+# UPDATE'i satırın son haliyle yeniden değerlendirir; kontenjan aşılamaz.
+# Kayıt "events" tablo sürümünü artırmaz (bkz. app/versions.py): commit'e
+# ortak sürüm satırının upsert'i eklenmez, kayıt dalgası etkinlik/anasayfa
+# önbelleğini de boşaltmaz. Önbellekli yanıtlardaki `registered` bu yüzden
+# gecikebilir; canlı sayı `get_capacity` ile /events/{id}/seats'tedir.
+def claim_seat(db: Session, event_id: int) -> Optional[Tuple[int, int, str]]:
+    """Yer alındıysa (registered, capacity, whatsapp_link); dolu ya da yoksa None."""
+    row = db.execute(
+        update(Event)
+        .where(Event.id == event_id, Event.registered < Event.capacity)
+        .values(registered=Event.registered + 1)
+        .returning(Event.registered, Event.capacity, Event.whatsapp_link)
+        .execution_options(bump_versions=False)
+    ).first()
+    if row is None:
+        # Hiçbir satır değişmedi: commit gerekmez
+        db.rollback()
+        return None
+    db.commit()
+    return row.registered, row.capacity, row.whatsapp_link
+
+def _capacity_stmt(event_id: int):
+    return select(Event.registered, Event.capacity).where(Event.id == event_id)
+
+def get_capacity(db: Session, event_id: int) -> Optional[Tuple[int, int]]:
+    """Canlı (registered, capacity); başarısız kayıtta dolu mu / yok mu ayrımı için de (kilitsiz okuma)."""
+    row = db.execute(_capacity_stmt(event_id)).first()
+    return (row.registered, row.capacity) if row else None
+
+async def get_capacity_async(db: AsyncSession, event_id: int) -> Optional[Tuple[int, int]]:
+    row = (await db.execute(_capacity_stmt(event_id))).first()
+    return (row.registered, row.capacity) if row else None
+
+def join_waitlist(db: Session, event_id: int, email: str, name: Optional[str] = None) -> int:
+    """Bekleme listesine ekler (zaten varsa eklemez) ve 1'den başlayan sırayı döndürür."""
+    # Aynı etkinliğe eşzamanlı eklemeler etkinlik satırının kilidinde sıraya
+    # girer: id'ler commit sırasıyla verilir ve iki kişiye aynı sıra dönmez
+    db.execute(select(Event.id).where(Event.id == event_id).with_for_update())
+    entry = EventWaitlist(event_id=event_id, email=email.lower(), name=name, created_at=dt.utcnow())
+    db.add(entry)
+    try:
+        db.commit()
+        entry_id = entry.id
+    except IntegrityError:
+        db.rollback()
+        entry_id = db.execute(
+            select(EventWaitlist.id).where(EventWaitlist.event_id == event_id, EventWaitlist.email == email.lower())
+        ).scalar_one()
+    return db.execute(
+        select(func.count()).where(EventWaitlist.event_id == event_id, EventWaitlist.id <= entry_id)
+    ).scalar_one()
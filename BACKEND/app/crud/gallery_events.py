@@ -1,19 +1,26 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app import models
 # 🔧 Doğrudan dosyadan import — paket __init__ gerektirmez
 from app.schemas.gallery_events import GalleryEventCreate, GalleryEventUpdate
 
+def _list_stmt():
+    return select(models.GalleryEvent).order_by(models.GalleryEvent.date.desc())
+
 def list_gallery_events(db: Session):
-    return (
-        db.query(models.GalleryEvent)
-        .order_by(models.GalleryEvent.date.desc())
-        .all()
-    )
+    return db.scalars(_list_stmt()).all()
+
+async def list_gallery_events_async(db: AsyncSession):
+    return (await db.scalars(_list_stmt())).all()
 
 def get_gallery_event(db: Session, event_id: int):
     # SQLAlchemy 2 tarzı .get
     return db.get(models.GalleryEvent, event_id)
 
+async def get_gallery_event_async(db: AsyncSession, event_id: int):
+    return await db.get(models.GalleryEvent, event_id)
+
 def create_gallery_event(db: Session, data: GalleryEventCreate):
     obj = models.GalleryEvent(**data.model_dump())  # pydantic v2
     db.add(obj)
@@ -1,42 +1,54 @@
 # crud/journey.py
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List, Dict
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Dict, Sequence
 from collections import defaultdict
 from ..schemas.journey import JourneyPersonUpdate
 from ..models import JourneyPerson
 from ..schemas.journey import JourneyPersonCreate
+from .ordering import bulk_reorder, next_position
 
 # YENİ BİR KİŞİ OLUŞTURMA
+# - order_index verilmezse: aynı yıldaki max(order_index)+1 (INSERT içinde alt sorgu)
 def create_journey_person(db: Session, person: JourneyPersonCreate) -> JourneyPerson:
-    db_person = JourneyPerson(**person.model_dump())
+    data = person.model_dump()
+    if data.get("order_index") is None:
+        data["order_index"] = next_position(JourneyPerson, JourneyPerson.year == data["year"])
+
+    db_person = JourneyPerson(**data)
     db.add(db_person)
     db.commit()
     db.refresh(db_person)
     return db_person
 
-# TÜM KİŞİLERİ YILLARA GÖRE GRUPLANMIŞ OLARAK GETİRME
-def get_all_journey_people_grouped_by_year(db: Session) -> Dict[int, List[JourneyPerson]]:
-    """
-    Frontend'in kolay kullanması için tüm kayıtları yıllara göre gruplar.
-    Yeni eklenenler ilgili yılın EN SONUNDA görünür (created_at ASC).
-    """
-    people = (
-        db.query(JourneyPerson)
-        .order_by(
-            JourneyPerson.year.desc(),
-            JourneyPerson.created_at.asc(),
-            JourneyPerson.id.asc(),
-        )
-        .all()
+def _grouped_stmt():
+    return select(JourneyPerson).order_by(
+        JourneyPerson.year.desc(),
+        JourneyPerson.order_index.asc().nulls_last(),
+        JourneyPerson.created_at.asc(),
+        JourneyPerson.id.asc(),
     )
 
+def _group_by_year(people) -> Dict[int, List[JourneyPerson]]:
     grouped_people: Dict[int, List[JourneyPerson]] = defaultdict(list)
     for person in people:
         grouped_people[person.year].append(person)
-
     return dict(grouped_people)
 
+# TÜM KİŞİLERİ YILLARA GÖRE GRUPLANMIŞ OLARAK GETİRME
+def get_all_journey_people_grouped_by_year(db: Session) -> Dict[int, List[JourneyPerson]]:
+    """
+    Frontend'in kolay kullanması için tüm kayıtları yıllara göre gruplar.
+    Yıl içinde order_index'e göre sıralanır; yeni eklenenler ilgili yılın
+    EN SONUNA gelir (max+1).
+    """
+    return _group_by_year(db.scalars(_grouped_stmt()).all())
+
+async def get_all_journey_people_grouped_by_year_async(db: AsyncSession) -> Dict[int, List[JourneyPerson]]:
+    return _group_by_year((await db.scalars(_grouped_stmt())).all())
+
 # BELİRLİ BİR KİŞİYİ ID'YE GÖRE SİLME
 def delete_journey_person(db: Session, person_id: int) -> bool:
     db_person = db.query(JourneyPerson).filter(JourneyPerson.id == person_id).first()
@@ -55,11 +67,29 @@ def update_journey_person(db: Session, person_id: int, person_update: JourneyPer
     if not db_person:
         return None
 
+    old_year = db_person.year
     update_data = person_update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_person, key, value)
 
+    # Yıl değişti ve order_index verilmedi → yeni yılda en sona
+    if (
+        update_data.get("year") is not None
+        and update_data["year"] != old_year
+        and update_data.get("order_index") is None
+    ):
+        db_person.order_index = next_position(JourneyPerson, JourneyPerson.year == db_person.year)
+
     db.add(db_person)
     db.commit()
     db.refresh(db_person)
     return db_person
+
+# BİR YILI TOPLU SIRALA (sürükle-bırak)
+# - Tek UPDATE + tek commit; başka yıldaki id'lere dokunulmaz
+def reorder_year(db: Session, year: int, ids_in_order: Sequence[int]) -> List[JourneyPerson]:
+    people = bulk_reorder(db, JourneyPerson, ids_in_order, scope=(JourneyPerson.year == year,))
+    for obj in people:
+        db.expunge(obj)
+    db.commit()
+    return people
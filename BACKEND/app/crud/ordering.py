@@ -0,0 +1,78 @@
+# app/crud/ordering.py
+"""
+Küme tabanlı (set-based) toplu yeniden sıralama.
+
+Yeni sıra tek bir `UPDATE ... FROM (VALUES (id, sıra), ...)` ifadesiyle
+yazılır ve güncellenen satırlar `RETURNING` ile döner: tablo belleğe
+yüklenmez, maliyet gönderilen id sayısıyla orantılıdır. VALUES kolon
+takma adlarını desteklemeyen veritabanlarında (SQLite ile yerel geliştirme)
+aynı iş `id IN (...)` + `CASE` ile yapılır. Listede olmayan
+satırların sırası değişmez; var olmayan id'ler yok sayılır. Sıra bir grup
+içindeyse (ekip kategorisi, yolculuk yılı) `scope` koşulu WHERE'e eklenir ve
+grup dışındaki id'lere dokunulmaz.
+
+Yeni kayıtların "en sona" konumu ayrı bir `max()` sorgusu yerine
+`next_position` alt sorgusuyla INSERT'in içinde hesaplanır. Sıralar her iki
+yolda da 1'den başlar.
+
+Aynı tabloda eşzamanlı iki sıralama araya girmesin (ve satır kilitlerini
+farklı sırada alıp kilitlenmesin) diye Postgres'te işlem boyu süren bir
+advisory lock alınır; ikinci istek birincinin commit'ini bekler.
+"""
+import zlib
+from typing import List, Sequence, Type
+
+from sqlalchemy import Integer, case, column, func, select, update, values
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement
+
+
+def _lock_key(table: str) -> int:
+    # Tablo adından sabit, süreçler arası aynı 32 bit anahtar
+    return zlib.crc32(f"reorder:{table}".encode())
+
+
+def lock_ordering(db: Session, table: str) -> None:
+    """Bu işlem (transaction) bitene kadar tablonun sıralamasını kilitler."""
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(select(func.pg_advisory_xact_lock(_lock_key(table))))
+
+
+def next_position(model: Type, *scope: ColumnElement, column_name: str = "order_index"):
+    """
+    Gruptaki en büyük sıra + 1'i veren skaler alt sorgu (grup boşsa 1).
+    ORM nesnesine atanır; değer INSERT/UPDATE ifadesinin içinde hesaplanır.
+    """
+    target = getattr(model, column_name)
+    return select(func.coalesce(func.max(target), 0) + 1).where(*scope).scalar_subquery()
+
+
+def bulk_reorder(
+    db: Session,
+    model: Type,
+    ids_in_order: Sequence[int],
+    column_name: str = "order_index",
+    scope: Sequence[ColumnElement] = (),
+) -> List:
+    """
+    `ids_in_order[i]` kaydının sırasını i + 1 yapar (`next_position` gibi 1'den
+    başlar); güncellenen kayıtları yeni sıralarına göre döndürür. Tekrarlanan
+    id'lerde ilk konum geçerlidir; `scope` koşullarına uymayan id'ler
+    güncellenmez. Commit etmez.
+    """
+    order = list(dict.fromkeys(ids_in_order))
+    if not order:
+        return []
+    lock_ordering(db, model.__tablename__)
+    target = getattr(model, column_name)
+    if db.get_bind().dialect.name == "postgresql":
+        new_order = values(
+            column("id", Integer), column("position", Integer), name="new_order",
+        ).data([(pk, idx) for idx, pk in enumerate(order, start=1)])
+        stmt = update(model).where(model.id == new_order.c.id, *scope).values({target: new_order.c.position})
+    else:
+        positions = {pk: idx for idx, pk in enumerate(order, start=1)}
+        stmt = update(model).where(model.id.in_(order), *scope).values({target: case(positions, value=model.id)})
+    stmt = stmt.returning(model).execution_options(synchronize_session=False)
+    rows = db.scalars(stmt).all()
+    return sorted(rows, key=lambda obj: getattr(obj, column_name))
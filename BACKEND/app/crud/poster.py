@@ -1,28 +1,39 @@
 from typing import Sequence
-from sqlalchemy import func
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import Poster
 from app.schemas.poster import PosterCreate, PosterUpdate
+from app.schemas.image import dump_variants
+from app.crud.ordering import bulk_reorder, next_position
 
 def get(db: Session, poster_id: int) -> Poster | None:
-    return db.query(Poster).filter(Poster.id == poster_id).first()
+    return db.get(Poster, poster_id)
 
-def get_multi(db: Session, skip: int = 0, limit: int = 100, active: bool | None = None) -> Sequence[Poster]:
-    q = db.query(Poster)
+async def get_async(db: AsyncSession, poster_id: int) -> Poster | None:
+    return await db.get(Poster, poster_id)
+
+def _multi_stmt(skip: int, limit: int, active: bool | None):
+    stmt = select(Poster)
     if active is not None:
-        q = q.filter(Poster.is_active == active)
+        stmt = stmt.where(Poster.is_active == active)
     # İlk eklenen en solda, son eklenen en sağda:
-    q = q.order_by(
+    stmt = stmt.order_by(
         Poster.order_index.asc().nulls_last(),  # temel sıra
         Poster.id.asc(),                        # stabilite
     )
-    return q.offset(skip).limit(limit).all()
+    return stmt.offset(skip).limit(limit)
+
+def get_multi(db: Session, skip: int = 0, limit: int = 100, active: bool | None = None) -> Sequence[Poster]:
+    return db.scalars(_multi_stmt(skip, limit, active)).all()
+
+async def get_multi_async(db: AsyncSession, skip: int = 0, limit: int = 100, active: bool | None = None) -> Sequence[Poster]:
+    return (await db.scalars(_multi_stmt(skip, limit, active))).all()
 
 def create(db: Session, obj_in: PosterCreate) -> Poster:
-    # order_index gönderilmemişse → en sona (max+1)
+    # order_index gönderilmemişse → en sona (max+1, INSERT içinde alt sorgu)
     if obj_in.order_index is None:
-        max_idx = db.query(func.coalesce(func.max(Poster.order_index), 0)).scalar()
-        next_idx = int(max_idx) + 1
+        next_idx = next_position(Poster)
     else:
         next_idx = obj_in.order_index
 
@@ -31,6 +42,7 @@ def create(db: Session, obj_in: PosterCreate) -> Poster:
         subtitle=obj_in.subtitle,
         content=obj_in.content,
         image_url=obj_in.image_url,
+        image_variants=dump_variants(obj_in.image_variants),
         is_active=obj_in.is_active if obj_in.is_active is not None else True,
         order_index=next_idx,
     )
@@ -48,6 +60,8 @@ def update(db: Session, db_obj: Poster, obj_in: PosterUpdate) -> Poster:
         db_obj.content = obj_in.content
     if obj_in.image_url is not None:
         db_obj.image_url = obj_in.image_url
+    if obj_in.image_variants is not None:
+        db_obj.image_variants = dump_variants(obj_in.image_variants)
     if obj_in.is_active is not None:
         db_obj.is_active = obj_in.is_active
     if obj_in.order_index is not None:
@@ -62,3 +76,13 @@ def remove(db: Session, poster_id: int) -> None:
     if db_obj:
         db.delete(db_obj)
         db.commit()
+
+def reorder(db: Session, ids_in_order: Sequence[int]) -> Sequence[Poster]:
+    """Tek UPDATE ... FROM (VALUES ...) ile sıralar; sadece güncellenen posterleri döndürür."""
+    posters = bulk_reorder(db, Poster, ids_in_order)
+    # Kayıtlar RETURNING ile tam dolu; commit süresini doldurup yanıt için
+    # her birini tekrar SELECT etmesin diye oturumdan ayrılır
+    for obj in posters:
+        db.expunge(obj)
+    db.commit()
+    return posters
@@ -1,12 +1,15 @@
 # crud/teams.py
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 import re
 from unidecode import unidecode
 
 from ..models import Team, TeamMember
 from ..schemas.teams import TeamCreate
+from ..schemas.image import dump_variants
 
 # Slug oluşturma yardımcı fonksiyonu (Değişiklik yok)
 def create_slug(text: str) -> str:
@@ -18,9 +21,26 @@ def create_slug(text: str) -> str:
 
 # --- Read İşlemleri ---
 
+# Üyeler tek bir `IN (...)` sorgusuyla toplu yüklenir (selectinload).
+# Böylece takım sayısından bağımsız olarak en fazla 2 sorgu çalışır;
+# TeamRead serileştirmesi sırasında takım başına lazy-load (N+1) olmaz.
+# Async modda lazy-load zaten mümkün değildir, bu yüzden aynı ifadeler kullanılır.
+
+def _teams_stmt():
+    return select(Team).options(selectinload(Team.members))
+
+def _team_by_id_stmt(team_id: int):
+    return _teams_stmt().where(Team.id == team_id)
+
+def _featured_stmt(limit: int):
+    return _teams_stmt().where(Team.is_featured == True).limit(limit)
+
 def get_team_by_id(db: Session, team_id: int) -> Optional[Team]:
     """Belirtilen ID'ye sahip takımı üyeleriyle birlikte getirir."""
-    return db.query(Team).filter(Team.id == team_id).first()
+    return db.scalars(_team_by_id_stmt(team_id)).first()
+
+async def get_team_by_id_async(db: AsyncSession, team_id: int) -> Optional[Team]:
+    return (await db.scalars(_team_by_id_stmt(team_id))).first()
 
 def get_team_by_name(db: Session, name: str) -> Optional[Team]:
     """Belirtilen ada sahip takımı getirir (Benzersizlik kontrolü için kullanılır)."""
@@ -32,12 +52,18 @@ def get_team_by_slug(db: Session, slug: str) -> Optional[Team]:
     return db.query(Team).filter(Team.slug == slug).first()
 
 def get_all_teams(db: Session) -> List[Team]:
-    """Veritabanındaki tüm takımları getirir."""
-    return db.query(Team).all()
+    """Veritabanındaki tüm takımları üyeleriyle birlikte getirir."""
+    return db.scalars(_teams_stmt()).all()
+
+async def get_all_teams_async(db: AsyncSession) -> List[Team]:
+    return (await db.scalars(_teams_stmt())).all()
 
 def get_featured_teams(db: Session, limit: int = 4) -> List[Team]:
     """Anasayfada gösterilmek üzere öne çıkarılmış takımları getirir."""
-    return db.query(Team).filter(Team.is_featured == True).limit(limit).all()
+    return db.scalars(_featured_stmt(limit)).all()
+
+async def get_featured_teams_async(db: AsyncSession, limit: int = 4) -> List[Team]:
+    return (await db.scalars(_featured_stmt(limit))).all()
 
 # --- Create İşlemleri ---
 
@@ -64,6 +90,7 @@ def create_team_with_members(db: Session, team: TeamCreate) -> Team:
         category=team.category,
         description=team.description,
         photo_url=team.photo_url,
+        photo_variants=dump_variants(team.photo_variants),
         is_featured=team.is_featured,
         members=member_objects  # Üye listesini doğrudan ilişkiye atıyoruz
     )
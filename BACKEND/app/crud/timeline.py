@@ -1,4 +1,6 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any
 
 from app.schemas.timeline import (
@@ -8,16 +10,31 @@ from app.schemas.timeline import (
 from app.models import TimelineEvents  # gerekli ise yolunu değiştir: app.models.models import TimelineEvents
 
 
+def _list_stmt():
+    return select(TimelineEvents).order_by(TimelineEvents.id.desc())
+
+
 def list_events(db: Session) -> List[TimelineEvents]:
-    return db.query(TimelineEvents).order_by(TimelineEvents.id.desc()).all()
+    return db.scalars(_list_stmt()).all()
+
+
+async def list_events_async(db: AsyncSession) -> List[TimelineEvents]:
+    return (await db.scalars(_list_stmt())).all()
 
 
 def get_event(db: Session, event_id: int) -> Optional[TimelineEvents]:
-    return db.query(TimelineEvents).filter(TimelineEvents.id == event_id).first()
+    return db.get(TimelineEvents, event_id)
+
+
+async def get_event_async(db: AsyncSession, event_id: int) -> Optional[TimelineEvents]:
+    return await db.get(TimelineEvents, event_id)
 
 
 def create_event(
-    db: Session, data: TimelineEventCreate, image_url: Optional[str] = None
+    db: Session,
+    data: TimelineEventCreate,
+    image_url: Optional[str] = None,
+    image_variants: Optional[List[Dict[str, Any]]] = None,
 ) -> TimelineEvents:
     obj = TimelineEvents(
         title=data.title,
@@ -25,6 +42,7 @@ def create_event(
         category=data.category,
         date_label=data.date_label,
         image_url=image_url or "",
+        image_variants=image_variants,
     )
     db.add(obj)
     db.commit()
@@ -33,11 +51,17 @@ def create_event(
 
 
 def update_event(
-    db: Session, event: TimelineEvents, updates: TimelineEventUpdate, image_url: Optional[str] = None
+    db: Session,
+    event: TimelineEvents,
+    updates: TimelineEventUpdate,
+    image_url: Optional[str] = None,
+    image_variants: Optional[List[Dict[str, Any]]] = None,
 ) -> TimelineEvents:
     data: Dict[str, Any] = updates.model_dump(exclude_unset=True)
     if image_url is not None:
         data["image_url"] = image_url
+    if image_variants is not None:
+        data["image_variants"] = image_variants
 
     for k, v in data.items():
         setattr(event, k, v)
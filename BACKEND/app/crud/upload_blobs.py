@@ -0,0 +1,80 @@
+# crud/upload_blobs.py
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models import UploadBlob
+
+
+def get_blob(db: Session, sha256: str) -> Optional[UploadBlob]:
+    return db.get(UploadBlob, sha256)
+
+
+def get_blob_by_url(db: Session, url: str) -> Optional[UploadBlob]:
+    """Bu URL'yi (işlenmiş dosya) gösteren herhangi bir kayıt."""
+    return db.scalars(select(UploadBlob).where(UploadBlob.url == url).limit(1)).first()
+
+
+def claim_blob(db: Session, sha256: str, url: str, content_type: str, size: int) -> Tuple[UploadBlob, bool]:
+    """
+    Kaydı önce ekler (yoksa, türevsiz), sonra güncel halini okur. Satır
+    kilitlenmez: türetme uzun sürebilir (bkz. app/images.py) ve bağlantı o
+    süre boyunca transaction'da beklememelidir. Sonuç `lock_blob` ile kısa
+    bir kilit altında yeniden kontrol edilip yazılır. (kayıt, yeni_mi) döndürür.
+    """
+    created = False
+    if get_blob(db, sha256) is None:
+        db.add(UploadBlob(sha256=sha256, url=url, content_type=content_type, size=size, variants=None))
+        try:
+            db.commit()
+            created = True
+        except IntegrityError:
+            db.rollback()  # aynı anda başka bir istek ekledi
+    blob = db.scalars(
+        select(UploadBlob).where(UploadBlob.sha256 == sha256).execution_options(populate_existing=True)
+    ).one()
+    return blob, created
+
+
+def lock_blob(db: Session, sha256: str) -> UploadBlob:
+    """
+    Satırı `FOR UPDATE` ile kilitleyip güncel halini okur. Aynı içeriği
+    eşzamanlı işleyen worker'lar burada sıraya girer; kilit çağıranın bir
+    sonraki commit/rollback'ine kadar sürer (`save_blob`, `touch_blob`).
+    """
+    return db.scalars(
+        select(UploadBlob).where(UploadBlob.sha256 == sha256).with_for_update().execution_options(populate_existing=True)
+    ).one()
+
+
+def touch_blob(db: Session, blob: UploadBlob) -> UploadBlob:
+    """Aynı içerik tekrar yüklendi: sayaç ve zaman güncellenir, dosyaya dokunulmaz."""
+    blob.upload_count = UploadBlob.upload_count + 1
+    blob.last_uploaded_at = datetime.utcnow()
+    db.commit()
+    db.refresh(blob)
+    return blob
+
+
+def save_blob(
+    db: Session,
+    blob: UploadBlob,
+    url: str,
+    variants: Optional[List[Dict[str, Any]]],
+    reuploaded: bool = False,
+) -> UploadBlob:
+    """
+    İşlenmiş dosyanın URL'sini ve türevlerini kilitli kayda yazar ve kilidi
+    bırakır. `variants=None`: türetme başarısız, sonraki yükleme tekrar dener.
+    """
+    blob.url = url
+    blob.variants = variants
+    if reuploaded:
+        blob.upload_count = UploadBlob.upload_count + 1
+    blob.last_uploaded_at = datetime.utcnow()
+    db.commit()
+    db.refresh(blob)
+    return blob
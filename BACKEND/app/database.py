@@ -1,9 +1,15 @@
+import anyio
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 import os
 from pathlib import Path
 from dotenv import load_dotenv
 
+from .metrics import TimedQueuePool
+from .query_stats import instrument_engine
+
 ENV_PATH = Path(__file__).resolve().parent.parent / ".env"
 load_dotenv(dotenv_path=ENV_PATH)
 
@@ -16,12 +22,46 @@ if not DATABASE_URL:
 
 engine = create_engine(
     DATABASE_URL,
+    poolclass=TimedQueuePool,  # bağlantı bekleme süresi /metrics'te (app/metrics.py)
     pool_pre_ping=True,
     pool_size=10,
     max_overflow=20,
     pool_recycle=1800,
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# İstek başına sorgu sayısı/süresi, yavaş sorgu logu (bkz. app/query_stats.py)
+instrument_engine(engine)
+
+# --- ASYNC MOD (OPSİYONEL) ---
+# DATABASE_ASYNC=true ise public GET uçları asyncpg üzerinden, event loop'u
+# bloklamadan çalışır. Admin yazma uçları her iki modda da senkron kalır.
+# Tek CPU'lu bir ölçümde (scripts/bench_db_modes.py) iki mod arasında
+# gürültüyü aşan bir fark görülmedi; varsayılan senkron moddur.
+DATABASE_ASYNC = os.getenv("DATABASE_ASYNC", "false").lower() in ("1", "true", "yes")
+
+def _to_async_url(url: str) -> str:
+    if url.startswith("postgresql+psycopg2://"):
+        return "postgresql+asyncpg://" + url[len("postgresql+psycopg2://"):]
+    if url.startswith("postgresql://"):
+        return "postgresql+asyncpg://" + url[len("postgresql://"):]
+    return url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _to_async_url(DATABASE_URL)
+
+async_engine = None
+AsyncSessionLocal = None
+if DATABASE_ASYNC:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_pre_ping=True,
+        pool_size=10,
+        max_overflow=20,
+        pool_recycle=1800,
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    instrument_engine(async_engine.sync_engine)
 
 Base = declarative_base()
 
@@ -32,6 +72,45 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async veritabanı kapalı. DATABASE_ASYNC=true ayarlayın.")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Oturum kapatma (ROLLBACK + bağlantıyı havuza iade) varsayılan thread
+# havuzunu kullanmaz: havuzun tüm thread'leri bağlantı beklerken bağlantıyı
+# geri verecek iş de o kuyruğa girerse ikisi birbirini bekler (kilitlenme).
+_release_limiter = anyio.CapacityLimiter(8)
+
+# Public GET uçlarının bağımlılığı: async modda AsyncSession, aksi halde
+# senkron Session verir. Oturumlar tembeldir; önbellekten dönen isteklerde
+# bağlantı hiç açılmaz ve thread havuzuna da gidilmez. (Tablo sürümleri
+# worker başına en fazla VERSIONS_REFRESH_INTERVAL saniyede bir, tek sorguyla
+# tazelenir; aralığı dolduran istek bu sorguyu öder, bkz. app/versions.py.)
+async def get_read_db():
+    if DATABASE_ASYNC:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        if db.in_transaction():
+            # Bağlantı iade edilirken ROLLBACK gider; loop'u bloklamasın. İstek
+            # iptal edilse de (istemci koptu) bağlantı havuza mutlaka döner.
+            with anyio.CancelScope(shield=True):
+                await anyio.to_thread.run_sync(db.close, limiter=_release_limiter)
+        else:
+            db.close()
+
+async def run_read(db, sync_fn, async_fn, *args, **kwargs):
+    """Oturum tipine göre crud fonksiyonunun async ya da senkron sürümünü çalıştırır."""
+    if isinstance(db, AsyncSession):
+        return await async_fn(db, *args, **kwargs)
+    return await run_in_threadpool(sync_fn, db, *args, **kwargs)
+
 
 #from sqlalchemy import create_engine
 #from sqlalchemy.orm import sessionmaker, declarative_base
@@ -0,0 +1,318 @@
+# app/images.py
+"""
+Yüklenen görseller için duyarlı (responsive) türevler.
+
+Her yüklemede:
+- Orijinal dosya EXIF/GPS gibi meta veriden arındırılır, yönü (EXIF
+  Orientation) piksele uygulanır ve aynı biçimde yeniden sıkıştırılır.
+  Temiz kopya kendi baytlarının özetiyle (`<sha256>.<uzantı>`) yeni bir
+  dosyaya yazılır ve servis edilen URL odur; içerik adresli bir dosya
+  hiçbir zaman yerinde değiştirilmez. Ham yükleme işlendikten sonra silinir.
+- VARIANT_WIDTHS genişliklerinde WebP (ve Pillow destekliyorsa AVIF)
+  türevleri `<sha256>-<genişlik>.<uzantı>` adıyla temiz dosyanın yanına
+  yazılır. Orijinalden geniş türev üretilmez.
+
+Dönen liste `*_variants` kolonlarında saklanır ve yanıt şemalarında
+`[{url, width, height, type}]` olarak döner; frontend `srcset` kurar.
+
+Kodlama CPU yoğun olduğu ve GIL'i tuttuğu için iş, ayrı süreçlerden oluşan
+bir havuzda (ProcessPoolExecutor) yapılır; API worker'ı sadece sonucu bekler.
+Türev üretimi başarısız olursa yükleme yine kabul edilir, liste boş döner.
+
+Router'lar `store_image` / `store_image_async` ile dosyayı kaydedip
+türevlerini tek adımda alır. Dosya içerik adresli saklandığı için (bkz.
+app/uploads.py) ham yüklemenin özeti -> temiz URL ve türevler `upload_blobs`
+dizinine yazılır; aynı dosya tekrar yüklendiğinde işlenmez, dizindekiler
+döner. Aynı dosyanın eşzamanlı yüklemeleri dizin satırının kilidinde sıraya
+girer, sadece biri işler. Elle girilen dış linklerin türevi yoktur (boş
+liste); güncellemede bu, eski görselin türevlerini de temizler.
+"""
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import UploadFile
+from PIL import Image, ImageOps, features
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
+
+from .crud import upload_blobs as crud_blobs
+from .database import SessionLocal
+from .uploads import DEFAULT_MAX_BYTES, PUBLIC_PREFIX, UPLOAD_DIR, content_type_for, store_upload
+
+logger = logging.getLogger("uvicorn.error")
+
+# --- ENV ---
+VARIANT_WIDTHS = tuple(
+    sorted(int(w) for w in os.getenv("IMAGE_VARIANT_WIDTHS", "320,640,1280").split(",") if w.strip())
+)
+IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", "80"))
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", str(min(2, os.cpu_count() or 1))))
+IMAGE_TIMEOUT = float(os.getenv("IMAGE_TIMEOUT", "60"))  # saniye
+
+# Türev biçimleri: (uzantı, mime, Pillow biçimi, kaydetme seçenekleri)
+VARIANT_FORMATS = [("webp", "image/webp", "WEBP", {"quality": IMAGE_QUALITY, "method": 4})]
+if features.check("avif"):
+    # AVIF aynı kalitede daha küçüktür; daha yavaş kodlandığı için speed yüksek tutulur
+    VARIANT_FORMATS.append(("avif", "image/avif", "AVIF", {"quality": IMAGE_QUALITY - 20, "speed": 8}))
+
+# Orijinal yeniden kaydedilirken kullanılan seçenekler (exif verilmediği için meta veri düşer)
+ORIGINAL_OPTIONS: Dict[str, Dict[str, Any]] = {
+    "JPEG": {"quality": 85, "optimize": True, "progressive": True},
+    "PNG": {"optimize": True},
+    "WEBP": {"quality": 85},
+    "AVIF": {"quality": 65},
+}
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _executor() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # fork, thread'li bir süreçte kilitleri kopyalayabilir. forkserver temiz bir
+            # sunucu süreçten çatallar (Windows'ta yok, orada spawn kullanılır)
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _pool = ProcessPoolExecutor(max_workers=IMAGE_WORKERS, mp_context=context)
+        return _pool
+
+
+def _local_path(url: Optional[str]) -> Optional[str]:
+    """Sadece bizim yüklediğimiz dosyalar işlenir; dış linkler olduğu gibi kalır."""
+    if not url or not url.startswith(PUBLIC_PREFIX + "/"):
+        return None
+    name = os.path.basename(url)
+    path = os.path.join(UPLOAD_DIR, name)
+    return path if os.path.isfile(path) else None
+
+
+def _target_widths(width: int) -> List[int]:
+    widths = [w for w in VARIANT_WIDTHS if w < width]
+    # En küçük hedeften dar görseller için kendi genişliğinde tek türev yeterli
+    return widths or [width]
+
+
+def _save_atomic(im: Image.Image, path: str, pil_format: str, options: Dict[str, Any]) -> None:
+    # Geçici ad benzersizdir: aynı dosyayı eşzamanlı işleyenler birbirinin yarım dosyasını ezmez
+    tmp_path = os.path.join(os.path.dirname(path), f"{uuid.uuid4()}.part")
+    try:
+        im.save(tmp_path, format=pil_format, **options)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _save_addressed(im: Image.Image, src_path: str, pil_format: str, options: Dict[str, Any]) -> str:
+    """Görseli kodlar ve kodlanmış baytların özetiyle (`<sha256>.<uzantı>`) yazar."""
+    buf = io.BytesIO()
+    im.save(buf, format=pil_format, **options)
+    data = buf.getvalue()
+    _, ext = os.path.splitext(src_path)
+    path = os.path.join(os.path.dirname(src_path), hashlib.sha256(data).hexdigest() + ext)
+    if not os.path.exists(path):
+        tmp_path = os.path.join(os.path.dirname(path), f"{uuid.uuid4()}.part")
+        with open(tmp_path, "wb") as out:
+            out.write(data)
+        os.replace(tmp_path, path)
+    return path
+
+
+def _derive(path: str) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Havuz sürecinde çalışır. Yüklenen dosyaya dokunmaz: temizlenmiş orijinali
+    kendi içerik özetiyle yeni bir dosyaya, türevleri de bu adın yanına yazar.
+    (temiz dosyanın yolu, türevler) döndürür.
+    """
+    variants: List[Dict[str, Any]] = []
+    with Image.open(path) as im:
+        fmt = im.format
+        # Hareketli GIF/WebP tek kareye indirilmesin; olduğu gibi bırakılır
+        if getattr(im, "is_animated", False):
+            return path, variants
+        im = ImageOps.exif_transpose(im)
+        im.load()
+
+    clean_path = path
+    if fmt in ORIGINAL_OPTIONS:
+        save_im = im if fmt != "JPEG" or im.mode in ("RGB", "L") else im.convert("RGB")
+        clean_path = _save_addressed(save_im, path, fmt, ORIGINAL_OPTIONS[fmt])
+    stem, _ = os.path.splitext(clean_path)
+
+    if im.mode not in ("RGB", "RGBA"):
+        im = im.convert("RGBA" if "A" in im.getbands() or "transparency" in im.info else "RGB")
+
+    for width in _target_widths(im.width):
+        height = max(1, round(im.height * width / im.width))
+        resized = im if width == im.width else im.resize((width, height), Image.Resampling.LANCZOS)
+        for ext, mime, pil_format, options in VARIANT_FORMATS:
+            out = f"{stem}-{width}.{ext}"
+            _save_atomic(resized, out, pil_format, options)
+            variants.append({
+                "url": f"{PUBLIC_PREFIX}/{os.path.basename(out)}",
+                "width": width,
+                "height": height,
+                "type": mime,
+            })
+    return clean_path, variants
+
+
+def make_variants(url: Optional[str]) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Yüklenmiş görseli süreç havuzunda işler ve bekler: (temiz URL, türevler).
+    Başarısız olursa (zaman aşımı, bozuk dosya, havuz çöktü) None döner.
+    Bloklayan çağrıdır; `def` endpoint'lerde (threadpool) kullanılır.
+    """
+    path = _local_path(url)
+    if path is None:
+        return None
+    try:
+        clean_path, variants = _executor().submit(_derive, path).result(timeout=IMAGE_TIMEOUT)
+    except Exception:
+        logger.exception("Görsel türevleri üretilemedi: %s", url)
+        return None
+    return f"{PUBLIC_PREFIX}/{os.path.basename(clean_path)}", variants
+
+
+def _has_no_variants(path: str) -> bool:
+    """Türevi hiç olmayan görsel (hareketli GIF/WebP): boş liste geçerli bir sonuçtur."""
+    try:
+        with Image.open(path) as im:
+            return bool(getattr(im, "is_animated", False))
+    except Exception:
+        return False
+
+
+def _is_complete(url: Optional[str], variants: Optional[List[Dict[str, Any]]]) -> bool:
+    """Kayıttaki dosya ve türevleri diskte mi? None ya da açıklanamayan boş liste eksik sayılır."""
+    path = _local_path(url)
+    if path is None or variants is None:
+        return False
+    if not variants:
+        return _has_no_variants(path)
+    return all(_local_path(v["url"]) is not None for v in variants)
+
+
+# Aynı süreçte aynı özet için türetme sırayla yapılır. Süreçler arasında aynı
+# özet iki kez türetilebilir (çıktı aynıdır, atomik yazılır); kayda yazma
+# `lock_blob`'un kısa satır kilidinde sıraya girer
+_digest_locks = [threading.Lock() for _ in range(64)]
+
+
+def _digest_lock(sha256: str) -> threading.Lock:
+    return _digest_locks[int(sha256[:8], 16) % len(_digest_locks)]
+
+
+def _touch_files(url: str, variants: List[Dict[str, Any]]) -> None:
+    """
+    Yeniden kullanılan temiz dosyanın ve türevlerinin mtime'ını yeniler. Çöp
+    toplayıcının (app/upload_gc.py) bekleme süresi mtime'a bakar; tekrar
+    yüklenip yeni bir kayda bağlanan dosya, kayıt kaydedilmeden silinmez.
+    """
+    for public_url in chain([url], (v["url"] for v in variants)):
+        path = _local_path(public_url)
+        if path is None:
+            continue
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+
+def _discard_upload(db, url: str, kept_url: str) -> None:
+    """
+    İşlenmiş kopyası yazılan ham yüklemeyi (EXIF/GPS içerebilir) siler.
+    Başka bir kaydın işlenmiş dosyası olarak kullanılan dosyaya dokunulmaz.
+    """
+    path = _local_path(url)
+    if url == kept_url or path is None or crud_blobs.get_blob_by_url(db, url) is not None:
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def indexed_variants(url: str) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Yüklenen dosyanın (`<sha256>.<uzantı>`) servis edilecek temiz URL'sini ve
+    türevlerini verir: dizinde hazırsa oradan, değilse üretip dizine yazar.
+    Yüklenen dosya hiçbir zaman yerinde yeniden kodlanmaz. Zaten bizim
+    ürettiğimiz temiz bir dosya tekrar yüklenirse yeniden işlenmez.
+
+    Türetme başarısız olursa yükleme yine kabul edilir (ham URL, boş liste)
+    ama dizine tamamlanmış olarak yazılmaz; aynı dosya tekrar yüklendiğinde
+    yeniden denenir. Dizine erişilemezse türetme dizinsiz yapılır.
+    """
+    sha256 = os.path.splitext(os.path.basename(url))[0]
+    path = _local_path(url)
+    if path is None:
+        return url, []
+    size = os.path.getsize(path)
+    result: Optional[Tuple[str, List[Dict[str, Any]]]] = None
+    with _digest_lock(sha256):
+        try:
+            with SessionLocal() as db:
+                blob, created = crud_blobs.claim_blob(db, sha256, url, content_type_for(url), size)
+                reuse = not created and _is_complete(blob.url, blob.variants)
+                if not reuse:
+                    known = crud_blobs.get_blob_by_url(db, url)
+                    if known is not None and _is_complete(known.url, known.variants):
+                        result = (known.url, known.variants)
+                        _touch_files(*result)
+                    else:
+                        # Türetme sürerken bağlantı transaction'da boşta beklemez
+                        db.commit()
+                        result = make_variants(url)
+                    # Bu arada başka bir worker kaydı tamamlamış olabilir (ham dosya
+                    # onun tarafından silindiyse bizim türetmemiz de başarısızdır)
+                    blob = crud_blobs.lock_blob(db, sha256)
+                    reuse = _is_complete(blob.url, blob.variants)
+                    if not reuse and result is None:
+                        db.commit()  # türevsiz kalır, kilit bırakılır
+                    elif not reuse:
+                        crud_blobs.save_blob(db, blob, result[0], result[1], reuploaded=not created)
+                if reuse:
+                    result = (blob.url, blob.variants)
+                    _touch_files(*result)
+                    crud_blobs.touch_blob(db, blob)
+                if result is not None:
+                    _discard_upload(db, url, result[0])
+        except SQLAlchemyError:
+            logger.exception("Yükleme dizini güncellenemedi: %s", url)
+            # Yüklenen dosya değişmediği için tekrar işlemek güvenlidir
+            if result is None:
+                result = make_variants(url)
+    return result if result is not None else (url, [])
+
+
+def store_image(file: UploadFile, max_bytes: int = DEFAULT_MAX_BYTES) -> Tuple[str, List[Dict[str, Any]]]:
+    """Görseli kaydeder (bkz. `store_upload`) ve (temiz url, türevler) döndürür."""
+    return indexed_variants(store_upload(file, max_bytes))
+
+
+async def store_image_async(file: UploadFile, max_bytes: int = DEFAULT_MAX_BYTES) -> Tuple[str, List[Dict[str, Any]]]:
+    """`async def` endpoint'ler için: yazma, dizin ve havuz beklemesi threadpool'da yapılır."""
+    return await run_in_threadpool(store_image, file, max_bytes)
+
+
+def manual_variants(url: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Formdan elle gelen URL için `*_variants` değeri. Dış linkin türevi yoktur
+    ([] -> eski türevler temizlenir); boş ya da zaten yüklenmiş bir dosyanın
+    URL'si ise None döner ve mevcut türevlere dokunulmaz.
+    """
+    if url is None or url.startswith(PUBLIC_PREFIX + "/"):
+        return None
+    return []
@@ -1,5 +1,99 @@
-from slowapi import Limiter
+"""
+Hız sınırlama (slowapi / limits).
+
+Sayaçlar RATE_LIMIT_STORAGE_URI'deki (verilmemişse REDIS_URL'deki) depoda
+tutulur. İkisi de yoksa `memory://` kullanılır: her worker'a ayrı sayaç
+verir, birden fazla uvicorn worker'ı ile limit worker sayısıyla çarpılır.
+Üretimde ortak bir depo verilmelidir:
+
+    REDIS_URL=redis://localhost:6379/1
+    RATE_LIMIT_STORAGE_URI=memcached://localhost:11211
+
+WEB_CONCURRENCY (uvicorn/gunicorn'un worker sayısı) 1'den büyükken depo
+`memory://` ise açılışta uyarı loglanır. RATE_LIMIT_REQUIRE_SHARED=true ile
+uyarı yerine uygulama hiç açılmaz (fail-closed).
+
+Strateji `moving-window`dır (kayan pencere): sabit pencerenin sınırında iki
+kat istek geçirme açığı yoktur. Depoya ulaşılamazsa istekler reddedilmez,
+worker içi bellek sayaçlarına düşülür.
+
+Limitler rota başına dekoratörle verilir; herkese açık tüm yazma (POST)
+rotaları aşağıdaki sabitlerden birini kullanır.
+"""
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict
+
+from dotenv import load_dotenv
+from slowapi import Limiter, _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
+from starlette.requests import Request
+
+logger = logging.getLogger("uvicorn.error")
+
+# --- ENV ---
+# main.py bu modülü kendi load_dotenv'inden önce import eder
+load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent / ".env")
+RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI") or os.getenv("REDIS_URL") or "memory://"
+RATE_LIMIT_REQUIRE_SHARED = os.getenv("RATE_LIMIT_REQUIRE_SHARED", "false").lower() in ("1", "true", "yes")
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+RATE_LIMIT_STRATEGY = os.getenv("RATE_LIMIT_STRATEGY", "moving-window")
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() not in ("0", "false", "no")
+
+# Rota limitleri ("5/minute;30/hour" gibi birden fazla pencere verilebilir)
+LOGIN_LIMIT = os.getenv("RATE_LIMIT_LOGIN", "5/minute")
+COMMUNITY_APPLY_LIMIT = os.getenv("RATE_LIMIT_COMMUNITY_APPLY", "3/minute;20/hour")
+EVENT_SUGGESTION_LIMIT = os.getenv("RATE_LIMIT_EVENT_SUGGESTION", "5/minute;30/hour")
+EVENT_REGISTRATION_LIMIT = os.getenv("RATE_LIMIT_EVENT_REGISTRATION", "10/minute")
 
 # Trafik Polisi (IP adresine göre engelleme yapar)
-limiter = Limiter(key_func=get_remote_address)
\ No newline at end of file
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    strategy=RATE_LIMIT_STRATEGY,
+    key_prefix="ayzek",
+    in_memory_fallback_enabled=not RATE_LIMIT_STORAGE_URI.startswith("memory://"),
+    enabled=RATE_LIMIT_ENABLED,
+)
+
+
+def check_storage(
+    storage_uri: str = RATE_LIMIT_STORAGE_URI,
+    workers: int = WEB_CONCURRENCY,
+    require_shared: bool = RATE_LIMIT_REQUIRE_SHARED,
+) -> None:
+    """Birden fazla worker süreç içi sayaçlarla çalışıyorsa uyarır (ya da açılışı durdurur)."""
+    if not RATE_LIMIT_ENABLED or workers <= 1 or not storage_uri.startswith("memory://"):
+        return
+    message = (
+        f"Hız sınırı sayaçları worker başına ayrı (memory://, {workers} worker): limitler "
+        f"{workers} katına çıkar. REDIS_URL ya da RATE_LIMIT_STORAGE_URI ile ortak bir depo verin."
+    )
+    if require_shared:
+        raise RuntimeError(message)
+    logger.warning(message)
+
+
+check_storage()
+
+
+# --- REDDEDİLEN İSTEK SAYAÇLARI ---
+_rejections: Dict[str, int] = {}
+_rejections_lock = threading.Lock()
+
+
+def rate_limit_stats() -> Dict[str, int]:
+    """Rota -> reddedilen istek sayısı (bu worker)."""
+    with _rejections_lock:
+        return dict(_rejections)
+
+
+def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    route = request.scope.get("route")
+    key = getattr(route, "path", None) or request.url.path
+    with _rejections_lock:
+        _rejections[key] = _rejections.get(key, 0) + 1
+    return _rate_limit_exceeded_handler(request, exc)
@@ -1,15 +1,19 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles 
-from starlette.middleware.gzip import GZipMiddleware
 from dotenv import load_dotenv
 import logging, os
 
 # --- GÜVENLİK (RATE LIMIT) IMPORTLARI ---
-from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
-from app.limiter import limiter # Oluşturduğumuz ayar dosyasından çekiyoruz
+from app.limiter import limiter, rate_limit_exceeded_handler # Oluşturduğumuz ayar dosyasından çekiyoruz
+from app.pagination import InvalidCursor
+from app.uploads import UploadLimitMiddleware
+from app.static import CachedStaticFiles
+from app.compression import CompressionMiddleware
+from app.middleware import AdminAuthMiddleware
+from app.metrics import MetricsMiddleware
+from app.query_stats import QueryStatsMiddleware
 
 load_dotenv()
 
@@ -27,13 +31,21 @@ from app.routers.blog import router as blog_router
 from app.routers.admin_auth import router as admin_auth_router
 from app.routers.teams import router as teams_router
 from app.routers.crew import router as crew_router
+from app.routers.home import router as home_router
+from app.routers.metrics import router as metrics_router
 
 app = FastAPI(title="AYZEK Platform Backend", version="1.0.0")
 
 # --- RATE LIMITER'I AKTİF ET ---
 # Bu satırlar sunucuya "Trafik polisini göreve başlat" der.
 app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)  # 429 + reddedilenler sayılır
+
+
+# Bozuk/uydurma cursor parametresi 500 yerine 400 döner
+@app.exception_handler(InvalidCursor)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+    return JSONResponse(status_code=400, content={"detail": "Geçersiz cursor"})
 
 env_origins = os.getenv("ALLOWED_ORIGINS", "")
 ALLOWED_ORIGINS = [o.strip() for o in env_origins.split(",") if o.strip()] or [ 
@@ -43,19 +55,36 @@ ALLOWED_ORIGINS = [o.strip() for o in env_origins.split(",") if o.strip()] or [
     "http://ayzek.tr",
 ]
 
+# Admin token'ı bir kez çözülür, kimlik önbellekten gelir (bkz. app/middleware.py, app/security.py)
+app.add_middleware(AdminAuthMiddleware)
+
+# Büyük multipart gövdeleri ayrıştırılmadan önce reddeder (rota başına limit: app/uploads.py).
+# CORS'tan önce eklenir ki 413 yanıtı da CORS başlıklarını alsın.
+app.add_middleware(UploadLimitMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],  # sayfalama başlıkları (app/pagination.py)
 )
 
-app.add_middleware(GZipMiddleware, minimum_size=1024)
+# br/zstd/gzip pazarlığı; görseller ve zaten kodlanmış yanıtlar atlanır (bkz. app/compression.py)
+app.add_middleware(CompressionMiddleware)
+
+# İstek başına SQL sayısı/süresi -> Server-Timing, yavaş sorgu ve N+1 logu (bkz. app/query_stats.py)
+app.add_middleware(QueryStatsMiddleware)
+
+# En dışta: sıkıştırma ve diğer middleware'ler dahil tüm istek süresini ölçer (bkz. app/metrics.py)
+app.add_middleware(MetricsMiddleware)
 
 # Klasör Kontrolleri
 os.makedirs("public/uploads", exist_ok=True)
-app.mount("/public", StaticFiles(directory="public"), name="public")
+# Hash/uuid adlı yüklemeler immutable önbelleklenir; üretimde STATIC_SENDFILE ile
+# dosyalar ters vekile devredilir (bkz. app/static.py)
+app.mount("/public", CachedStaticFiles(directory="public"), name="public")
 
 logger = logging.getLogger("uvicorn.error")
 
@@ -76,6 +105,8 @@ app.include_router(blog_router)
 app.include_router(admin_auth_router)  
 app.include_router(teams_router)
 app.include_router(crew_router)
+app.include_router(home_router)
+app.include_router(metrics_router)
 
 @app.get("/")
 def root():
@@ -0,0 +1,261 @@
+# app/metrics.py
+"""
+Prometheus metin biçiminde uygulama metrikleri (`GET /metrics`).
+
+- `MetricsMiddleware`: rota şablonu başına gecikme histogramı
+  (`/events/{event_id}` gibi; ham yol etiket olmaz), method/rota/durum
+  sayacı ve o an işlenen istek sayısı.
+- `TimedQueuePool`: SQLAlchemy havuzundan bağlantı alırken geçen bekleme
+  süresini ve zaman aşımlarını ölçer (app/database.py `poolclass`).
+  Havuz boyutu, kullanımdaki ve taşma (overflow) bağlantıları okuma anında
+  `engine.pool`'dan alınır. `pool_size`/`max_overflow` ayarı bu değerlere
+  göre yapılır: bekleme histogramı sıfırdan uzaklaşıyorsa havuz dardır.
+- Threadpool doygunluğu: senkron `def` endpoint'ler anyio'nun varsayılan
+  thread sınırlayıcısından jeton alır; dolu ve bekleyen görev sayısı raporlanır.
+- İstek başına SQL sorgu sayısı ve süresi (app/query_stats.py).
+- Yanıt önbelleği (app/cache.py) ve hız sınırı (app/limiter.py) sayaçları.
+
+Dış bağımlılık yoktur. Sayaçlar süreç içidir: birden fazla uvicorn worker'ı
+çalışıyorsa her worker kendi değerlerini verir; hangi worker'ın yanıt
+verdiği `ayzek_process_info{pid=...}` ile görülür.
+"""
+import math
+import os
+import threading
+import time
+from typing import Dict, List, Sequence, Tuple
+
+import anyio.to_thread
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# --- ENV ---
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")  # boş değilse /metrics Bearer token ister
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+LabelValues = Tuple[str, ...]
+PID = str(os.getpid())
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _num(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name, self.help, self.label_names = name, help, tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_labels(self.label_names, k)} {_num(v)}" for k, v in items]
+        return lines
+
+
+class Gauge(Counter):
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name, self.help, self.label_names = name, help, tuple(labels)
+        self.buckets = tuple(buckets) + (math.inf,)
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}  # (kovalar, [toplam, adet])
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            counts, totals = self._values.setdefault(labels, ([0] * len(self.buckets), [0.0, 0]))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            totals[0] += value
+            totals[1] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, (list(c), list(t))) for k, (c, t) in self._values.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, (total, count)) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                le = f'le="{_num(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_num(total)}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {count}")
+        return lines
+
+
+# --- METRİKLER ---
+REQUESTS = Counter("ayzek_http_requests_total", "HTTP istekleri", ("method", "route", "status"))
+LATENCY = Histogram("ayzek_http_request_duration_seconds", "İstek süresi", ("method", "route"))
+IN_FLIGHT = Gauge("ayzek_http_requests_in_flight", "Şu an işlenen istekler", ("method",))
+POOL_WAIT = Histogram(
+    "ayzek_db_pool_wait_seconds", "Havuzdan bağlantı alma bekleme süresi", buckets=POOL_WAIT_BUCKETS,
+)
+POOL_TIMEOUTS = Counter("ayzek_db_pool_timeouts_total", "Havuz bekleme zaman aşımları")
+# İstek başına SQL (app/query_stats.py)
+DB_QUERIES = Histogram(
+    "ayzek_db_queries_per_request", "İstek başına SQL sorgusu", ("method", "route"), buckets=QUERY_COUNT_BUCKETS,
+)
+DB_TIME = Histogram("ayzek_db_time_per_request_seconds", "İstek başına toplam SQL süresi", ("method", "route"))
+
+ALL_METRICS = (REQUESTS, LATENCY, IN_FLIGHT, POOL_WAIT, POOL_TIMEOUTS, DB_QUERIES, DB_TIME)
+
+
+class TimedQueuePool(QueuePool):
+    """Bağlantı alma (checkout) beklemesini ölçen QueuePool; `recreate()` sonrası da korunur."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - started)
+
+
+def route_label(scope: Scope) -> str:
+    """Yüksek kardinaliteyi önlemek için ham yol yerine rota şablonu."""
+    route = scope.get("route")
+    if route is not None:
+        return getattr(route, "path", "unmatched")
+    if "endpoint" in scope:  # mount (ör. /public statik dosyalar)
+        return scope.get("root_path") or "mounted"
+    return "unmatched"
+
+
+# --- MIDDLEWARE ---
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        method = scope["method"]
+        status_code = 500  # yanıt başlamadan çıkan hata
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc(method)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec(method)
+            route = route_label(scope)
+            LATENCY.observe(time.perf_counter() - started, method, route)
+            REQUESTS.inc(method, route, str(status_code))
+
+
+# --- ANLIK DEĞERLER ---
+def _gauge_lines(name: str, help: str, samples: List[Tuple[Dict[str, str], float]], kind: str = "gauge") -> List[str]:
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_labels(tuple(labels), tuple(labels.values()))} {_num(value)}")
+    return lines
+
+
+def _pool_lines() -> List[str]:
+    from .database import async_engine, engine  # lazy import: database bu modülü import eder
+
+    pools = [("sync", engine.pool)]
+    if async_engine is not None:
+        pools.append(("async", async_engine.pool))
+    stats = {"size": [], "checked_out": [], "checked_in": [], "overflow": [], "max_overflow": []}
+    for name, pool in pools:
+        if not isinstance(pool, QueuePool):
+            continue
+        labels = {"pool": name}
+        stats["size"].append((labels, pool.size()))
+        stats["checked_out"].append((labels, pool.checkedout()))
+        stats["checked_in"].append((labels, pool.checkedin()))
+        stats["overflow"].append((labels, max(pool.overflow(), 0)))
+        stats["max_overflow"].append((labels, pool._max_overflow))
+    lines: List[str] = []
+    lines += _gauge_lines("ayzek_db_pool_size", "pool_size", stats["size"])
+    lines += _gauge_lines("ayzek_db_pool_checked_out", "Kullanımdaki bağlantılar", stats["checked_out"])
+    lines += _gauge_lines("ayzek_db_pool_checked_in", "Havuzda boşta bekleyen bağlantılar", stats["checked_in"])
+    lines += _gauge_lines("ayzek_db_pool_overflow", "pool_size üstünde açılmış bağlantılar", stats["overflow"])
+    lines += _gauge_lines("ayzek_db_pool_max_overflow", "max_overflow", stats["max_overflow"])
+    return lines
+
+
+def _threadpool_lines() -> List[str]:
+    # Event loop içinde çağrılmalı (sınırlayıcı loop başınadır)
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    stats = limiter.statistics()
+    return (
+        _gauge_lines("ayzek_threadpool_tokens", "Threadpool kapasitesi", [({}, limiter.total_tokens)])
+        + _gauge_lines("ayzek_threadpool_busy", "Kullanımdaki thread'ler", [({}, stats.borrowed_tokens)])
+        + _gauge_lines("ayzek_threadpool_waiting", "Thread bekleyen görevler", [({}, stats.tasks_waiting)])
+    )
+
+
+def _cache_lines() -> List[str]:
+    from .cache import response_cache
+
+    stats = response_cache.stats()
+    lines: List[str] = []
+    for key in ("hits", "misses", "evictions", "invalidations"):
+        lines += _gauge_lines(f"ayzek_response_cache_{key}_total", f"Yanıt önbelleği {key}", [({}, stats[key])], "counter")
+    lines += _gauge_lines("ayzek_response_cache_entries", "Yanıt önbelleğindeki kayıtlar", [({}, stats["size"])])
+    return lines
+
+
+def _rate_limit_lines() -> List[str]:
+    from .limiter import rate_limit_stats
+
+    samples = [({"route": route}, n) for route, n in sorted(rate_limit_stats().items())]
+    return _gauge_lines("ayzek_rate_limit_rejections_total", "429 ile reddedilen istekler", samples, "counter")
+
+
+def render_metrics() -> str:
+    lines = _gauge_lines("ayzek_process_info", "Metrikleri veren worker süreci", [({"pid": PID}, 1)])
+    for metric in ALL_METRICS:
+        lines += metric.render()
+    lines += _pool_lines()
+    lines += _threadpool_lines()
+    lines += _cache_lines()
+    lines += _rate_limit_lines()
+    return "\n".join(lines) + "\n"
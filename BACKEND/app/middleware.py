@@ -1,29 +1,50 @@
-from fastapi import Request, status
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from .security import decode_access_token
+from .security import principal_cache, resolve_admin_standalone, token_from_request
 
-class JWTMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, protected_paths=None, excluded_paths=None):
-        super().__init__(app)
-        self.protected_paths = protected_paths or ["/admin"]
+# Token taşıyan ama sadece okuma yapan herkese açık istekler çözülmez
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class AdminAuthMiddleware:
+    """
+    Admin kimliğini kenarda (edge) bir kez çözer ve `request.state.admin`
+    olarak bırakır; `require_admin` bunu görürse token'ı tekrar doğrulamaz,
+    veritabanına da gitmez (bkz. app/security.py, principal önbelleği).
+
+    Sadece /admin altındaki ve yazma (POST/PUT/PATCH/DELETE) istekleri için
+    çalışır. Reddetmez: token geçersizse durum boş kalır ve hata yanıtını
+    (401/403) rotanın bağımlılığı üretir; herkese açık rotalar etkilenmez.
+    """
+
+    def __init__(self, app: ASGIApp, protected_paths=None, excluded_paths=None):
+        self.app = app
+        self.protected_paths = tuple(protected_paths or ["/admin"])
         self.excluded_paths = set(excluded_paths or ["/admin/login", "/docs", "/redoc", "/openapi.json"])
 
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path
-
-        is_protected = any(path.startswith(p) for p in self.protected_paths)
-        if is_protected and path not in self.excluded_paths:
-            auth = request.headers.get("Authorization")
-            if not auth or not auth.startswith("Bearer "):
-                return JSONResponse(status_code=status.HTTP_401_UNAUTHORIZED,
-                                    content={"detail": "Missing or invalid authorization header"})
-            token = auth.split(" ", 1)[1]
-            payload = decode_access_token(token)
-            if payload is None:
-                return JSONResponse(status_code=status.HTTP_401_UNAUTHORIZED,
-                                    content={"detail": "Invalid or expired token"})
-            request.state.current_user_email = payload.get("sub")
-
-        return await call_next(request)
+    def _wants_admin(self, scope: Scope) -> bool:
+        path = scope["path"]
+        if path in self.excluded_paths:
+            return False
+        return path.startswith(self.protected_paths) or scope["method"] not in SAFE_METHODS
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._wants_admin(scope):
+            return await self.app(scope, receive, send)
+
+        token = token_from_request(Request(scope))
+        if token:
+            # Önbellek isabeti bekletmeden döner; kaçırmada DB sorgusu threadpool'da yapılır
+            principal = principal_cache.get(token)
+            if principal is None:
+                try:
+                    principal = await run_in_threadpool(resolve_admin_standalone, token)
+                except HTTPException:
+                    principal = None
+            if principal is not None:
+                scope.setdefault("state", {})["admin"] = principal
+
+        await self.app(scope, receive, send)
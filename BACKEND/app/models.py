@@ -1,6 +1,7 @@
 from sqlalchemy import (
     Column,     #bir tablo sütunu oluşturur.
     Integer,
+    BigInteger,
     String,
     Text,
     DateTime,
@@ -9,11 +10,15 @@ from sqlalchemy import (
     ForeignKey, #bir sütunu başka bir tablonun id sine bağlamak için kullanılır.
     Enum,       #be yazmamız gerektiği belirlenmiştir. Başka bir şey yazamazsın
     Boolean,
+    JSON,       #görsel türevleri gibi yapılandırılmış veriler için
+    UniqueConstraint,
+    Index,
     func,       #sql in kendi fonksiyonlarını kullanmamızı sağlar.
 )
     # noqa: E402
 #from sqlalchemy.sql import
-from sqlalchemy.orm import relationship, Mapped, mapped_column
+from sqlalchemy.orm import relationship, Mapped, mapped_column, deferred
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from app.database import Base
 from datetime import datetime
 import enum
@@ -52,6 +57,9 @@ class CommunityApplication(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Admin listesi: status filtresi + created_at DESC, id DESC
+    __table_args__ = (Index('ix_community_applications_status_created', status, created_at.desc(), id.desc()),)
+
 
 # -------------------------
 # Var olan modeller
@@ -65,6 +73,8 @@ class TimelineEvents(Base):
     category = Column(String, nullable=False)
     date_label = Column(String, nullable=False)  # "Mart 2024" gibi
     image_url = Column(String, nullable=False)
+    # Yüklenen görselin WebP/AVIF türevleri [{url, width, height, type}] (bkz. app/images.py)
+    image_variants = Column(JSON, nullable=True)
 
 
 class Event(Base):
@@ -75,6 +85,7 @@ class Event(Base):
     title = Column(String(200), nullable=False)                          # Başlık
     description = Column(Text, nullable=False)                           # Açıklama
     cover_image_url = Column(Text, nullable=False)                       # Fotoğraf
+    cover_image_variants = Column(JSON, nullable=True)                   # Fotoğrafın srcset türevleri
     start_at = Column(DateTime, nullable=False)                          # Tarih+Saat
     location = Column(String(200), nullable=False)                       # Konum
     category = Column(String(50), nullable=False)                        # Workshop/Meetup vb.
@@ -85,6 +96,9 @@ class Event(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow)
 
+    # Liste (start_at DESC, id DESC) ve yaklaşanlar (start_at >= now) sorguları
+    __table_args__ = (Index('ix_events_start_at_id', start_at, id),)
+
 
 class GalleryEvent(Base):
     __tablename__ = "gallery_events"
@@ -92,12 +106,15 @@ class GalleryEvent(Base):
     id = Column(Integer, primary_key=True, index=True)
     category = Column(String(50), nullable=False)         # Workshop / Hackathon / Networking ...
     image_url = Column(Text, nullable=False)              # S3 / CDN / public URL
+    image_variants = Column(JSON, nullable=True)          # srcset türevleri
     title = Column(String(150), nullable=False)
     description = Column(Text, nullable=False)
     date = Column(Date, nullable=False)                   # 2025-05-13 gibi
     location = Column(String(120), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (Index('ix_gallery_events_date', date.desc()),)
+
 # -------------------------
 # Etkinlik Önerileri (Kullanıcıdan → Admin panele)
 # -------------------------
@@ -132,6 +149,7 @@ class Poster(Base):
     subtitle: Mapped[str | None] = mapped_column(String(250))               # Alt Başlık
     content: Mapped[str | None] = mapped_column(Text)                       # İçerik
     image_url: Mapped[str | None] = mapped_column(String(500))              # Görsel URL
+    image_variants: Mapped[list | None] = mapped_column(JSON)               # srcset türevleri
     order_index: Mapped[int] = mapped_column(Integer, default=0, index=True) # Sıralama
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -139,6 +157,9 @@ class Poster(Base):
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    # Aktif posterler sırasıyla: is_active, order_index, id
+    __table_args__ = (Index('ix_posters_active_order', 'is_active', 'order_index', 'id'),)
+
 class Blog(Base):
     __tablename__ = "blogs"
 
@@ -148,8 +169,15 @@ class Blog(Base):
     author = Column(String(120), nullable=False, default="AYZEK Ekibi")
     category = Column(String(80), nullable=False, index=True)  # ör: "Yapay Zeka", "Algoritma", "Web", "Makine Öğrenmesi"
     cover_image = Column(String(400), nullable=True)           # "/images/blog/kapak.jpg" ya da tam URL
+    cover_image_variants = Column(JSON, nullable=True)         # kapak görselinin srcset türevleri
     date = Column(Date, nullable=False)                        # yayın tarihi
     preview = Column(Text, nullable=True)                      # kart üstü kısa özet
+    # Tam metin arama vektörü; DB tetikleyicisi doldurur (bkz. 4c5504e8eed8 migration'ı).
+    # deferred: normal listelemelerde SELECT'e girmez.
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+
+    # Liste/keyset sırası: date DESC, id DESC
+    __table_args__ = (Index('ix_blogs_date_id', date.desc(), id.desc()),)
 
 
 class Admin(Base):
@@ -159,6 +187,9 @@ class Admin(Base):
     email = Column(String, unique=True, index=True)
     password = Column(String)
     totp_secret = Column(String, nullable=True)
+    # Token'lar `ver` olarak taşır; parola/2FA değişince artar ve eski
+    # oturumların hepsi geçersiz olur (bkz. app/security.py)
+    token_version = Column(Integer, nullable=False, default=0, server_default='0')
 
 
 class TeamMember(Base):
@@ -194,6 +225,7 @@ class Team(Base):
     description = Column(Text, nullable=False)
     is_featured = Column(Boolean, default=False)
     photo_url = Column(String(255), nullable=True)
+    photo_variants = Column(JSON, nullable=True)  # srcset türevleri
     
     # Zaman Bilgileri
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -202,6 +234,9 @@ class Team(Base):
     # İlişki
     members = relationship("TeamMember", back_populates="team", cascade="all, delete-orphan")
 
+    # Öne çıkan takımlar için kısmi indeks
+    __table_args__ = (Index('ix_teams_featured', id, postgresql_where=is_featured),)
+
     def __repr__(self):
         return f"<Team(name='{self.name}', slug='{self.slug}')>"
 
@@ -216,9 +251,16 @@ class JourneyPerson(Base):
     role = Column(String(100), nullable=False)
     description = Column(String(255), nullable=False)
     photo_url = Column(String(255), nullable=True) # Opsiyonel görsel
+    photo_variants = Column(JSON, nullable=True)   # srcset türevleri
+
+    # Yıl içindeki sıralama (sürükle-bırak)
+    order_index = Column(Integer, nullable=True)
 
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # Gruplu liste sırası: year DESC, order_index, created_at, id
+    __table_args__ = (Index('ix_journey_people_year_order', year.desc(), order_index, created_at, id),)
+
     def __repr__(self):
         return f"<JourneyPerson(name='{self.name}', year={self.year})>"
 
@@ -232,6 +274,7 @@ class CrewMember(Base):
     role = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)  # Uzun açıklama için Text
     photo_url = Column(String(255), nullable=True)
+    photo_variants = Column(JSON, nullable=True)  # srcset türevleri
     linkedin_url = Column(String(255), nullable=True)
     github_url = Column(String(255), nullable=True)
     
@@ -243,5 +286,82 @@ class CrewMember(Base):
 
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # Gruplu liste sırası: category, order_index, created_at, id
+    __table_args__ = (Index('ix_crew_members_category_order', category, order_index, created_at, id),)
+
     def __repr__(self):
         return f"<CrewMember(name='{self.name}', category='{self.category}')>"
+
+
+class UploadBlob(Base):
+    """
+    Yüklenen dosyaların içerik adresli dizini (bkz. app/uploads.py, app/images.py).
+    Anahtar, yüklenen ham baytların SHA-256 özetidir; `url` ise servis edilen
+    temiz kopyanın (kendi özetiyle adlandırılmış) adresidir. Aynı dosya ikinci
+    kez yüklendiğinde işlenmez, kayıttaki URL ve türevler yeniden kullanılır.
+    Sadece meta verisi farklı iki yükleme aynı temiz dosyaya çıkabilir; bu
+    yüzden `url` tekil değildir.
+    """
+    __tablename__ = 'upload_blobs'
+
+    sha256 = Column(String(64), primary_key=True)
+    url = Column(String(255), nullable=False, index=True)       # /public/uploads/<sha256>.<uzantı> (temiz kopya)
+    content_type = Column(String(50), nullable=False)
+    size = Column(Integer, nullable=False)                      # ilk yüklemedeki bayt sayısı
+    variants = Column(JSON, nullable=True)                      # srcset türevleri; None: henüz üretilmedi
+    upload_count = Column(Integer, nullable=False, default=1)   # kaç kez yüklendi (tekilleştirme oranı)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_uploaded_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<UploadBlob(sha256='{self.sha256[:12]}', url='{self.url}')>"
+
+
+class EventWaitlist(Base):
+    """
+    Kontenjanı dolan etkinlik için bekleme listesi (bkz. crud/events.py
+    `join_waitlist`; yer kalmadığı `claim_seat` ile anlaşılır). Aynı e-posta
+    bir etkinlikte bir kez yer alır; sıra `id`'ye göredir.
+    """
+    __tablename__ = 'event_waitlist'
+    __table_args__ = (UniqueConstraint('event_id', 'email', name='uq_event_waitlist_event_email'),)
+
+    id = Column(Integer, primary_key=True)
+    event_id = Column(Integer, ForeignKey('events.id', ondelete='CASCADE'), nullable=False, index=True)
+    name = Column(String(150), nullable=True)
+    email = Column(String(255), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<EventWaitlist(event_id={self.event_id}, email='{self.email}')>"
+
+
+class TableVersion(Base):
+    """
+    Tablo başına içerik sürümü (bkz. app/versions.py). Yanıt önbelleği ve
+    ETag'ler bu değerlere bağlıdır; tüm worker'lar aynı satırları okur.
+    Yazma transaction'ı commit'ten önce ilgili satırı bir artırır.
+    """
+    __tablename__ = 'table_versions'
+
+    table_name = Column(String(100), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TableVersion(table_name='{self.table_name}', version={self.version})>"
+
+
+class RevokedToken(Base):
+    """
+    Çıkışta iptal edilen admin token'ları (bkz. app/security.py). Ham token
+    değil SHA-256 özeti saklanır. Satır, token'ın kendi süresi dolana kadar
+    anlamlıdır; süresi geçenler yeni iptaller sırasında silinir.
+    """
+    __tablename__ = 'revoked_tokens'
+
+    token_hash = Column(String(64), primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<RevokedToken(token_hash='{self.token_hash[:12]}', expires_at={self.expires_at})>"
@@ -0,0 +1,192 @@
+# app/pagination.py
+"""
+Keyset (cursor) sayfalama yardımcıları.
+
+OFFSET ile derin sayfalar giderek yavaşlar ve araya yeni kayıt girdiğinde
+kayar. Keyset modunda bir sonraki sayfa, önceki sayfanın son satırının
+sıralama anahtarından (ör. `created_at, id`) sonra gelen satırlardır:
+
+    WHERE (created_at, id) < (:son_created_at, :son_id)
+    ORDER BY created_at DESC, id DESC
+    LIMIT :limit
+
+Böylece her sayfa, ilk sayfa kadar ucuzdur. Cursor istemciye opak bir
+base64 dizesi olarak verilir.
+
+Toplam kayıt sayısı ayrı bir COUNT sorgusuyla değil, filtreli listelerde
+sayfa sorgusuna eklenen `count(*) OVER ()` ile aynı turda alınır. Filtresiz
+listelerde tablo sürümüne (`app/versions.py`) bağlı önbelleklenmiş sayım
+kullanılır. Toplam, yanıtlarda `X-Total-Count` başlığıyla döner.
+"""
+import base64
+import binascii
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, literal, tuple_
+
+from . import versions
+
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", "60"))  # saniye
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass
+class Page:
+    items: List[Any]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
+def _encode_value(v: Any) -> Any:
+    if isinstance(v, datetime):
+        return {"dt": v.isoformat()}
+    if isinstance(v, date):
+        return {"d": v.isoformat()}
+    return v
+
+
+def _decode_value(v: Any) -> Any:
+    if isinstance(v, dict):
+        if "dt" in v:
+            return datetime.fromisoformat(v["dt"])
+        if "d" in v:
+            return date.fromisoformat(v["d"])
+        raise InvalidCursor("Geçersiz cursor")
+    return v
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, size: int) -> List[Any]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != size:
+            raise InvalidCursor("Geçersiz cursor")
+        return [_decode_value(v) for v in values]
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, ValueError, TypeError) as exc:
+        raise InvalidCursor("Geçersiz cursor") from exc
+
+
+def keyset_after(stmt, columns: Sequence[Any], cursor: str):
+    """
+    Cursor'daki anahtardan SONRA gelen satırları filtreler. Tüm sıralama
+    kolonlarının DESC olduğu varsayılır (bu projedeki tüm listeler böyle).
+    """
+    values = decode_cursor(cursor, len(columns))
+    bounds = [literal(v, type_=c.type) for c, v in zip(columns, values)]
+    return stmt.where(tuple_(*columns) < tuple_(*bounds))
+
+
+def make_page(rows: Sequence[Any], limit: int, key: Callable[[Any], Sequence[Any]]) -> Page:
+    """
+    `rows`, `limit + 1` ile çekilmiş olmalıdır; fazladan satır varsa bir
+    sonraki sayfa vardır ve son satırın anahtarı cursor olarak döner.
+    """
+    items = list(rows[:limit])
+    next_cursor = encode_cursor(key(items[-1])) if len(rows) > limit and items else None
+    return Page(items=items, next_cursor=next_cursor)
+
+
+def page_headers(page: Page) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    if page.next_cursor:
+        headers["X-Next-Cursor"] = page.next_cursor
+    if page.total is not None:
+        headers["X-Total-Count"] = str(page.total)
+    return headers
+
+
+# --- TOPLAM (TEK TUR) ---
+TOTAL_LABEL = "total_count"
+
+
+def with_window_total(stmt):
+    """
+    Sayfa sorgusuna `count(*) OVER ()` ekler. Pencere WHERE'den sonra, OFFSET/
+    LIMIT'ten önce hesaplandığı için her satır filtreli toplamı taşır. Keyset
+    koşulu da WHERE'e girdiğinden cursor'lı sayfalarda kullanılmamalıdır.
+    """
+    return stmt.add_columns(func.count().over().label(TOTAL_LABEL))
+
+
+def window_total(rows: Sequence[Any], first_page: bool) -> Optional[int]:
+    """Satırlardan toplamı okur. Boş sayfada toplam ancak ilk sayfaysa bilinir (0)."""
+    if rows:
+        return rows[0]._mapping[TOTAL_LABEL]
+    return 0 if first_page else None
+
+
+# --- TOPLAM STRATEJİSİ ---
+TOTAL_WINDOW = "window"  # filtreli, cursor'suz: count(*) OVER () sayfa sorgusunda
+TOTAL_CACHED = "cached"  # filtresiz: sürüme bağlı önbellekli COUNT
+TOTAL_COUNT = "count"    # filtreli + cursor: ayrı COUNT (pencere keyset'ten etkilenir)
+
+
+def total_mode(filtered: bool, cursor: Optional[str]) -> str:
+    if not filtered:
+        return TOTAL_CACHED
+    return TOTAL_COUNT if cursor else TOTAL_WINDOW
+
+
+def known_total(mode: str, rows: Sequence[Any], table: str, version: int, first_page: bool) -> Optional[int]:
+    """Ek sorgu gerektirmeden bilinen toplam; None ise COUNT çalıştırılmalıdır."""
+    if mode == TOTAL_WINDOW:
+        return window_total(rows, first_page)
+    if mode == TOTAL_CACHED:
+        return cached_count(table, version)
+    return None
+
+
+def remember_total(mode: str, table: str, version: int, count: int) -> int:
+    """COUNT sonucunu döndürür; filtresiz sayımları önbelleğe de yazar."""
+    if mode == TOTAL_CACHED:
+        store_count(table, version, count)
+    return count
+
+
+# --- ÖNBELLEKLİ SAYIM (FİLTRESİZ LİSTELER) ---
+_counts: Dict[str, Tuple[int, float, int]] = {}  # tablo -> (sürüm, bitiş, sayı)
+_counts_lock = threading.Lock()
+
+
+def count_version(table: str) -> int:
+    """
+    Sayım önbelleğinin anahtarı olan tablo sürümü. Önbellekli yanıtların
+    kararıyla aynı kaynaktan gelir (`versions.refresh`): başka bir worker'daki
+    yazma, yanıt önbelleğinden en geç aynı anda sayımı da geçersiz kılar.
+    """
+    return versions.current(table, versions.refresh())
+
+
+async def count_version_async(table: str) -> int:
+    """`count_version`'ın event loop'u bloklamayan hâli."""
+    return versions.current(table, await versions.refresh_async())
+
+
+def cached_count(table: str, version: int) -> Optional[int]:
+    """Sayım `version` ile alındıysa ve TTL dolmadıysa son sayımı döndürür."""
+    with _counts_lock:
+        hit = _counts.get(table)
+    if hit and hit[0] == version and hit[1] > time.monotonic():
+        return hit[2]
+    return None
+
+
+def store_count(table: str, version: int, count: int) -> int:
+    """`version`, sayım sorgusundan ÖNCE okunmuş tablo sürümüdür."""
+    with _counts_lock:
+        _counts[table] = (version, time.monotonic() + COUNT_CACHE_TTL, count)
+    return count
@@ -0,0 +1,169 @@
+# app/query_stats.py
+"""
+İstek başına SQL ölçümü.
+
+Motorun (engine) cursor olaylarına bağlanır ve her istek için sorgu sayısını,
+toplam veritabanı süresini ve en yavaş ifadeyi toplar:
+
+- Yanıta `Server-Timing: db;dur=<ms>;desc="<n> queries"` eklenir; tarayıcı
+  geliştirici araçlarında istek zamanlamasında görünür.
+- SLOW_QUERY_MS'i aşan her ifade loglanır (istek dışında, ör. cron işlerinde de).
+- Bir isteğin toplam DB süresi SLOW_REQUEST_DB_MS'i aşarsa istek, sorgu
+  sayısı ve en yavaş ifadesiyle (kısaltılmış) birlikte loglanır.
+- Aynı ifade şekli (parametreler hariç metin) bir istekte
+  SQL_N_PLUS_ONE_THRESHOLD'dan fazla çalışırsa N+1 uyarısı loglanır. Bu her
+  zaman açıktır: istek sırasında sadece ham ifade metni sayılır (derlenmiş
+  ifade önbelleğinden gelen aynı metin), şekle indirgeme yalnızca sorgu
+  sayısı eşiği aşan isteklerde rapor anında yapılır.
+- İstek başına sorgu sayısı ve DB süresi /metrics'e de yazılır (app/metrics.py).
+
+İstek durumu bir ContextVar'dadır. Senkron `def` endpoint'ler threadpool'da
+çalışsa da bağlam kopyalanarak taşındığı için aynı nesneye yazarlar.
+"""
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .metrics import DB_QUERIES, DB_TIME, route_label
+
+logger = logging.getLogger("uvicorn.error")
+
+# --- ENV ---
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))  # 0: kapalı
+SLOW_REQUEST_DB_MS = float(os.getenv("SLOW_REQUEST_DB_MS", "500"))  # 0: kapalı
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+SERVER_TIMING = os.getenv("SERVER_TIMING", "true").lower() in ("1", "true", "yes")
+
+_LOG_STATEMENT_CHARS = 500
+# `IN (__[POSTCOMPILE_x])` / `IN (%(p_1)s, %(p_2)s, ...)` listeleri uzunluğundan bağımsız tek şekle iner
+_PARAM_LIST = re.compile(r"\((?:\s*(?:%\([^)]+\)s|\?|:\w+|\$\d+)\s*,?)+\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class RequestQueries:
+    count: int = 0
+    total: float = 0.0  # saniye
+    slowest: float = 0.0
+    slowest_statement: Optional[str] = None
+    statements: Counter = field(default_factory=Counter)  # ham metin -> kaç kez
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.slowest:
+            self.slowest = elapsed
+            self.slowest_statement = statement
+        self.statements[statement] += 1
+
+    def shapes(self) -> Counter:
+        """Ham metinleri şekle indirger (IN listesi uzunluğu farklı ifadeler birleşir)."""
+        shapes: Counter = Counter()
+        for statement, n in self.statements.items():
+            shapes[statement_shape(statement)] += n
+        return shapes
+
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+def current_queries() -> Optional[RequestQueries]:
+    return _current.get()
+
+
+def statement_shape(statement: str) -> str:
+    return _PARAM_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def _short(statement: str) -> str:
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    return statement if len(statement) <= _LOG_STATEMENT_CHARS else statement[:_LOG_STATEMENT_CHARS] + "..."
+
+
+# --- ENGINE OLAYLARI ---
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    if SLOW_QUERY_MS and elapsed * 1000 >= SLOW_QUERY_MS:
+        logger.warning("Yavaş sorgu (%.1f ms): %s", elapsed * 1000, _short(statement))
+
+
+def _handle_error(exception_context):
+    # Hata veren ifadenin başlangıç zamanı yığında kalmasın
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Senkron engine'e (async için `async_engine.sync_engine`) olayları bağlar."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+# --- MIDDLEWARE ---
+class QueryStatsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestQueries()
+        token = _current.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and SERVER_TIMING:
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", f'db;dur={stats.total * 1000:.1f};desc="{stats.count} queries"')
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            self._report(scope, stats)
+
+    @staticmethod
+    def _report(scope: Scope, stats: RequestQueries) -> None:
+        route = route_label(scope)
+        DB_QUERIES.observe(stats.count, scope["method"], route)
+        DB_TIME.observe(stats.total, scope["method"], route)
+        if SLOW_REQUEST_DB_MS and stats.total * 1000 >= SLOW_REQUEST_DB_MS:
+            logger.warning(
+                "Yavaş istek: %s %s, %d sorgu, DB %.1f ms; en yavaş (%.1f ms): %s",
+                scope["method"], route, stats.count, stats.total * 1000, stats.slowest * 1000,
+                _short(stats.slowest_statement or ""),
+            )
+        if stats.count <= SQL_N_PLUS_ONE_THRESHOLD:
+            return
+        for shape, n in stats.shapes().most_common():
+            if n <= SQL_N_PLUS_ONE_THRESHOLD:
+                break
+            logger.warning(
+                "Olası N+1: %s %s isteğinde aynı sorgu %d kez çalıştı: %s",
+                scope["method"], route, n, _short(shape),
+            )
@@ -9,24 +9,51 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Body, Request, Response
 from sqlalchemy.orm import Session
 
+from ..cache import response_cache
 from ..database import get_db
 from ..models import Admin as AdminModel
 from ..schemas.admin_login import AdminLogin
 from ..security import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
+    AdminPrincipal,
     create_access_token,
+    hash_password,
+    invalidate_admin,
     require_admin,
+    revoke_token,
+    token_from_request,
     verify_password,
 )
 
 # Trafik Polisi (Rate Limiter)
-from ..limiter import limiter
+from ..limiter import LOGIN_LIMIT, limiter, rate_limit_stats
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+MIN_PASSWORD_LENGTH = 8
+
+
+def _set_session_cookie(response: Response, admin_user: AdminModel) -> None:
+    # Token, adminin o anki token sürümünü taşır (bkz. app/security.py)
+    token = create_access_token(
+        data={"sub": admin_user.email, "ver": admin_user.token_version},
+        expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+    )
+    # Bu cookie'ye JavaScript erişemez, XSS saldırılarına karşı korur.
+    response.set_cookie(
+        key="admin_token",           # Cookie adı
+        value=token,                 # Token değeri
+        httponly=True,               # JS erişimini kapat (Güvenlik)
+        max_age=ACCESS_TOKEN_EXPIRE_MINUTES * 60, # Saniye cinsinden ömür
+        expires=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        samesite="lax",              # CSRF koruması için
+        secure=False,                # Localhost'ta (HTTP) çalışması için False. Canlıda (HTTPS) True yapılmalı!
+    )
+
+
 # --- LOGIN FONKSİYONU (HTTPONLY COOKIE GÜNCELLEMESİ) ---
 @router.post("/login")
-@limiter.limit("5/minute")
+@limiter.limit(LOGIN_LIMIT)
 def login_admin(response: Response, request: Request, credentials: AdminLogin, db: Session = Depends(get_db)):
     """
     Admin girişi yapar.
@@ -56,23 +83,8 @@ def login_admin(response: Response, request: Request, credentials: AdminLogin, d
                 detail="Geçersiz doğrulama kodu",
             )
 
-    # 3. Token Oluştur
-    token = create_access_token(
-        data={"sub": admin_user.email},
-        expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
-    )
-    
-    # 4. TOKEN'I COOKIE OLARAK GÖM (EN ÖNEMLİ KISIM)
-    # Bu cookie'ye JavaScript erişemez, XSS saldırılarına karşı korur.
-    response.set_cookie(
-        key="admin_token",           # Cookie adı
-        value=token,                 # Token değeri
-        httponly=True,               # JS erişimini kapat (Güvenlik)
-        max_age=ACCESS_TOKEN_EXPIRE_MINUTES * 60, # Saniye cinsinden ömür
-        expires=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-        samesite="lax",              # CSRF koruması için
-        secure=False,                # Localhost'ta (HTTP) çalışması için False. Canlıda (HTTPS) True yapılmalı!
-    )
+    # 3. Token Oluştur ve Cookie Olarak Göm (EN ÖNEMLİ KISIM)
+    _set_session_cookie(response, admin_user)
     
     # Frontend'e sadece bilgi dönüyoruz, token yok!
     return {
@@ -85,32 +97,48 @@ def login_admin(response: Response, request: Request, credentials: AdminLogin, d
     }
 
 @router.get("/me")
-def get_me(current_admin: AdminModel = Depends(require_admin)):
+def get_me(current_admin: AdminPrincipal = Depends(require_admin)):
     return {
         "id": current_admin.id, 
         "email": current_admin.email,
-        "is_2fa_enabled": bool(current_admin.totp_secret)
+        "is_2fa_enabled": current_admin.is_2fa_enabled
     }
 
 # --- LOGOUT (COOKIE SİLME) ---
 @router.post("/logout")
-def logout(response: Response, current_admin: AdminModel = Depends(require_admin)):
-    # Çıkış yaparken cookie'yi siliyoruz
+def logout(
+    request: Request,
+    response: Response,
+    current_admin: AdminPrincipal = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    # Token tüm worker'lar için iptal edilir (önbellekten de düşer), sonra cookie silinir
+    revoke_token(token_from_request(request), db)
     response.delete_cookie(key="admin_token")
     return {"message": "Başarıyla çıkış yapıldı"}
 
 @router.get("/dashboard")
-def dashboard(current_admin: AdminModel = Depends(require_admin)):
+def dashboard(current_admin: AdminPrincipal = Depends(require_admin)):
     return {
         "message": f"Hoşgeldiniz {current_admin.email}",
         "dashboard_data": {"total_users": 150, "total_events": 25, "total_posts": 78}
     }
 
+# --- YANIT ÖNBELLEĞİ İSTATİSTİKLERİ ---
+@router.get("/cache/stats")
+def cache_stats(current_admin: AdminPrincipal = Depends(require_admin)):
+    return response_cache.stats()
+
+# --- HIZ SINIRI (429) İSTATİSTİKLERİ ---
+@router.get("/rate-limit/stats")
+def rate_limit_stats_view(current_admin: AdminPrincipal = Depends(require_admin)):
+    return {"rejections": rate_limit_stats()}
+
 # --- 2FA KURULUM FONKSİYONLARI ---
 
 @router.post("/2fa/setup")
-def setup_2fa(current_admin: AdminModel = Depends(require_admin)):
-    if current_admin.totp_secret:
+def setup_2fa(current_admin: AdminPrincipal = Depends(require_admin)):
+    if current_admin.is_2fa_enabled:
         raise HTTPException(status_code=400, detail="2FA zaten aktif")
 
     secret = pyotp.random_base32()
@@ -132,25 +160,62 @@ def setup_2fa(current_admin: AdminModel = Depends(require_admin)):
 
 @router.post("/2fa/enable")
 def enable_2fa(
+    response: Response,
     secret: str = Body(..., embed=True),
     code: str = Body(..., embed=True),
-    current_admin: AdminModel = Depends(require_admin),
+    current_admin: AdminPrincipal = Depends(require_admin),
     db: Session = Depends(get_db)
 ):
     totp = pyotp.TOTP(secret)
     if not totp.verify(code):
         raise HTTPException(status_code=400, detail="Kod hatalı, lütfen tekrar deneyin.")
 
-    current_admin.totp_secret = secret
-    db.commit()
-    
+    # require_admin önbellekten kimlik döndürür; değişiklik ORM kaydı üzerinde yapılır
+    admin = db.get(AdminModel, current_admin.id)
+    if admin is None:
+        raise HTTPException(status_code=404, detail="Admin bulunamadı")
+    admin.totp_secret = secret
+    # Eski oturumlar kapanır; bu oturum yeni token ile sürer
+    invalidate_admin(db, admin)
+    _set_session_cookie(response, admin)
+
     return {"message": "2FA başarıyla aktifleştirildi."}
 
 @router.post("/2fa/disable")
 def disable_2fa(
-    current_admin: AdminModel = Depends(require_admin), 
+    response: Response,
+    current_admin: AdminPrincipal = Depends(require_admin), 
     db: Session = Depends(get_db)
 ):
-    current_admin.totp_secret = None
-    db.commit()
-    return {"message": "2FA devre dışı bırakıldı."}
\ No newline at end of file
+    admin = db.get(AdminModel, current_admin.id)
+    if admin is None:
+        raise HTTPException(status_code=404, detail="Admin bulunamadı")
+    admin.totp_secret = None
+    invalidate_admin(db, admin)
+    _set_session_cookie(response, admin)
+    return {"message": "2FA devre dışı bırakıldı."}
+
+# --- ŞİFRE DEĞİŞTİRME ---
+@router.post("/password")
+@limiter.limit(LOGIN_LIMIT)
+def change_password(
+    request: Request,
+    response: Response,
+    current_password: str = Body(..., embed=True),
+    new_password: str = Body(..., embed=True),
+    current_admin: AdminPrincipal = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    admin = db.get(AdminModel, current_admin.id)
+    if admin is None:
+        raise HTTPException(status_code=404, detail="Admin bulunamadı")
+    if not verify_password(current_password, admin.password):
+        raise HTTPException(status_code=400, detail="Mevcut şifre hatalı")
+    if len(new_password) < MIN_PASSWORD_LENGTH:
+        raise HTTPException(status_code=400, detail=f"Yeni şifre en az {MIN_PASSWORD_LENGTH} karakter olmalı")
+
+    admin.password = hash_password(new_password)
+    # Diğer tüm oturumlar kapanır; bu oturum yeni token ile sürer
+    invalidate_admin(db, admin)
+    _set_session_cookie(response, admin)
+    return {"message": "Şifre değiştirildi, diğer oturumlar kapatıldı."}
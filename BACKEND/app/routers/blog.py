@@ -1,42 +1,69 @@
-import os
-import shutil
-import uuid
-from typing import List, Optional, Dict, Any
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, File, UploadFile, Form, status
+from fastapi import APIRouter, Depends, HTTPException, Query, File, UploadFile, Form, Request, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.schemas.blog import BlogOut, BlogCreate, BlogUpdate
-from app.crud.blog import list_blogs, get_blog, create_blog, update_blog, delete_blog
+from app.database import get_db, get_read_db, run_read
+from app.cache import cached_json_response
+from app.uploads import limit_for
+from app.images import manual_variants, store_image
+from app.schemas.blog import BlogOut, BlogListOut, BlogListFullOut, BlogCreate, BlogUpdate
+from app.crud.blog import (
+    list_blogs, list_blogs_async, get_blog, get_blog_async, create_blog, update_blog, delete_blog,
+)
 
 # !!! GÜVENLİK İÇİN GEREKLİ IMPORT !!!
 from app.security import get_current_admin
 
 router = APIRouter(prefix="/blogs", tags=["blogs"])
 
-# Resimlerin kaydedileceği klasör
-UPLOAD_DIR = "public/uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+# Yüklenen dosya başına boyut limiti (bkz. app/uploads.py)
+MAX_UPLOAD_BYTES = limit_for(router.prefix)
 
 # --- GET İŞLEMLERİ (HERKESE AÇIK) ---
-@router.get("", response_model=Dict[str, Any])
-def api_list_blogs(
-    q: Optional[str] = Query(None),
+@router.get("", response_model=BlogListOut | BlogListFullOut)
+async def api_list_blogs(
+    request: Request,
+    q: Optional[str] = Query(None, description="Tam metin arama (\"tırnaklı ifade\", -hariç, or desteklenir)"),
+    highlight: bool = Query(False, description="Aramada eşleşen içerik parçalarını <mark> ile döndür"),
     category: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     page_size: int = Query(12, ge=1, le=100),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Önceki yanıttaki next_cursor (verilirse page yok sayılır)"),
+    include_content: bool = Query(False, description="Kart yerine tam kayıt (content dahil) döndür"),
+    db: Session | AsyncSession = Depends(get_read_db),
 ):
-    items, total = list_blogs(db, q=q, category=category, page=page, page_size=page_size)
-    return {"items": [BlogOut.model_validate(i) for i in items], "total": total, "page": page, "page_size": page_size}
+    # Satırlar doğrudan şemaya göre tek seferde serileştirilir (ara BlogOut nesnesi yok)
+    schema = BlogListFullOut if include_content else BlogListOut
+
+    def envelope(result):
+        return {
+            "items": result.items,
+            "total": result.total,
+            "page": page,
+            "page_size": page_size,
+            "next_cursor": result.next_cursor,
+        }
+
+    return await cached_json_response(
+        request, ["blogs"], schema,
+        lambda: run_read(
+            db, list_blogs, list_blogs_async,
+            q=q, category=category, page=page, page_size=page_size, cursor=cursor,
+            highlight=highlight, include_content=include_content,
+        ),
+        envelope=envelope,
+    )
 
 @router.get("/{blog_id}", response_model=BlogOut)
-def api_get_blog(blog_id: int, db: Session = Depends(get_db)):
-    obj = get_blog(db, blog_id)
-    if not obj:
-        raise HTTPException(status_code=404, detail="Blog bulunamadı")
-    return BlogOut.model_validate(obj)
+async def api_get_blog(blog_id: int, request: Request, db: Session | AsyncSession = Depends(get_read_db)):
+    async def load():
+        obj = await run_read(db, get_blog, get_blog_async, blog_id)
+        if not obj:
+            raise HTTPException(status_code=404, detail="Blog bulunamadı")
+        return obj
+    return await cached_json_response(request, ["blogs"], BlogOut, load)
 
 # --- CREATE İŞLEMİ (SADECE ADMİN) ---
 @router.post("", response_model=BlogOut, status_code=201)
@@ -55,17 +82,11 @@ def api_create_blog(
     current_admin: dict = Depends(get_current_admin)
 ):
     final_cover_image = cover_image
+    cover_image_variants = manual_variants(cover_image)
 
-    # Dosya yüklendiyse kaydet
+    # Dosya yüklendiyse kaydet (WebP/AVIF türevleri de üretilir, bkz. app/images.py)
     if file:
-        file_ext = file.filename.split(".")[-1] if "." in file.filename else "jpg"
-        unique_filename = f"{uuid.uuid4()}.{file_ext}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        final_cover_image = f"/public/uploads/{unique_filename}"
+        final_cover_image, cover_image_variants = store_image(file, MAX_UPLOAD_BYTES)
 
     # Boş string gelirse None yap (DB hatasını önler)
     if not published_date:
@@ -79,7 +100,8 @@ def api_create_blog(
         category=category,
         date=published_date,
         is_published=is_published,
-        cover_image=final_cover_image
+        cover_image=final_cover_image,
+        cover_image_variants=cover_image_variants,
     )
 
     obj = create_blog(db, payload)
@@ -108,23 +130,17 @@ def api_update_blog(
         raise HTTPException(status_code=404, detail="Blog bulunamadı")
 
     final_cover_image = cover_image
+    cover_image_variants = manual_variants(cover_image)
 
     # Yeni dosya varsa kaydet
     if file:
-        file_ext = file.filename.split(".")[-1] if "." in file.filename else "jpg"
-        unique_filename = f"{uuid.uuid4()}.{file_ext}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        final_cover_image = f"/public/uploads/{unique_filename}"
+        final_cover_image, cover_image_variants = store_image(file, MAX_UPLOAD_BYTES)
 
     # Boş string gelirse None yap
     if published_date == "":
         published_date = None
 
-    payload = BlogUpdate(
+    update_data = dict(
         title=title,
         content=content,
         preview_text=preview_text,
@@ -134,6 +150,10 @@ def api_update_blog(
         is_published=is_published,
         cover_image=final_cover_image
     )
+    # Türevler sadece görsel değiştiyse yazılır; None gönderilirse mevcutlar silinirdi
+    if cover_image_variants is not None:
+        update_data["cover_image_variants"] = cover_image_variants
+    payload = BlogUpdate(**update_data)
 
     obj = update_blog(db, blog_id, payload)
     if not obj:
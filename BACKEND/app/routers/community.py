@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.limiter import COMMUNITY_APPLY_LIMIT, limiter
+from app.pagination import page_headers
 from app import models
+from app.security import get_current_admin
 from app.schemas.community import (
     CommunityApplicationCreate,
     CommunityApplicationResponse,
@@ -11,6 +14,7 @@ from app.schemas.community import (
 from app.crud.community import (
     create_application,
     list_applications,
+    search_applications,
     get_application,
     update_status,
     delete_application,
@@ -25,7 +29,8 @@ router = APIRouter(prefix="/community", tags=["Community"])
     response_model=CommunityApplicationResponse,
     status_code=status.HTTP_201_CREATED,
 )
-def apply(payload: CommunityApplicationCreate, db: Session = Depends(get_db)):
+@limiter.limit(COMMUNITY_APPLY_LIMIT)
+def apply(request: Request, payload: CommunityApplicationCreate, db: Session = Depends(get_db)):
     try:
         obj = create_application(db, payload)
         return obj
@@ -40,13 +45,33 @@ def apply(payload: CommunityApplicationCreate, db: Session = Depends(get_db)):
     response_model=list[CommunityApplicationResponse],
 )
 def admin_list_applications(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = Query(100, le=500),
     status: str | None = Query(None, description="pending/reviewed/accepted/rejected"),
     q: str | None = Query(None, description="Ad, soyad veya e-posta araması"),
+    cursor: str | None = Query(None, description="Önceki yanıtın X-Next-Cursor başlığı"),
 ):
-    return list_applications(db, skip=skip, limit=limit, status=status, q=q)
+    page = list_applications(db, skip=skip, limit=limit, status=status, q=q, cursor=cursor)
+    response.headers.update(page_headers(page))
+    return page.items
+
+
+# ---- Admin: Hızlı arama (benzerlik sıralı) ----
+# Not: /applications/{app_id} rotasından ÖNCE tanımlı olmalı
+@router.get(
+    "/applications/search",
+    response_model=list[CommunityApplicationResponse],
+)
+def admin_search_applications(
+    q: str = Query(..., min_length=2, max_length=100, description="Ad, soyad veya e-posta (yazım hatası toleranslı)"),
+    limit: int = Query(20, ge=1, le=50),
+    status: str | None = Query(None, description="pending/reviewed/accepted/rejected"),
+    db: Session = Depends(get_db),
+    current_admin: dict = Depends(get_current_admin),
+):
+    return search_applications(db, q=q, limit=limit, status=status)
 
 
 # ---- Admin: Detay ----
@@ -1,14 +1,15 @@
-import os
-import shutil
-import uuid
 from typing import List, Dict, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form
+from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form, Request
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db, run_read
+from app.cache import cached_json_response
+from app.uploads import limit_for
+from app.images import manual_variants, store_image
 from app.crud import crew as crud
-from app.schemas.crew import CrewMemberCreate, CrewMemberRead, CrewMemberUpdate
+from app.schemas.crew import CrewMemberCreate, CrewMemberRead, CrewMemberUpdate, CrewReorder
 from app.models import CrewMember 
 
 # !!! GÜVENLİK İÇİN GEREKLİ IMPORT !!!
@@ -19,17 +20,19 @@ router = APIRouter(
     tags=["Crew Members"]
 )
 
-# Resimlerin kaydedileceği klasör
-UPLOAD_DIR = "public/uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+# Yüklenen dosya başına boyut limiti (bkz. app/uploads.py)
+MAX_UPLOAD_BYTES = limit_for(router.prefix)
 
 # --- GET İŞLEMİ (HERKESE AÇIK) ---
 @router.get("/", response_model=Dict[str, List[CrewMemberRead]], summary="Tüm ekip üyelerini kategorilere göre gruplanmış getirir.")
-def read_all_crew_members(db: Session = Depends(get_db)):
+async def read_all_crew_members(request: Request, db: Session | AsyncSession = Depends(get_read_db)):
     """
     Tüm ekip üyelerini `{ "Başkan ve Yardımcılar": [...], "Sosyal Medya": [...] }` formatında döndürür.
     """
-    return crud.get_all_crew_members_grouped(db=db)
+    return await cached_json_response(
+        request, ["crew_members"], Dict[str, List[CrewMemberRead]],
+        lambda: run_read(db, crud.get_all_crew_members_grouped, crud.get_all_crew_members_grouped_async),
+    )
 
 # --- CREATE İŞLEMİ (KİLİTLİ - SADECE ADMIN) ---
 @router.post("/", response_model=CrewMemberRead, status_code=status.HTTP_201_CREATED, summary="Yeni bir ekip üyesi oluşturur (Admin).")
@@ -47,17 +50,11 @@ def create_crew_member(
     current_admin: dict = Depends(get_current_admin)
 ):
     final_photo_url = photo_url
+    photo_variants = manual_variants(photo_url)
 
-    # Dosya yüklendiyse kaydet
+    # Dosya yüklendiyse kaydet (WebP/AVIF türevleri de üretilir, bkz. app/images.py)
     if file:
-        file_ext = file.filename.split(".")[-1] if "." in file.filename else "jpg"
-        unique_filename = f"{uuid.uuid4()}.{file_ext}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        final_photo_url = f"/public/uploads/{unique_filename}"
+        final_photo_url, photo_variants = store_image(file, MAX_UPLOAD_BYTES)
 
     # Pydantic modelini oluştur
     member = CrewMemberCreate(
@@ -67,11 +64,24 @@ def create_crew_member(
         description=description,
         linkedin_url=linkedin_url,
         github_url=github_url,
-        photo_url=final_photo_url
+        photo_url=final_photo_url,
+        photo_variants=photo_variants,
     )
     
     return crud.create_crew_member(db=db, member=member)
 
+# --- REORDER (KİLİTLİ - SADECE ADMIN) ---
+# Kategorinin yeni sırası tek istekte, tek UPDATE ve tek commit ile yazılır.
+# Yanıt sadece güncellenen (o kategoride var olan) üyeleri içerir.
+@router.post("/reorder", response_model=List[CrewMemberRead], summary="Bir kategorideki ekip üyelerini toplu sıralar (Admin).")
+def reorder_crew_members(
+    payload: CrewReorder,
+    db: Session = Depends(get_db),
+    # !!! KİLİT BURADA !!!
+    current_admin: dict = Depends(get_current_admin)
+):
+    return crud.reorder_category(db, payload.category, payload.ids)
+
 # --- UPDATE İŞLEMİ (KİLİTLİ - SADECE ADMIN) ---
 @router.put("/{member_id}", response_model=CrewMemberRead, summary="Bir ekip üyesini günceller (Admin).")
 def update_crew_member(
@@ -95,17 +105,11 @@ def update_crew_member(
         raise HTTPException(status_code=404, detail="Ekip üyesi bulunamadı")
 
     final_photo_url = photo_url
+    photo_variants = manual_variants(photo_url)
 
     # Yeni dosya varsa kaydet
     if file:
-        file_ext = file.filename.split(".")[-1] if "." in file.filename else "jpg"
-        unique_filename = f"{uuid.uuid4()}.{file_ext}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        final_photo_url = f"/public/uploads/{unique_filename}"
+        final_photo_url, photo_variants = store_image(file, MAX_UPLOAD_BYTES)
 
     # Güncelleme verilerini hazırla (Sadece dolu olanları al)
     update_data = {}
@@ -116,6 +120,7 @@ def update_crew_member(
     if linkedin_url is not None: update_data["linkedin_url"] = linkedin_url
     if github_url is not None: update_data["github_url"] = github_url
     if final_photo_url is not None: update_data["photo_url"] = final_photo_url
+    if photo_variants is not None: update_data["photo_variants"] = photo_variants
     if order_index is not None: update_data["order_index"] = order_index
 
     member_update = CrewMemberUpdate(**update_data)
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.database import get_db
+from app.limiter import EVENT_SUGGESTION_LIMIT, limiter
+from app.pagination import page_headers
 from app.schemas import event_suggestions as schemas
 from app.crud import event_suggestions as crud
 
@@ -11,7 +13,8 @@ router = APIRouter(prefix="/event-suggestions", tags=["Event Suggestions"])
 
 # Kullanıcı: öneri gönder
 @router.post("", response_model=schemas.EventSuggestionOut, status_code=status.HTTP_201_CREATED)
-def create_suggestion(payload: schemas.EventSuggestionCreate, db: Session = Depends(get_db)):
+@limiter.limit(EVENT_SUGGESTION_LIMIT)
+def create_suggestion(request: Request, payload: schemas.EventSuggestionCreate, db: Session = Depends(get_db)):
     # payload sadece: title, description, contact
     return crud.create_suggestion(db, payload)
 
@@ -19,12 +22,15 @@ def create_suggestion(payload: schemas.EventSuggestionCreate, db: Session = Depe
 # Admin: listele (basit pagination)
 @router.get("", response_model=List[schemas.EventSuggestionOut])
 def list_suggestions(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Önceki yanıtın X-Next-Cursor başlığı"),
     db: Session = Depends(get_db),
 ):
-    items, _total = crud.list_suggestions(db, skip, limit)
-    return items
+    page = crud.list_suggestions(db, skip, limit, cursor)
+    response.headers.update(page_headers(page))
+    return page.items
 
 
 # Admin: tek kayıt
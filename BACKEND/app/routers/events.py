@@ -1,15 +1,19 @@
 import os
-import shutil
 import uuid
 import re
 from typing import List, Optional
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form
+from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form, Request, Query, Response
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.schemas.events import Event, EventCreate, EventUpdate
+from app.database import get_db, get_read_db, run_read
+from app.limiter import EVENT_REGISTRATION_LIMIT, limiter
+from app.cache import cached_json_response
+from app.uploads import limit_for
+from app.images import manual_variants, store_image
+from app.schemas.events import Event, EventCreate, EventUpdate, EventRegistration, EventRegistrationOut, EventSeatsOut
 from app.crud import events as crud_events
 
 # !!! GÜVENLİK İÇİN GEREKLİ IMPORT !!!
@@ -17,9 +21,11 @@ from app.security import get_current_admin
 
 router = APIRouter(prefix="/events", tags=["events"])
 
-# Resimlerin kaydedileceği klasör
-UPLOAD_DIR = "public/uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+# Yüklenen dosya başına boyut limiti (bkz. app/uploads.py)
+MAX_UPLOAD_BYTES = limit_for(router.prefix)
+
+# --- ENV ---
+UPCOMING_MAX_AGE = int(os.getenv("EVENTS_UPCOMING_MAX_AGE", "60"))  # saniye
 
 # --- YARDIMCI FONKSİYON: SLUGIFY ---
 def slugify(text: str) -> str:
@@ -33,32 +39,102 @@ def slugify(text: str) -> str:
 
 # --- GET (HERKESE AÇIK) ---
 @router.get("", response_model=List[Event])
-def get_events(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud_events.get_events(db, skip, limit)
+async def get_events(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Önceki yanıtın X-Next-Cursor başlığı"),
+    db: Session | AsyncSession = Depends(get_read_db),
+):
+    return await cached_json_response(
+        request, ["events"], List[Event],
+        lambda: run_read(db, crud_events.get_events, crud_events.get_events_async, skip, limit, cursor),
+    )
 
+# Kayıt en yakın etkinliğin başlama anında (ya da etkinlik yazılınca) düşer.
+# Tarayıcı/CDN en fazla UPCOMING_MAX_AGE saniye tutar. Kayıt sayıları sürüm
+# artırmaz; en fazla RESPONSE_CACHE_TTL kadar gecikir (canlısı: /{id}/seats).
 @router.get("/upcoming", response_model=List[Event])
-def get_upcoming_events(limit: int = 1000, db: Session = Depends(get_db)):
-    return crud_events.get_upcoming_events(db, limit)
+async def get_upcoming_events(
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session | AsyncSession = Depends(get_read_db),
+):
+    return await cached_json_response(
+        request, ["events"], List[Event],
+        lambda: run_read(db, crud_events.get_upcoming_events, crud_events.get_upcoming_events_async, limit),
+        expires=crud_events.seconds_until_upcoming_changes,
+        max_age=UPCOMING_MAX_AGE,
+    )
 
 @router.get("/slug/{slug}", response_model=Event)
-def get_event_by_slug(slug: str, db: Session = Depends(get_db)):
-    event = crud_events.get_event_by_slug(db, slug)
-    if event is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Event not found"
-        )
-    return event
+async def get_event_by_slug(slug: str, request: Request, db: Session | AsyncSession = Depends(get_read_db)):
+    async def load():
+        event = await run_read(db, crud_events.get_event_by_slug, crud_events.get_event_by_slug_async, slug)
+        if event is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found"
+            )
+        return event
+    return await cached_json_response(request, ["events"], Event, load)
 
 @router.get("/{event_id}", response_model=Event)
-def get_event(event_id: int, db: Session = Depends(get_db)):
-    event = crud_events.get_event(db, event_id)
-    if event is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Event not found"
+async def get_event(event_id: int, request: Request, db: Session | AsyncSession = Depends(get_read_db)):
+    async def load():
+        event = await run_read(db, crud_events.get_event, crud_events.get_event_async, event_id)
+        if event is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found"
+            )
+        return event
+    return await cached_json_response(request, ["events"], Event, load)
+
+# Canlı kontenjan: kayıtlar "events" sürümünü artırmadığı için (bkz.
+# crud/events.py claim_seat) önbellekli yanıtlardaki `registered` gecikebilir.
+# Tek birincil anahtar okumasıdır; önbelleğe alınmaz.
+@router.get("/{event_id}/seats", response_model=EventSeatsOut)
+async def get_event_seats(event_id: int, response: Response, db: Session | AsyncSession = Depends(get_read_db)):
+    current = await run_read(db, crud_events.get_capacity, crud_events.get_capacity_async, event_id)
+    if current is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
+    response.headers["Cache-Control"] = "no-store"
+    registered, capacity = current
+    return EventSeatsOut(registered=registered, capacity=capacity)
+
+# --- KAYIT (HERKESE AÇIK) ---
+# Kontenjan doluysa hemen 409 döner (bekleme/yeniden deneme yok). İstenirse
+# e-posta ile bekleme listesine girilir.
+@router.post("/{event_id}/register", response_model=EventRegistrationOut)
+@limiter.limit(EVENT_REGISTRATION_LIMIT)
+def register_for_event(
+    event_id: int,
+    request: Request,
+    payload: Optional[EventRegistration] = None,
+    db: Session = Depends(get_db),
+):
+    seat = crud_events.claim_seat(db, event_id)
+    if seat is not None:
+        registered, capacity, whatsapp_link = seat
+        return EventRegistrationOut(
+            status="registered", registered=registered, capacity=capacity, whatsapp_link=whatsapp_link,
+        )
+
+    current = crud_events.get_capacity(db, event_id)
+    if current is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
+    registered, capacity = current
+
+    if payload is not None and payload.join_waitlist:
+        if not payload.email:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Bekleme listesi için e-posta gerekli.")
+        position = crud_events.join_waitlist(db, event_id, payload.email, payload.name)
+        return EventRegistrationOut(
+            status="waitlisted", registered=registered, capacity=capacity, waitlist_position=position,
         )
-    return event
+
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Kontenjan dolu.")
 
 # --- CREATE (KİLİTLİ - SADECE ADMIN) ---
 @router.post("", response_model=Event, status_code=status.HTTP_201_CREATED)
@@ -76,20 +152,14 @@ def create_event(
     db: Session = Depends(get_db),
     current_admin: dict = Depends(get_current_admin)
 ):
-    try:
-        final_image_url = image_url
-
-        # Dosya yüklendiyse kaydet
-        if file:
-            file_ext = file.filename.split(".")[-1] if "." in file.filename else "jpg"
-            unique_filename = f"{uuid.uuid4()}.{file_ext}"
-            file_path = os.path.join(UPLOAD_DIR, unique_filename)
+    final_image_url = image_url
+    image_variants = manual_variants(image_url)
 
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-            
-            final_image_url = f"/public/uploads/{unique_filename}"
+    # Dosya yüklendiyse kaydet (413/415 hataları aşağıdaki 500'e dönüşmesin diye try dışında)
+    if file:
+        final_image_url, image_variants = store_image(file, MAX_UPLOAD_BYTES)
 
+    try:
         # 1. Tarih ve Saati birleştir (ISO Formatı)
         # Örnek: "2025-12-24" + "08:30" -> "2025-12-24T08:30:00"
         start_at_iso = f"{date}T{time}:00"
@@ -113,6 +183,7 @@ def create_event(
             category=category,
             tags=final_tags,
             cover_image_url=final_image_url,
+            cover_image_variants=image_variants,
             slug=unique_slug,
             whatsapp_link="" # Formda yoksa boş string
         )
@@ -145,16 +216,10 @@ def update_event(
         raise HTTPException(status_code=404, detail="Event not found")
 
     final_image_url = image_url
+    image_variants = manual_variants(image_url)
 
     if file:
-        file_ext = file.filename.split(".")[-1] if "." in file.filename else "jpg"
-        unique_filename = f"{uuid.uuid4()}.{file_ext}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        final_image_url = f"/public/uploads/{unique_filename}"
+        final_image_url, image_variants = store_image(file, MAX_UPLOAD_BYTES)
 
     # Güncelleme verilerini hazırla
     update_data = {}
@@ -175,6 +240,7 @@ def update_event(
     if category is not None: update_data["category"] = category
     if tags is not None: update_data["tags"] = tags
     if final_image_url is not None: update_data["cover_image_url"] = final_image_url
+    if image_variants is not None: update_data["cover_image_variants"] = image_variants
 
     # Slug güncellemek istenirse:
     if title is not None:
@@ -1,12 +1,13 @@
-import os
-import shutil
-import uuid
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form, Request
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db, run_read
+from app.cache import cached_json_response
+from app.uploads import limit_for
+from app.images import manual_variants, store_image, store_image_async
 from app.crud import gallery_events as crud
 from app.schemas.gallery_events import (
     GalleryEventOut,
@@ -20,21 +21,25 @@ from app.security import get_current_admin
 # Prefix senin kodunda /api/gallery-events idi, aynen koruyoruz.
 router = APIRouter(prefix="/api/gallery-events", tags=["gallery-events"])
 
-# Resimlerin kaydedileceği klasör
-UPLOAD_DIR = "public/uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+# Yüklenen dosya başına boyut limiti (bkz. app/uploads.py)
+MAX_UPLOAD_BYTES = limit_for(router.prefix)
 
 # --- GET İŞLEMLERİ (HERKESE AÇIK) ---
 @router.get("", response_model=List[GalleryEventOut])
-def list_events(db: Session = Depends(get_db)):
-    return crud.list_gallery_events(db)
+async def list_events(request: Request, db: Session | AsyncSession = Depends(get_read_db)):
+    return await cached_json_response(
+        request, ["gallery_events"], List[GalleryEventOut],
+        lambda: run_read(db, crud.list_gallery_events, crud.list_gallery_events_async),
+    )
 
 @router.get("/{event_id}", response_model=GalleryEventOut)
-def retrieve_event(event_id: int, db: Session = Depends(get_db)):
-    obj = crud.get_gallery_event(db, event_id)
-    if not obj:
-        raise HTTPException(status_code=404, detail="Event not found")
-    return obj
+async def retrieve_event(event_id: int, request: Request, db: Session | AsyncSession = Depends(get_read_db)):
+    async def load():
+        obj = await run_read(db, crud.get_gallery_event, crud.get_gallery_event_async, event_id)
+        if not obj:
+            raise HTTPException(status_code=404, detail="Event not found")
+        return obj
+    return await cached_json_response(request, ["gallery_events"], GalleryEventOut, load)
 
 # --- CREATE İŞLEMİ (KİLİTLİ - SADECE ADMIN) ---
 @router.post("", response_model=GalleryEventOut, status_code=status.HTTP_201_CREATED)
@@ -51,17 +56,11 @@ def create_event(
     current_admin: dict = Depends(get_current_admin)
 ):
     final_image_url = image_url
+    image_variants = manual_variants(image_url)
 
-    # Dosya yüklendiyse kaydet
+    # Dosya yüklendiyse kaydet (WebP/AVIF türevleri de üretilir, bkz. app/images.py)
     if file:
-        file_ext = file.filename.split(".")[-1] if "." in file.filename else "jpg"
-        unique_filename = f"{uuid.uuid4()}.{file_ext}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        final_image_url = f"/public/uploads/{unique_filename}"
+        final_image_url, image_variants = store_image(file, MAX_UPLOAD_BYTES)
 
     # Pydantic modelini oluştur
     payload = GalleryEventCreate(
@@ -70,7 +69,8 @@ def create_event(
         category=category,
         date=date,
         location=location,
-        image_url=final_image_url
+        image_url=final_image_url,
+        image_variants=image_variants,
     )
     return crud.create_gallery_event(db, payload)
 
@@ -96,17 +96,11 @@ async def update_event(
         raise HTTPException(status_code=404, detail="Event not found")
 
     final_image_url = image_url
+    image_variants = manual_variants(image_url)
 
     # Yeni dosya varsa kaydet
     if file:
-        file_ext = file.filename.split(".")[-1] if "." in file.filename else "jpg"
-        unique_filename = f"{uuid.uuid4()}.{file_ext}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        final_image_url = f"/public/uploads/{unique_filename}"
+        final_image_url, image_variants = await store_image_async(file, MAX_UPLOAD_BYTES)
 
     ct = (request.headers.get("content-type") or "").lower()
 
@@ -118,7 +112,7 @@ async def update_event(
         return updated_obj
 
     # Form Data desteği
-    payload = GalleryEventUpdate(
+    update_data = dict(
         title=title,
         description=description,
         category=category,
@@ -126,6 +120,10 @@ async def update_event(
         location=location,
         image_url=final_image_url
     )
+    # Türevler sadece görsel değiştiyse yazılır; None gönderilirse mevcutlar silinirdi
+    if image_variants is not None:
+        update_data["image_variants"] = image_variants
+    payload = GalleryEventUpdate(**update_data)
     
     updated_obj = crud.update_gallery_event(db, event_id, payload)
     if not updated_obj:
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_read_db, run_read
+from app.cache import cached_json_response
+from app.schemas.home import HomeOut
+from app.crud import poster, events, teams, timeline, gallery_events
+
+router = APIRouter(prefix="/home", tags=["home"])
+
+# Bu tablolardan herhangi birine yazılınca /home önbelleği yenilenir
+HOME_TABLES = ["posters", "events", "teams", "timeline_events", "gallery_events"]
+
+
+# --- ANASAYFA (HERKESE AÇIK) ---
+@router.get("", response_model=HomeOut, summary="Anasayfa verisini tek istekte getirir.")
+async def read_home(
+    request: Request,
+    poster_limit: int = Query(20, ge=1, le=100),
+    upcoming_limit: int = Query(20, ge=1, le=100),
+    featured_limit: int = Query(4, ge=1, le=20),
+    db: Session | AsyncSession = Depends(get_read_db),
+):
+    """
+    Posterler, yaklaşan etkinlikler, öne çıkan takımlar, zaman çizelgesi ve
+    galeriyi tek bir oturumda okuyup tek bir JSON olarak döndürür.
+    Tümü tek birim olarak önbelleklenir.
+    """
+    async def load():
+        # Aynı oturum sırayla kullanılır (AsyncSession eşzamanlı sorgu desteklemez)
+        return {
+            "posters": await run_read(db, poster.get_multi, poster.get_multi_async, limit=poster_limit, active=True),
+            "upcoming_events": await run_read(db, events.get_upcoming_events, events.get_upcoming_events_async, limit=upcoming_limit),
+            "featured_teams": await run_read(db, teams.get_featured_teams, teams.get_featured_teams_async, limit=featured_limit),
+            "timeline": await run_read(db, timeline.list_events, timeline.list_events_async),
+            "gallery_events": await run_read(db, gallery_events.list_gallery_events, gallery_events.list_gallery_events_async),
+        }
+    # Yaklaşan etkinliklerin ilki başlayınca anasayfa kaydı da düşer
+    return await cached_json_response(
+        request, HOME_TABLES, HomeOut, load,
+        expires=lambda data: events.seconds_until_upcoming_changes(data["upcoming_events"]),
+    )
@@ -1,14 +1,15 @@
-import os
-import shutil
-import uuid
 from typing import List, Dict, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form
+from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form, Request
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db, run_read
+from app.cache import cached_json_response
+from app.uploads import limit_for
+from app.images import manual_variants, store_image
 from app.crud import journey as crud
-from app.schemas.journey import JourneyPersonCreate, JourneyPersonRead, JourneyPersonUpdate
+from app.schemas.journey import JourneyPersonCreate, JourneyPersonRead, JourneyPersonUpdate, JourneyReorder
 
 # !!! GÜVENLİK İÇİN GEREKLİ IMPORT !!!
 from app.security import get_current_admin
@@ -18,18 +19,20 @@ router = APIRouter(
     tags=["Journey"]
 )
 
-# Resimlerin kaydedileceği klasör
-UPLOAD_DIR = "public/uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+# Yüklenen dosya başına boyut limiti (bkz. app/uploads.py)
+MAX_UPLOAD_BYTES = limit_for(router.prefix)
 
 # --- PUBLIC ROUTE (Frontend için - HERKESE AÇIK) ---
 
 @router.get("/", response_model=Dict[int, List[JourneyPersonRead]], summary="Tüm 'Yolculuğumuz' kayıtlarını yıllara göre gruplanmış olarak getirir.")
-def read_all_journey_people(db: Session = Depends(get_db)):
+async def read_all_journey_people(request: Request, db: Session | AsyncSession = Depends(get_read_db)):
     """
     Frontend'de zaman çizelgesini oluşturmak için tüm kişileri `{2023: [...], 2022: [...]}` formatında döndürür.
     """
-    return crud.get_all_journey_people_grouped_by_year(db=db)
+    return await cached_json_response(
+        request, ["journey_people"], Dict[int, List[JourneyPersonRead]],
+        lambda: run_read(db, crud.get_all_journey_people_grouped_by_year, crud.get_all_journey_people_grouped_by_year_async),
+    )
 
 
 # --- ADMIN ROUTES (Yönetim paneli için - KİLİTLİ) ---
@@ -51,17 +54,11 @@ def create_journey_person(
     Hem dosya yüklemeyi hem de manuel URL girmeyi destekler.
     """
     final_photo_url = photo_url
+    photo_variants = manual_variants(photo_url)
 
-    # Dosya yüklendiyse kaydet
+    # Dosya yüklendiyse kaydet (WebP/AVIF türevleri de üretilir, bkz. app/images.py)
     if file:
-        file_ext = file.filename.split(".")[-1] if "." in file.filename else "jpg"
-        unique_filename = f"{uuid.uuid4()}.{file_ext}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        final_photo_url = f"/public/uploads/{unique_filename}"
+        final_photo_url, photo_variants = store_image(file, MAX_UPLOAD_BYTES)
 
     # Şemayı oluştur
     person_in = JourneyPersonCreate(
@@ -69,12 +66,27 @@ def create_journey_person(
         name=name,
         role=role,
         description=description,
-        photo_url=final_photo_url
+        photo_url=final_photo_url,
+        photo_variants=photo_variants,
     )
 
     return crud.create_journey_person(db=db, person=person_in)
 
 
+@router.post("/reorder", response_model=List[JourneyPersonRead], summary="Bir yıldaki 'Yolculuğumuz' kişilerini toplu sıralar (Admin).")
+def reorder_journey_people(
+    payload: JourneyReorder,
+    db: Session = Depends(get_db),
+    # !!! KİLİT BURADA !!!
+    current_admin: dict = Depends(get_current_admin)
+):
+    """
+    Yılın yeni sırasını (`ids`) tek UPDATE ve tek commit ile yazar.
+    Başka yıla ait id'ler yok sayılır; sadece güncellenen kişiler döner.
+    """
+    return crud.reorder_year(db, payload.year, payload.ids)
+
+
 @router.put("/{person_id}", response_model=JourneyPersonRead, summary="Bir 'Yolculuğumuz' kişisini günceller (Admin).")
 def update_journey_person(
     person_id: int,
@@ -97,26 +109,24 @@ def update_journey_person(
         raise HTTPException(status_code=404, detail="Kişi bulunamadı")
     
     final_photo_url = photo_url
+    photo_variants = manual_variants(photo_url)
 
     # Yeni dosya varsa kaydet
     if file:
-        file_ext = file.filename.split(".")[-1] if "." in file.filename else "jpg"
-        unique_filename = f"{uuid.uuid4()}.{file_ext}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        final_photo_url = f"/public/uploads/{unique_filename}"
+        final_photo_url, photo_variants = store_image(file, MAX_UPLOAD_BYTES)
 
     # Güncelleme şemasını oluştur
-    person_update = JourneyPersonUpdate(
+    update_data = dict(
         year=year,
         name=name,
         role=role,
         description=description,
         photo_url=final_photo_url
     )
+    # Türevler sadece görsel değiştiyse yazılır; None gönderilirse mevcutlar silinirdi
+    if photo_variants is not None:
+        update_data["photo_variants"] = photo_variants
+    person_update = JourneyPersonUpdate(**update_data)
     
     updated_person = crud.update_journey_person(db=db, person_id=person_id, person_update=person_update)
     return updated_person
@@ -0,0 +1,19 @@
+import secrets
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+
+from app.metrics import METRICS_TOKEN, render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+# Prometheus kazıma (scrape) ucu; METRICS_TOKEN verilmişse Bearer token ister.
+# async: threadpool doygunluğu ölçülürken kendisi thread beklemez.
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics(request: Request):
+    if METRICS_TOKEN:
+        auth = request.headers.get("Authorization", "")
+        if not secrets.compare_digest(auth, f"Bearer {METRICS_TOKEN}"):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,11 +1,12 @@
-import os
-import shutil
-import uuid
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status, File, UploadFile, Form
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, File, UploadFile, Form
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db, run_read
+from app.cache import cached_json_response
+from app.uploads import limit_for
+from app.images import manual_variants, store_image
 from app.schemas.poster import PosterCreate, PosterUpdate, PosterOut
 from app.crud import poster
 
@@ -14,26 +15,31 @@ from app.security import get_current_admin
 
 router = APIRouter(prefix="/posters", tags=["posters"])
 
-# Resimlerin kaydedileceği klasör
-UPLOAD_DIR = "public/uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+# Yüklenen dosya başına boyut limiti (bkz. app/uploads.py)
+MAX_UPLOAD_BYTES = limit_for(router.prefix)
 
 # --- GET İŞLEMLERİ (HERKESE AÇIK) ---
 @router.get("", response_model=List[PosterOut])
-def list_posters(
+async def list_posters(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     active: Optional[bool] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session | AsyncSession = Depends(get_read_db),
 ):
-    return poster.get_multi(db, skip=skip, limit=limit, active=active)
+    return await cached_json_response(
+        request, ["posters"], List[PosterOut],
+        lambda: run_read(db, poster.get_multi, poster.get_multi_async, skip=skip, limit=limit, active=active),
+    )
 
 @router.get("/{poster_id}", response_model=PosterOut)
-def get_poster(poster_id: int, db: Session = Depends(get_db)):
-    obj = poster.get(db, poster_id)
-    if not obj:
-        raise HTTPException(status_code=404, detail="Poster bulunamadı")
-    return obj
+async def get_poster(poster_id: int, request: Request, db: Session | AsyncSession = Depends(get_read_db)):
+    async def load():
+        obj = await run_read(db, poster.get, poster.get_async, poster_id)
+        if not obj:
+            raise HTTPException(status_code=404, detail="Poster bulunamadı")
+        return obj
+    return await cached_json_response(request, ["posters"], PosterOut, load)
 
 # --- YENİ EKLENEN POST (KİLİTLİ - SADECE ADMIN) ---
 @router.post("", response_model=PosterOut, status_code=status.HTTP_201_CREATED)
@@ -50,24 +56,18 @@ def create_poster(
     current_admin: dict = Depends(get_current_admin)
 ):
     final_image_url = image_url
+    image_variants = manual_variants(image_url)
 
-    # Dosya varsa kaydet
+    # Dosya varsa kaydet (WebP/AVIF türevleri de üretilir, bkz. app/images.py)
     if file:
-        file_ext = file.filename.split(".")[-1] if "." in file.filename else "jpg"
-        unique_filename = f"{uuid.uuid4()}.{file_ext}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Frontend'in erişeceği yol
-        final_image_url = f"/public/uploads/{unique_filename}"
+        final_image_url, image_variants = store_image(file, MAX_UPLOAD_BYTES)
 
     poster_in = PosterCreate(
         title=title,
         subtitle=subtitle,
         content=content,
         image_url=final_image_url,
+        image_variants=image_variants,
         is_active=is_active,
         order_index=order_index
     )
@@ -95,17 +95,11 @@ def update_poster(
         raise HTTPException(status_code=404, detail="Poster bulunamadı")
 
     final_image_url = image_url
+    image_variants = manual_variants(image_url)
 
     # Eğer yeni dosya yüklendiyse
     if file:
-        file_ext = file.filename.split(".")[-1] if "." in file.filename else "jpg"
-        unique_filename = f"{uuid.uuid4()}.{file_ext}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        final_image_url = f"/public/uploads/{unique_filename}"
+        final_image_url, image_variants = store_image(file, MAX_UPLOAD_BYTES)
     
     # Güncelleme objesini hazırla (Eğer final_image_url None ise eskisini korur crud tarafında)
     update_data = PosterUpdate(
@@ -113,6 +107,7 @@ def update_poster(
         subtitle=subtitle,
         content=content,
         image_url=final_image_url,
+        image_variants=image_variants,
         is_active=is_active,
         order_index=order_index
     )
@@ -134,6 +129,7 @@ def delete_poster(
     return
 
 # --- REORDER (KİLİTLİ - SADECE ADMIN) ---
+# Yanıt sadece gönderilen (ve var olan) posterleri yeni sıralarıyla içerir.
 @router.post("/reorder", response_model=List[PosterOut])
 def reorder_posters(
     ids_in_order: List[int], 
@@ -141,10 +137,4 @@ def reorder_posters(
     # !!! KİLİT BURADA !!!
     current_admin: dict = Depends(get_current_admin)
 ):
-    posters = poster.get_multi(db, limit=10000)
-    id_to_obj = {p.id: p for p in posters}
-    for idx, pid in enumerate(ids_in_order):
-        if pid in id_to_obj:
-            id_to_obj[pid].order_index = idx
-    db.commit()
-    return poster.get_multi(db, limit=10000)
\ No newline at end of file
+    return poster.reorder(db, ids_in_order)
\ No newline at end of file
@@ -1,13 +1,14 @@
-import os
-import shutil
-import uuid
 import json
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form
+from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form, Request
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db, run_read
+from app.cache import cached_json_response
+from app.uploads import limit_for
+from app.images import manual_variants, store_image
 from app.crud import teams as crud
 from app.schemas.teams import TeamRead, TeamCreate, TeamUpdate
 
@@ -16,30 +17,37 @@ from app.security import get_current_admin
 
 router = APIRouter(prefix="/teams", tags=["teams"])
 
-# Resimlerin kaydedileceği klasör
-UPLOAD_DIR = "public/uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+# Yüklenen dosya başına boyut limiti (bkz. app/uploads.py)
+MAX_UPLOAD_BYTES = limit_for(router.prefix)
 
 
 # --- Public Rotalar (GET - HERKESE AÇIK) ---
 
 @router.get("/featured", response_model=List[TeamRead], summary="Anasayfa için öne çıkan (featured) takımları getir.")
-def read_featured_teams(db: Session = Depends(get_db)):
+async def read_featured_teams(request: Request, db: Session | AsyncSession = Depends(get_read_db)):
     """Anasayfada gösterilmek üzere öne çıkarılmış (is_featured=True) ilk 4 takımı getirir."""
-    return crud.get_featured_teams(db=db, limit=4)
+    return await cached_json_response(
+        request, ["teams"], List[TeamRead],
+        lambda: run_read(db, crud.get_featured_teams, crud.get_featured_teams_async, limit=4),
+    )
 
 @router.get("", response_model=List[TeamRead], summary="Tüm takımları üyeleriyle birlikte getir.")
-def read_all_teams(db: Session = Depends(get_db)):
+async def read_all_teams(request: Request, db: Session | AsyncSession = Depends(get_read_db)):
     """Tüm takımları, takım listesi sayfası için getirir."""
-    return crud.get_all_teams(db=db)
+    return await cached_json_response(
+        request, ["teams"], List[TeamRead],
+        lambda: run_read(db, crud.get_all_teams, crud.get_all_teams_async),
+    )
 
 @router.get("/{team_id}", response_model=TeamRead, summary="Belirli bir takımın detaylarını getir.")
-def read_team(team_id: int, db: Session = Depends(get_db)):
+async def read_team(team_id: int, request: Request, db: Session | AsyncSession = Depends(get_read_db)):
     """ID'ye göre tek bir takımın tüm detaylarını ve üyelerini getirir."""
-    db_team = crud.get_team_by_id(db, team_id=team_id)
-    if db_team is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Takım bulunamadı.")
-    return db_team
+    async def load():
+        db_team = await run_read(db, crud.get_team_by_id, crud.get_team_by_id_async, team_id=team_id)
+        if db_team is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Takım bulunamadı.")
+        return db_team
+    return await cached_json_response(request, ["teams"], TeamRead, load)
 
 
 # --- Admin Rotaları (POST, PUT, DELETE - KİLİTLİ) ---
@@ -75,17 +83,11 @@ def create_team(
         )
 
     final_photo_url = photo_url
+    photo_variants = manual_variants(photo_url)
 
-    # 3. Dosya varsa kaydet
+    # 3. Dosya varsa kaydet (WebP/AVIF türevleri de üretilir, bkz. app/images.py)
     if file:
-        file_ext = file.filename.split(".")[-1] if "." in file.filename else "jpg"
-        unique_filename = f"{uuid.uuid4()}.{file_ext}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        final_photo_url = f"/public/uploads/{unique_filename}"
+        final_photo_url, photo_variants = store_image(file, MAX_UPLOAD_BYTES)
 
     # 4. JSON string olarak gelen üyeleri listeye çevir
     members_data = []
@@ -103,6 +105,7 @@ def create_team(
         category=category,
         is_featured=is_featured,
         photo_url=final_photo_url,
+        photo_variants=photo_variants,
         members=members_data # Pydantic modeli bunu doğrulayacaktır
     )
         
@@ -140,17 +143,11 @@ def update_team(
             )
 
     final_photo_url = photo_url
+    photo_variants = manual_variants(photo_url)
 
     # Yeni dosya varsa kaydet
     if file:
-        file_ext = file.filename.split(".")[-1] if "." in file.filename else "jpg"
-        unique_filename = f"{uuid.uuid4()}.{file_ext}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        final_photo_url = f"/public/uploads/{unique_filename}"
+        final_photo_url, photo_variants = store_image(file, MAX_UPLOAD_BYTES)
 
     # Members parsing
     members_data = None
@@ -168,6 +165,7 @@ def update_team(
     if category is not None: update_data["category"] = category
     if is_featured is not None: update_data["is_featured"] = is_featured
     if final_photo_url is not None: update_data["photo_url"] = final_photo_url
+    if photo_variants is not None: update_data["photo_variants"] = photo_variants
     if members_data is not None: update_data["members"] = members_data
 
     # Pydantic modelini oluştur
@@ -1,35 +1,42 @@
-import os
-import shutil
-import uuid
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Form, Request, status, File, UploadFile
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.timeline import TimelineEventOut, TimelineEventCreate, TimelineEventUpdate
-from app.crud.timeline import list_events, get_event, create_event, update_event, delete_event
-from app.database import get_db
+from app.crud.timeline import (
+    list_events, list_events_async, get_event, get_event_async, create_event, update_event, delete_event,
+)
+from app.database import get_db, get_read_db, run_read
+from app.cache import cached_json_response
+from app.uploads import limit_for
+from app.images import manual_variants, store_image, store_image_async
 
 # !!! GÜVENLİK İÇİN GEREKLİ IMPORT !!!
 from app.security import get_current_admin
 
 router = APIRouter(prefix="/timeline", tags=["timeline"])
 
-# Klasör Ayarı
-UPLOAD_DIR = "public/uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+# Yüklenen dosya başına boyut limiti (bkz. app/uploads.py)
+MAX_UPLOAD_BYTES = limit_for(router.prefix)
 
 # --- GET İŞLEMLERİ (HERKESE AÇIK) ---
 @router.get("", response_model=List[TimelineEventOut])
-def list_timeline(db: Session = Depends(get_db)):
-    return list_events(db)
+async def list_timeline(request: Request, db: Session | AsyncSession = Depends(get_read_db)):
+    return await cached_json_response(
+        request, ["timeline_events"], List[TimelineEventOut],
+        lambda: run_read(db, list_events, list_events_async),
+    )
 
 @router.get("/{event_id}", response_model=TimelineEventOut)
-def get_timeline_item(event_id: int, db: Session = Depends(get_db)):
-    obj = get_event(db, event_id)
-    if not obj:
-        raise HTTPException(status_code=404, detail="Timeline event not found")
-    return obj
+async def get_timeline_item(event_id: int, request: Request, db: Session | AsyncSession = Depends(get_read_db)):
+    async def load():
+        obj = await run_read(db, get_event, get_event_async, event_id)
+        if not obj:
+            raise HTTPException(status_code=404, detail="Timeline event not found")
+        return obj
+    return await cached_json_response(request, ["timeline_events"], TimelineEventOut, load)
 
 # --- CREATE İŞLEMİ (KİLİTLİ - SADECE ADMIN) ---
 @router.post(
@@ -37,7 +44,7 @@ def get_timeline_item(event_id: int, db: Session = Depends(get_db)):
     status_code=status.HTTP_201_CREATED,
     response_model=TimelineEventOut,
 )
-async def create_timeline_item(
+def create_timeline_item(
     title: str = Form(...),
     description: str = Form(...),
     category: str = Form(...),
@@ -49,17 +56,11 @@ async def create_timeline_item(
     current_admin: dict = Depends(get_current_admin)
 ):
     final_image_url = image_url
+    image_variants = manual_variants(image_url)
 
-    # Dosya Kaydetme
+    # Dosya Kaydetme (WebP/AVIF türevleri de üretilir, bkz. app/images.py)
     if file:
-        file_ext = file.filename.split(".")[-1] if "." in file.filename else "jpg"
-        unique_filename = f"{uuid.uuid4()}.{file_ext}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        final_image_url = f"/public/uploads/{unique_filename}"
+        final_image_url, image_variants = store_image(file, MAX_UPLOAD_BYTES)
 
     payload = TimelineEventCreate(
         title=title,
@@ -72,7 +73,7 @@ async def create_timeline_item(
     # create_event fonksiyonun yapısına göre image_url'i payload içinde gönderiyoruz
     # Eğer crud fonksiyonun ayrıca image_url parametresi almıyorsa sadece payload yeterli.
     # Burada crud fonksiyonunun esnek olduğunu varsayarak devam ediyoruz.
-    return create_event(db, payload, image_url=final_image_url)
+    return create_event(db, payload, image_url=final_image_url, image_variants=image_variants)
 
 
 # --- UPDATE İŞLEMİ (KİLİTLİ - SADECE ADMIN) ---
@@ -99,15 +100,9 @@ async def update_timeline_item(
 
     # Dosya varsa işle
     final_image_url = image_url
+    image_variants = manual_variants(image_url)
     if file:
-        file_ext = file.filename.split(".")[-1] if "." in file.filename else "jpg"
-        unique_filename = f"{uuid.uuid4()}.{file_ext}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        final_image_url = f"/public/uploads/{unique_filename}"
+        final_image_url, image_variants = await store_image_async(file, MAX_UPLOAD_BYTES)
 
     ct = (request.headers.get("content-type") or "").lower()
 
@@ -125,7 +120,7 @@ async def update_timeline_item(
         date_label=date_label,
         image_url=final_image_url, 
     )
-    return update_event(db, obj, updates, image_url=None)
+    return update_event(db, obj, updates, image_url=None, image_variants=image_variants)
 
 
 # --- DELETE İŞLEMİ (KİLİTLİ - SADECE ADMIN) ---
@@ -1,8 +1,10 @@
 # app/schemas/blog.py
 import datetime as dt
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, field_validator, ConfigDict
 
+from app.schemas.image import ImageVariants
+
 # ---------- Base ----------
 class BlogBase(BaseModel):
     title: str
@@ -10,6 +12,7 @@ class BlogBase(BaseModel):
     author: str
     category: str
     cover_image: Optional[str] = None
+    cover_image_variants: ImageVariants = None
     date: dt.date
     preview: Optional[str] = None
 
@@ -38,6 +41,7 @@ class BlogUpdate(BaseModel):
     author: Optional[str] = None
     category: Optional[str] = None
     cover_image: Optional[str] = None
+    cover_image_variants: ImageVariants = None
     date: Optional[dt.date] = None
     preview: Optional[str] = None
 
@@ -66,4 +70,34 @@ class BlogOut(BlogBase):
 class BlogOut(BlogBase):
     id: int
     # Pydantic v2:
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+# ---------- Liste (kart) ----------
+# GET /blogs kartları: `content` yok; preview boşsa içeriğin başı gelir
+class BlogCard(BaseModel):
+    id: int
+    title: str
+    author: str
+    category: str
+    cover_image: Optional[str] = None
+    cover_image_variants: ImageVariants = None
+    date: dt.date
+    preview: Optional[str] = None
+    # ts_headline ile <mark> etiketli içerik parçaları (?q=...&highlight=true)
+    highlight: Optional[str] = None
+    model_config = ConfigDict(from_attributes=True)
+
+class BlogListOut(BaseModel):
+    items: List[BlogCard]
+    total: int
+    page: int
+    page_size: int
+    next_cursor: Optional[str] = None
+
+# ?include_content=true (admin paneli) tam kayıt döndürür; aramada kartlar gibi
+# `highlight` da taşır
+class BlogFullItem(BlogOut):
+    highlight: Optional[str] = None
+
+class BlogListFullOut(BlogListOut):
+    items: List[BlogFullItem]
@@ -1,9 +1,11 @@
 # schemas/crew.py
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
+from app.schemas.image import ImageVariants
+
 # Temel Şema
 class CrewMemberBase(BaseModel):
     name: str = Field(min_length=2, max_length=100)
@@ -11,6 +13,7 @@ class CrewMemberBase(BaseModel):
     description: Optional[str] = None
     category: str
     photo_url: Optional[str] = None
+    photo_variants: ImageVariants = None
     linkedin_url: Optional[str] = None
     github_url: Optional[str] = None
     # ÖNEMLİ: opsiyonel yapıldı ki create'te gönderilmezse backend max+1 atayabilsin
@@ -27,10 +30,16 @@ class CrewMemberUpdate(BaseModel):
     description: Optional[str] = None
     category: Optional[str] = None
     photo_url: Optional[str] = None
+    photo_variants: ImageVariants = None
     linkedin_url: Optional[str] = None
     github_url: Optional[str] = None
     order_index: Optional[int] = None
 
+# Toplu sıralama: `ids` kategorideki üyelerin yeni sırası
+class CrewReorder(BaseModel):
+    category: str
+    ids: List[int] = Field(max_length=500)
+
 # Veri Okuma Şeması (API'den dönecek)
 class CrewMemberRead(CrewMemberBase):
     id: int
@@ -1,12 +1,15 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field
+from typing import Literal, Optional
 from datetime import datetime
 
+from app.schemas.image import ImageVariants
+
 # Ortak Temel Model
 class EventBase(BaseModel):
     title: str
     description: str
     cover_image_url: Optional[str] = None
+    cover_image_variants: ImageVariants = None
     start_at: datetime
     location: str
     category: str
@@ -24,6 +27,7 @@ class EventUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
     cover_image_url: Optional[str] = None
+    cover_image_variants: ImageVariants = None
     start_at: Optional[datetime] = None
     location: Optional[str] = None
     category: Optional[str] = None
@@ -35,8 +39,27 @@ class EventUpdate(BaseModel):
 # API'den Dönen Yanıt Modeli (ORM Modu açık)
 class Event(EventBase):
     id: int
-    registered: int = 0 # Katılımcı sayısı, default 0
+    registered: int = 0 # Katılımcı sayısı; önbellekten gecikebilir, canlısı: EventSeatsOut
     created_at: datetime = None # Veritabanından gelmezse hata vermesin diye default atadık
     
     class Config:
-        from_attributes = True # Pydantic v2 için (eski v1 ise orm_mode = True)
\ No newline at end of file
+        from_attributes = True # Pydantic v2 için (eski v1 ise orm_mode = True)
+
+# Etkinliğe kayıt (herkese açık). Gövde boş gönderilebilir; e-posta sadece
+# bekleme listesine girmek için gereklidir.
+class EventRegistration(BaseModel):
+    name: Optional[str] = Field(None, max_length=150)
+    email: Optional[EmailStr] = None
+    join_waitlist: bool = False
+
+# GET /events/{id}/seats: önbelleğe alınmayan canlı kontenjan
+class EventSeatsOut(BaseModel):
+    registered: int
+    capacity: int
+
+class EventRegistrationOut(BaseModel):
+    status: Literal["registered", "waitlisted"]
+    registered: int
+    capacity: int
+    whatsapp_link: Optional[str] = None     # sadece yer alındıysa döner
+    waitlist_position: Optional[int] = None
@@ -1,9 +1,12 @@
 from pydantic import BaseModel, HttpUrl, Field
 from datetime import date as Date
 
+from app.schemas.image import ImageVariants
+
 class GalleryEventBase(BaseModel):
     category: str = Field(..., max_length=50)
     image_url: HttpUrl | str
+    image_variants: ImageVariants = None
     title: str
     description: str
     date: Date
@@ -15,6 +18,7 @@ class GalleryEventCreate(GalleryEventBase):
 class GalleryEventUpdate(BaseModel):
     category: str | None = None
     image_url: HttpUrl | str | None = None
+    image_variants: ImageVariants = None
     title: str | None = None
     description: str | None = None
     date: Date | None = None
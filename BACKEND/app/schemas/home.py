@@ -0,0 +1,17 @@
+from typing import List
+from pydantic import BaseModel
+
+from app.schemas.poster import PosterOut
+from app.schemas.events import Event
+from app.schemas.teams import TeamRead
+from app.schemas.timeline import TimelineEventOut
+from app.schemas.gallery_events import GalleryEventOut
+
+
+# Anasayfanın tek istekte ihtiyaç duyduğu tüm bloklar
+class HomeOut(BaseModel):
+    posters: List[PosterOut] = []
+    upcoming_events: List[Event] = []
+    featured_teams: List[TeamRead] = []
+    timeline: List[TimelineEventOut] = []
+    gallery_events: List[GalleryEventOut] = []
@@ -0,0 +1,23 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class ImageVariant(BaseModel):
+    """Yüklenen görselin yeniden boyutlandırılmış bir türevi (bkz. app/images.py)."""
+    url: str
+    width: int
+    height: int
+    type: str  # "image/webp", "image/avif"
+
+
+# Görsel kolonunun yanındaki `*_variants` alanlarının tipi.
+# None: türev bilgisi yok (eski kayıt / değişmedi), []: türevi olmayan dış link.
+ImageVariants = Optional[List[ImageVariant]]
+
+
+def dump_variants(variants: ImageVariants) -> Optional[List[dict]]:
+    """Alanları tek tek atayan crud fonksiyonları için: JSON kolonuna yazılacak hali."""
+    if variants is None:
+        return None
+    return [v.model_dump() for v in variants]
@@ -1,9 +1,11 @@
 # schemas/journey.py
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
+from app.schemas.image import ImageVariants
+
 # Temel Şema: Veri oluşturma ve okuma için ortak alanlar
 class JourneyPersonBase(BaseModel):
     year: int
@@ -11,6 +13,9 @@ class JourneyPersonBase(BaseModel):
     role: str = Field(min_length=2, max_length=100)
     description: str = Field(min_length=5, max_length=255)
     photo_url: Optional[str] = None
+    photo_variants: ImageVariants = None
+    # Yıl içindeki sıra; create'te gönderilmezse backend max+1 atar
+    order_index: Optional[int] = None
 
 # Veri Oluşturma Şeması (Admin panelinden gelecek veri)
 class JourneyPersonCreate(JourneyPersonBase):
@@ -30,3 +35,10 @@ class JourneyPersonUpdate(BaseModel):
     role: Optional[str] = Field(None, min_length=2, max_length=100)
     description: Optional[str] = Field(None, min_length=5, max_length=255)
     photo_url: Optional[str] = None
+    photo_variants: ImageVariants = None
+    order_index: Optional[int] = None
+
+# Toplu sıralama: `ids` o yıldaki kişilerin yeni sırası
+class JourneyReorder(BaseModel):
+    year: int
+    ids: List[int] = Field(max_length=500)
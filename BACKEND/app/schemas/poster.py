@@ -1,11 +1,14 @@
 from typing import Optional
 from pydantic import BaseModel, Field
 
+from app.schemas.image import ImageVariants
+
 class PosterBase(BaseModel):
     title: str = Field(..., max_length=200)
     subtitle: Optional[str] = Field(None, max_length=250)
     content: Optional[str] = None
     image_url: Optional[str] = None
+    image_variants: ImageVariants = None
     is_active: Optional[bool] = True
     # ÖNEMLİ: Opsiyonel yapıldı. Gönderilmezse backend max+1 atayacak.
     order_index: Optional[int] = None
@@ -18,6 +21,7 @@ class PosterUpdate(BaseModel):
     subtitle: Optional[str] = Field(None, max_length=250)
     content: Optional[str] = None
     image_url: Optional[str] = None
+    image_variants: ImageVariants = None
     is_active: Optional[bool] = None
     order_index: Optional[int] = None
 
@@ -2,6 +2,8 @@ from typing import List, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 
+from app.schemas.image import ImageVariants
+
 # Üye Şeması - Base
 class TeamMemberBase(BaseModel):
     name: str = Field(min_length=1, max_length=100)
@@ -23,6 +25,7 @@ class TeamCreate(BaseModel):
     category: str = Field(min_length=2, max_length=100)
     description: str = Field(min_length=10)
     photo_url: Optional[str] = None
+    photo_variants: ImageVariants = None
     is_featured: bool = False
     
     # Üyeler
@@ -38,6 +41,7 @@ class TeamRead(BaseModel):
     category: str
     description: str
     photo_url: Optional[str]
+    photo_variants: ImageVariants = None
     is_featured: bool
     created_at: datetime
     updated_at: datetime
@@ -54,4 +58,5 @@ class TeamUpdate(BaseModel):
     category: Optional[str] = Field(None, min_length=2, max_length=100)
     description: Optional[str] = Field(None, min_length=10)
     photo_url: Optional[str] = None
+    photo_variants: ImageVariants = None
     is_featured: Optional[bool] = None
\ No newline at end of file
@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field
 from typing import Optional
 
+from app.schemas.image import ImageVariants
+
 
 class TimelineEventBase(BaseModel):
     title: str = Field(..., min_length=1)
@@ -27,6 +29,7 @@ class TimelineEventUpdate(BaseModel):
 class TimelineEventOut(TimelineEventBase):
     id: int
     image_url: Optional[str] = None
+    image_variants: ImageVariants = None
 
     class Config:
         from_attributes = True  # SQLAlchemy -> Pydantic v2 uyumu
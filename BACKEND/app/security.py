@@ -1,16 +1,23 @@
 # app/security.py
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 # !!! Cookie Okumak İçin Request Eklendi !!!
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 import os
 
-from .database import get_db
+from .database import SessionLocal, get_db
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -18,6 +25,8 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "CHANGE_ME_IN_PROD")
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+ADMIN_CACHE_TTL = float(os.getenv("ADMIN_CACHE_TTL", "60"))  # saniye
+ADMIN_CACHE_MAX_ENTRIES = int(os.getenv("ADMIN_CACHE_MAX_ENTRIES", "256"))
 
 if SECRET_KEY == "CHANGE_ME_IN_PROD":
     print("UYARI: JWT_SECRET_KEY .env'den okunamadı, varsayılan kullanılıyor!")
@@ -36,7 +45,8 @@ def verify_password(plain: str, hashed: str) -> bool:
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
+    # jti: aynı saniyede verilen iki token da farklı olsun (iptal token'a özeldir)
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 def decode_access_token(token: str) -> Optional[dict]:
@@ -45,52 +55,205 @@ def decode_access_token(token: str) -> Optional[dict]:
     except JWTError:
         return None
 
-# --- YENİ BAĞIMLILIK (DEPENDENCY) ---
-# Token'ı önce Cookie'den, yoksa Header'dan okur.
-def require_admin(
-    request: Request,
-    db: Session = Depends(get_db),
-):
-    token = None
-    
-    # 1. Önce güvenli Cookie'ye bak (admin_token)
-    if "admin_token" in request.cookies:
-        token = request.cookies.get("admin_token")
-    
-    # 2. Cookie yoksa Authorization Header'a bak (Postman/Swagger testi için)
-    elif "Authorization" in request.headers:
-        auth_header = request.headers.get("Authorization")
-        if auth_header and auth_header.startswith("Bearer "):
-            token = auth_header.split(" ")[1]
+# --- ADMIN KİMLİĞİ (PRINCIPAL) ÖNBELLEĞİ ---
+# Doğrulanmış token -> admin kimliği. Önbellekteki token için imza tekrar
+# doğrulanmaz ve veritabanına gidilmez; kayıt en geç ADMIN_CACHE_TTL ya da
+# token'ın kendi `exp` süresi dolunca düşer.
+#
+# Önbellek her worker'da ayrıdır, iptal bilgisi ise veritabanındadır:
+# - Çıkış, token'ın özetini `revoked_tokens` tablosuna yazar.
+# - Parola/2FA değişikliği adminin `token_version` değerini artırır; token'lar
+#   giriş anındaki sürümü `ver` olarak taşır.
+# Önbellek kaçırmasında (her worker'da en geç ADMIN_CACHE_TTL saniyede bir)
+# ikisi de kontrol edilir. İşlemi yapan worker kendi kayıtlarını hemen düşürür.
+@dataclass(frozen=True)
+class AdminPrincipal:
+    id: int
+    email: str
+    is_2fa_enabled: bool
 
-    # Token bulunamadıysa hata ver
+
+def _token_key(token: str) -> str:
+    # Ham token bellekte anahtar olarak tutulmaz
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class PrincipalCache:
+    """TTL + LRU tahliyeli, thread-safe token -> AdminPrincipal önbelleği."""
+
+    def __init__(self, max_entries: int = 256, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[AdminPrincipal, float]]" = OrderedDict()
+        self._revoked: Dict[str, float] = {}  # token anahtarı -> token'ın bitiş zamanı (epoch)
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[AdminPrincipal]:
+        key = _token_key(token)
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None:
+                return None
+            if hit[1] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return hit[0]
+
+    def put(self, token: str, principal: AdminPrincipal, token_exp: Optional[float]) -> None:
+        ttl = self.ttl
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+        if ttl <= 0:
+            return
+        key = _token_key(token)
+        with self._lock:
+            if key in self._revoked:
+                return
+            self._entries[key] = (principal, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def is_revoked(self, token: str) -> bool:
+        with self._lock:
+            return _token_key(token) in self._revoked
+
+    def revoke(self, token: str, token_exp: Optional[float]) -> None:
+        """Çıkış: bu süreçte token süresi dolana kadar reddedilir (kalıcı kayıt `revoke_token`'da)."""
+        key = _token_key(token)
+        now = time.time()
+        with self._lock:
+            self._entries.pop(key, None)
+            # Süresi dolmuş iptaller zaten imza doğrulamasında reddedilir; listeden atılır
+            self._revoked = {k: exp for k, exp in self._revoked.items() if exp > now}
+            self._revoked[key] = token_exp if token_exp is not None else now + ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+    def invalidate_admin(self, email: str) -> int:
+        """Parola/2FA değişikliği: o adminin tüm kayıtları düşer, sonraki istek DB'den okur."""
+        with self._lock:
+            keys = [k for k, (p, _) in self._entries.items() if p.email == email]
+            for k in keys:
+                del self._entries[k]
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._revoked.clear()
+
+
+principal_cache = PrincipalCache(max_entries=ADMIN_CACHE_MAX_ENTRIES, ttl=ADMIN_CACHE_TTL)
+
+
+def revoke_token(token: Optional[str], db: Session) -> None:
+    """Çıkışta çağrılır; imzası geçerli olsa da token hiçbir worker'da bir daha kabul edilmez."""
     if not token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Authentication required.",
-        )
+        return
+    payload = decode_access_token(token)
+    exp = payload.get("exp") if payload else None
+    if exp is None:
+        exp = time.time() + ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+    from .models import RevokedToken  # lazy import
+    # Süresi dolmuş iptaller zaten imza doğrulamasında reddedilir; tablodan atılır
+    db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow()))
+    db.merge(RevokedToken(token_hash=_token_key(token), expires_at=datetime.utcfromtimestamp(exp)))
+    db.commit()
+    principal_cache.revoke(token, exp)
+
+
+def invalidate_admin(db: Session, admin) -> None:
+    """
+    Admin kaydı değişince (parola, 2FA açma/kapama) çağrılır. Bekleyen
+    değişiklikle aynı transaction'da token sürümü artar; o adminin daha önce
+    verilmiş tüm token'ları reddedilir. Çağıran, oturumu sürecekse yeni bir
+    token vermelidir.
+    """
+    admin.token_version = type(admin).token_version + 1
+    db.commit()
+    principal_cache.invalidate_admin(admin.email)
+
+
+def token_from_request(request: Request) -> Optional[str]:
+    """Token'ı önce güvenli Cookie'den (admin_token), yoksa Authorization başlığından okur."""
+    if "admin_token" in request.cookies:
+        return request.cookies.get("admin_token")
+    auth_header = request.headers.get("Authorization")
+    if auth_header and auth_header.startswith("Bearer "):
+        return auth_header.split(" ")[1]
+    return None
+
+
+def resolve_admin(token: str, db: Session) -> AdminPrincipal:
+    """Token'ı admin kimliğine çevirir; önbellekte yoksa imzayı doğrular ve DB'ye bakar."""
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
 
-    # Token'ı çöz
     payload = decode_access_token(token)
-    if payload is None:
+    if payload is None or principal_cache.is_revoked(token):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
         )
 
     email = payload.get("sub")
-    
+
     # DB kontrolü
     try:
-        from .models import Admin  # lazy import
+        from .models import Admin, RevokedToken  # lazy import
         admin = db.query(Admin).filter(Admin.email == email).first()
+        revoked = admin is not None and db.get(RevokedToken, _token_key(token)) is not None
     except Exception:
         admin = None
 
     if not admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges required")
 
-    return admin
+    # Başka bir worker'da çıkış yapılmış ya da parola/2FA sonradan değişmiş
+    if revoked or payload.get("ver", 0) != admin.token_version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+        )
+
+    principal = AdminPrincipal(id=admin.id, email=admin.email, is_2fa_enabled=bool(admin.totp_secret))
+    principal_cache.put(token, principal, payload.get("exp"))
+    return principal
+
+
+def resolve_admin_standalone(token: str) -> AdminPrincipal:
+    """İstek oturumu olmayan yerler (middleware) için: gerekirse kendi oturumunu açar."""
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+    with SessionLocal() as db:
+        return resolve_admin(token, db)
+
+
+# --- YENİ BAĞIMLILIK (DEPENDENCY) ---
+# Token'ı önce Cookie'den, yoksa Header'dan okur. AdminAuthMiddleware
+# (app/middleware.py) kimliği zaten çözdüyse doğrudan o kullanılır.
+# `db` oturumu tembeldir: önbellek isabetinde bağlantı hiç açılmaz.
+def require_admin(
+    request: Request,
+    db: Session = Depends(get_db),
+) -> AdminPrincipal:
+    principal = getattr(request.state, "admin", None)
+    if principal is not None:
+        return principal
+
+    token = token_from_request(request)
+
+    # Token bulunamadıysa hata ver
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required.",
+        )
+
+    return resolve_admin(token, db)
 
 # Router'ların beklediği isim:
 def get_current_admin(admin = Depends(require_admin)):
@@ -0,0 +1,137 @@
+# app/static.py
+"""
+`/public` için önbellek dostu statik dosya sunumu.
+
+- Adı içerikten türeyen dosyalar (`<sha256>.<uzantı>`, eski `<uuid>.<uzantı>`
+  ve bunların `-<genişlik>` türevleri) hiç değişmez; bunlara bir yıllık
+  `immutable` Cache-Control verilir, tarayıcı ve CDN tekrar sormaz. Diğer
+  dosyalar STATIC_MAX_AGE kadar önbelleklenir, sonra ETag ile doğrulanır.
+- Dosyanın yanında `.br` / `.gz` kardeşi varsa ve istemci kabul ediyorsa
+  o dosya `Content-Encoding` ile gönderilir (sıkıştırma işi yapılmaz).
+- Range istekleri (206) Starlette'in FileResponse'u tarafından desteklenir.
+
+Üretimde dosya baytlarının Python worker'ından hiç geçmemesi için
+STATIC_SENDFILE ile sunum ters vekile (reverse proxy) devredilir:
+
+- `x-accel-redirect` (nginx): yanıt gövdesizdir, nginx dosyayı
+  STATIC_ACCEL_PREFIX + yol adresinden kendisi sunar. Örnek:
+
+      location /_public_internal/ {
+          internal;
+          alias /srv/ayzek/BACKEND/public/;
+          gzip_static on;
+      }
+
+- `x-sendfile` (Apache mod_xsendfile, lighttpd): dosyanın mutlak yolu gönderilir.
+
+Bu modlarda Range, koşullu istek ve sıkıştırılmış kardeşleri vekil sunucu
+kendisi ele alır; Cache-Control başlığı uygulamadan gelir.
+"""
+import os
+import re
+import stat
+from mimetypes import guess_type
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, PathLike, StaticFiles
+from starlette.types import Scope
+
+# --- ENV ---
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", "3600"))  # adı değişebilen dosyalar için (saniye)
+STATIC_SENDFILE = os.getenv("STATIC_SENDFILE", "").strip().lower()  # "", "x-accel-redirect", "x-sendfile"
+STATIC_ACCEL_PREFIX = os.getenv("STATIC_ACCEL_PREFIX", "/_public_internal").rstrip("/")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# İçerik adresli (sha256) ya da uuid adlı yüklemeler ve -<genişlik> türevleri
+_IMMUTABLE_NAME = re.compile(
+    r"^(?:[0-9a-f]{64}|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})(?:-\d+)?\.[a-z0-9]+$"
+)
+
+# Tercih sırasına göre önceden sıkıştırılmış kardeş dosya uzantıları
+SIDECARS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def accepted_encodings(header: Optional[str]) -> Dict[str, float]:
+    """`Accept-Encoding` başlığını {kodlama: q} sözlüğüne çevirir; q=0 olanlar dahil edilmez."""
+    result: Dict[str, float] = {}
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            result[coding] = q
+    return result
+
+
+def cache_control_for(path: str) -> str:
+    if _IMMUTABLE_NAME.match(os.path.basename(path)):
+        return IMMUTABLE_CACHE_CONTROL
+    return f"public, max-age={STATIC_MAX_AGE}"
+
+
+def _media_type(path: str) -> str:
+    return guess_type(path)[0] or "text/plain"
+
+
+class CachedStaticFiles(StaticFiles):
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        full_path = os.fspath(full_path)
+        headers = {"Cache-Control": cache_control_for(full_path)}
+
+        if STATIC_SENDFILE:
+            return self._sendfile_response(full_path, scope, headers)
+
+        request_headers = Headers(scope=scope)
+        response = self._sidecar_response(full_path, request_headers, headers)
+        if response is None:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, headers=headers)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    def _sidecar_response(self, full_path: str, request_headers: Headers, headers: Dict[str, str]) -> Optional[Response]:
+        accepted = accepted_encodings(request_headers.get("accept-encoding"))
+        # Kardeş dosya olup olmadığına bakmak ucuz bir stat; yine de sadece istemci kabul ediyorsa yapılır
+        for coding, suffix in SIDECARS:
+            if coding not in accepted:
+                continue
+            try:
+                sidecar_stat = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            if not stat.S_ISREG(sidecar_stat.st_mode):
+                continue
+            return FileResponse(
+                full_path + suffix,
+                stat_result=sidecar_stat,
+                media_type=_media_type(full_path),  # .br/.gz'nin değil, orijinalin türü
+                headers={**headers, "Content-Encoding": coding, "Vary": "Accept-Encoding"},
+            )
+        return None
+
+    def _sendfile_response(self, full_path: str, scope: Scope, headers: Dict[str, str]) -> Response:
+        media_type = _media_type(full_path)
+        if STATIC_SENDFILE == "x-accel-redirect":
+            # Mount köküne göre göreli yol: /public/uploads/a.jpg -> /_public_internal/uploads/a.jpg
+            relative = os.path.relpath(full_path, os.path.realpath(self.directory)).replace(os.sep, "/")
+            headers["X-Accel-Redirect"] = f"{STATIC_ACCEL_PREFIX}/{relative}"
+        else:
+            headers["X-Sendfile"] = full_path
+        return Response(status_code=200, media_type=media_type, headers=headers)
@@ -0,0 +1,234 @@
+# app/upload_gc.py
+"""
+`public/uploads` altında hiçbir kaydın göstermediği (yetim) dosyaları temizler.
+
+Bir görsel PUT ile değiştirildiğinde ya da kayıt silindiğinde eski dosya
+diskte kalır. Bu iş, görsel taşıyan tüm kolonlardan (ve `*_variants`
+türevlerinden) referans kümesini kurar, klasörü `os.scandir` ile akıtarak
+gezer ve referanssız, GRACE süresinden eski dosyaları siler ya da karantinaya
+taşır. Yeni yüklenmiş ama kaydı henüz commit edilmemiş dosyalar GRACE
+sayesinde korunur.
+
+Varsayılan mod kuru çalıştırmadır (dry-run): hiçbir şey silinmez, sadece
+rapor basılır. Cron'dan örnek kullanım:
+
+    python -m app.upload_gc                          # rapor
+    python -m app.upload_gc --apply                  # sil
+    python -m app.upload_gc --apply --quarantine     # upload_quarantine/<zaman>/ altına taşı
+    python -m app.upload_gc --apply --metrics-file /var/lib/node_exporter/upload_gc.prom
+
+Karantina her çalıştırmada zaman damgalı ayrı bir alt klasöre taşır; önceki
+çalıştırmalarda karantinaya alınmış dosyaların üzerine yazılmaz.
+
+`--metrics-file`, node_exporter textfile toplayıcısı için Prometheus metin
+biçiminde sayaçlar yazar.
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal
+from .models import (
+    Blog, CrewMember, Event, GalleryEvent, JourneyPerson, Poster, Team, TimelineEvents, UploadBlob,
+)
+from .uploads import PUBLIC_PREFIX, UPLOAD_DIR
+
+# --- ENV ---
+GRACE_HOURS = float(os.getenv("UPLOAD_GC_GRACE_HOURS", "24"))
+QUARANTINE_DIR = os.getenv("UPLOAD_QUARANTINE_DIR", "upload_quarantine")  # public/ dışında: servis edilmez
+
+# Görsel URL'si ve türev listesi taşıyan kolonlar
+IMAGE_COLUMNS = [
+    (TimelineEvents.image_url, TimelineEvents.image_variants),
+    (Event.cover_image_url, Event.cover_image_variants),
+    (GalleryEvent.image_url, GalleryEvent.image_variants),
+    (Poster.image_url, Poster.image_variants),
+    (Blog.cover_image, Blog.cover_image_variants),
+    (Team.photo_url, Team.photo_variants),
+    (JourneyPerson.photo_url, JourneyPerson.photo_variants),
+    (CrewMember.photo_url, CrewMember.photo_variants),
+]
+# Metin içine gömülmüş görseller de referans sayılır (ör. blog içeriğindeki <img>)
+TEXT_COLUMNS = [Blog.content, Blog.preview, Poster.content, Event.description]
+
+_UPLOAD_REF = re.compile(re.escape(PUBLIC_PREFIX) + r"/([A-Za-z0-9._-]+)")
+# <sha256>-<genişlik>.<uzantı> türevi, orijinali referanslıysa korunur
+_VARIANT_NAME = re.compile(r"^(?P<stem>.+)-\d+\.[a-z0-9]+$")
+
+
+@dataclass
+class GcReport:
+    dry_run: bool
+    action: str
+    grace_hours: float
+    referenced: int = 0
+    scanned: int = 0
+    scanned_bytes: int = 0
+    kept_referenced: int = 0
+    kept_recent: int = 0
+    orphaned: int = 0
+    orphaned_bytes: int = 0
+    removed: int = 0
+    removed_bytes: int = 0
+    index_rows_removed: int = 0
+    errors: int = 0
+    quarantine_path: Optional[str] = None
+    duration_seconds: float = 0.0
+    orphans: List[str] = field(default_factory=list)
+
+
+def _names_in(value: Optional[str]) -> Iterable[str]:
+    if not value:
+        return ()
+    return _UPLOAD_REF.findall(value)
+
+
+def collect_references(db: Session) -> Set[str]:
+    """Veritabanında geçen tüm yükleme dosya adları (URL değil, sadece ad)."""
+    names: Set[str] = set()
+    for url_col, variants_col in IMAGE_COLUMNS:
+        # yield_per: büyük tablolar belleğe bir kerede alınmaz
+        for url, variants in db.execute(select(url_col, variants_col)).yield_per(1000):
+            names.update(_names_in(url))
+            for variant in variants or ():
+                names.update(_names_in(variant.get("url")))
+    for col in TEXT_COLUMNS:
+        for (text,) in db.execute(select(col).where(col.contains(PUBLIC_PREFIX + "/"))).yield_per(200):
+            names.update(_names_in(text))
+    return names
+
+
+def _is_referenced(name: str, referenced: Set[str], stems: Set[str]) -> bool:
+    if name in referenced:
+        return True
+    m = _VARIANT_NAME.match(name)
+    return m is not None and m.group("stem") in stems
+
+
+def collect_garbage(
+    db: Session,
+    apply: bool = False,
+    quarantine: bool = False,
+    grace_hours: float = GRACE_HOURS,
+    upload_dir: str = UPLOAD_DIR,
+    quarantine_dir: str = QUARANTINE_DIR,
+) -> GcReport:
+    started = time.monotonic()
+    report = GcReport(
+        dry_run=not apply,
+        action="quarantine" if quarantine else "delete",
+        grace_hours=grace_hours,
+    )
+    referenced = collect_references(db)
+    report.referenced = len(referenced)
+    stems = {os.path.splitext(name)[0] for name in referenced}
+    cutoff = time.time() - grace_hours * 3600
+    removed_urls: List[str] = []
+
+    if apply and quarantine:
+        # Çalıştırma başına yeni klasör: aynı adlı eski karantina dosyası ezilmez
+        target_dir = os.path.join(quarantine_dir, datetime.utcnow().strftime("%Y%m%dT%H%M%S-%f"))
+        os.makedirs(target_dir)
+        report.quarantine_path = target_dir
+
+    with os.scandir(upload_dir) as entries:
+        for entry in entries:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                continue  # tarama sırasında silinmiş
+            report.scanned += 1
+            report.scanned_bytes += st.st_size
+
+            if _is_referenced(entry.name, referenced, stems):
+                report.kept_referenced += 1
+                continue
+            if st.st_mtime > cutoff:
+                report.kept_recent += 1
+                continue
+
+            report.orphaned += 1
+            report.orphaned_bytes += st.st_size
+            report.orphans.append(entry.name)
+            if not apply:
+                continue
+            try:
+                if quarantine:
+                    shutil.move(entry.path, os.path.join(target_dir, entry.name))
+                else:
+                    os.remove(entry.path)
+            except OSError:
+                report.errors += 1
+                continue
+            report.removed += 1
+            report.removed_bytes += st.st_size
+            removed_urls.append(f"{PUBLIC_PREFIX}/{entry.name}")
+
+    if removed_urls:
+        # Dosyası kalmayan içerik dizini kayıtları da silinir
+        for i in range(0, len(removed_urls), 500):
+            chunk = removed_urls[i:i + 500]
+            report.index_rows_removed += (
+                db.query(UploadBlob).filter(UploadBlob.url.in_(chunk)).delete(synchronize_session=False)
+            )
+        db.commit()
+
+    report.duration_seconds = round(time.monotonic() - started, 3)
+    return report
+
+
+def write_metrics(report: GcReport, path: str) -> None:
+    """Prometheus textfile biçiminde sayaçlar; yarım dosya okunmasın diye atomik yazılır."""
+    metrics = {
+        "upload_gc_scanned_files": report.scanned,
+        "upload_gc_scanned_bytes": report.scanned_bytes,
+        "upload_gc_referenced_files": report.referenced,
+        "upload_gc_orphaned_files": report.orphaned,
+        "upload_gc_orphaned_bytes": report.orphaned_bytes,
+        "upload_gc_removed_files": report.removed,
+        "upload_gc_removed_bytes": report.removed_bytes,
+        "upload_gc_errors": report.errors,
+        "upload_gc_duration_seconds": report.duration_seconds,
+        "upload_gc_last_run_timestamp_seconds": int(time.time()),
+    }
+    labels = f'{{dry_run="{str(report.dry_run).lower()}",action="{report.action}"}}'
+    lines = [f"# TYPE {name} gauge\n{name}{labels} {value}" for name, value in metrics.items()]
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, path)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apply", action="store_true", help="yetim dosyaları gerçekten sil/taşı (varsayılan: dry-run)")
+    parser.add_argument("--quarantine", action="store_true", help=f"silmek yerine {QUARANTINE_DIR}/<zaman>/ altına taşı")
+    parser.add_argument("--grace-hours", type=float, default=GRACE_HOURS, help="bu süreden yeni dosyalara dokunma")
+    parser.add_argument("--metrics-file", help="Prometheus textfile çıktısı")
+    parser.add_argument("--list", action="store_true", help="yetim dosya adlarını da yazdır")
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        report = collect_garbage(db, apply=args.apply, quarantine=args.quarantine, grace_hours=args.grace_hours)
+
+    if args.metrics_file:
+        write_metrics(report, args.metrics_file)
+    out = asdict(report)
+    if not args.list:
+        out.pop("orphans")
+    print(json.dumps(out, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# app/uploads.py
+"""
+Yükleme (upload) altyapısı: tüm router'lar dosyaları buradan kaydeder.
+
+- `UploadLimitMiddleware`, multipart gövdesini Starlette ayrıştırmadan ÖNCE
+  rota başına bayt limitiyle keser: Content-Length büyükse hemen 413 döner,
+  chunked gövdede akan baytları sayar.
+- `store_upload`, dosyayı parça parça (CHUNK_SIZE) diske yazar, limiti tekrar
+  uygular ve içeriğin ilk baytlarından gerçek görsel türünü doğrular. İstemcinin
+  bildirdiği Content-Type ve dosya adı dikkate alınmaz; uzantı bu türden gelir.
+- Depolama içerik adreslidir: dosya adı, baytların SHA-256 özetidir
+  (`<sha256>.<uzantı>`). Aynı dosya farklı rotalardan tekrar yüklenirse diske
+  ikinci kez yazılmaz ve aynı URL döner. URL ancak içerik değişince değiştiği
+  için bu dosyalar uzun süreli (immutable) önbelleklenebilir. Özet -> URL
+  dizini `upload_blobs` tablosundadır (bkz. app/images.py).
+- `def` endpoint'ler zaten threadpool'da çalışır ve `store_upload`'ı doğrudan
+  çağırır; `async def` endpoint'ler `store_upload_async` ile yazmayı event
+  loop dışına taşır.
+"""
+import hashlib
+import os
+import uuid
+from typing import Dict, Optional
+
+from fastapi import HTTPException, UploadFile, status
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+
+# --- ENV ---
+UPLOAD_DIR = "public/uploads"
+PUBLIC_PREFIX = "/public/uploads"
+CHUNK_SIZE = 1024 * 1024  # 1 MiB
+MB = 1024 * 1024
+DEFAULT_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * MB)))
+
+os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+# Rota öneki -> dosya başına izin verilen en büyük boyut
+UPLOAD_LIMITS: Dict[str, int] = {
+    "/events": 20 * MB,              # afiş/banner
+    "/posters": 20 * MB,
+    "/api/gallery-events": 20 * MB,
+    "/blogs": 10 * MB,
+    "/timeline": 10 * MB,
+    "/teams": 5 * MB,
+    "/crew": 5 * MB,
+    "/journey": 5 * MB,
+}
+# Form alanları ve multipart sınırları için dosya limitine eklenen pay
+MULTIPART_OVERHEAD = 256 * 1024
+
+# İzin verilen görsel türleri -> kaydedilecek uzantı (SVG bilerek yok: script taşıyabilir)
+IMAGE_TYPES: Dict[str, str] = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/gif": "gif",
+    "image/webp": "webp",
+    "image/avif": "avif",
+}
+
+
+def limit_for(path: str) -> int:
+    for prefix, limit in UPLOAD_LIMITS.items():
+        if path == prefix or path.startswith(prefix + "/"):
+            return limit
+    return DEFAULT_MAX_BYTES
+
+
+def _sniff(head: bytes) -> Optional[str]:
+    """Dosyanın ilk baytlarından (magic number) görsel türünü bulur."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head[4:8] == b"ftyp" and head[8:12] in (b"avif", b"avis"):
+        return "image/avif"
+    return None
+
+
+class UploadTooLarge(HTTPException):
+    # HTTPException olmalı: FastAPI gövde okurken oluşan diğer hataları 400'e çevirir
+    def __init__(self, file_limit: int):
+        super().__init__(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Dosya çok büyük (en fazla {file_limit // MB} MB).",
+        )
+
+
+def store_upload(file: UploadFile, max_bytes: int = DEFAULT_MAX_BYTES) -> str:
+    """
+    Yüklenen görseli UPLOAD_DIR altına içerik özetiyle kaydeder ve herkese
+    açık URL'sini döndürür. Aynı içerik zaten varsa yeni dosya yazılmaz.
+    Bloklayan I/O yapar; event loop'ta çağırmayın.
+    """
+    src = file.file
+    src.seek(0)
+    head = src.read(CHUNK_SIZE)
+    kind = _sniff(head)
+    if kind is None:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Dosya geçerli bir görsel değil.")
+
+    # Özet yazarken hesaplanır; eşzamanlı yüklemeler çakışmasın diye geçici ad benzersizdir
+    tmp_path = os.path.join(UPLOAD_DIR, f"{uuid.uuid4()}.part")  # yarım dosya hiçbir zaman public adla görünmez
+    digest = hashlib.sha256()
+
+    written = 0
+    try:
+        with open(tmp_path, "wb") as out:
+            chunk = head
+            while chunk:
+                written += len(chunk)
+                if written > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+                digest.update(chunk)
+                out.write(chunk)
+                chunk = src.read(CHUNK_SIZE)
+
+        filename = f"{digest.hexdigest()}.{IMAGE_TYPES[kind]}"
+        path = os.path.join(UPLOAD_DIR, filename)
+        if os.path.exists(path):
+            os.remove(tmp_path)  # aynı baytlar zaten diskte
+            # Yetim sayılıp silinmesin: GC (app/upload_gc.py) yeni dosyalara dokunmaz
+            os.utime(path)
+        else:
+            os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return f"{PUBLIC_PREFIX}/{filename}"
+
+
+def content_type_for(url: str) -> Optional[str]:
+    """Yüklenmiş dosyanın uzantısından MIME türü."""
+    ext = url.rsplit(".", 1)[-1].lower()
+    return next((mime for mime, e in IMAGE_TYPES.items() if e == ext), None)
+
+
+async def store_upload_async(file: UploadFile, max_bytes: int = DEFAULT_MAX_BYTES) -> str:
+    """`async def` endpoint'ler için: dosya yazımını threadpool'da yapar."""
+    return await run_in_threadpool(store_upload, file, max_bytes)
+
+
+# --- MIDDLEWARE ---
+class UploadLimitMiddleware:
+    """
+    Multipart isteklerin gövdesini rota limitine göre sınırlar. Böylece büyük
+    bir dosya Starlette'in geçici dosyasına hiç yazılmadan reddedilir.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT", "PATCH"):
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope["headers"])
+        content_type = headers.get(b"content-type", b"").decode("latin-1").lower()
+        if not content_type.startswith("multipart/form-data"):
+            return await self.app(scope, receive, send)
+
+        file_limit = limit_for(scope["path"])
+        max_body = file_limit + MULTIPART_OVERHEAD
+
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > max_body:
+            return await self._reject(scope, receive, send, file_limit)
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_body:
+                    raise UploadTooLarge(file_limit)
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except UploadTooLarge:
+            if response_started:
+                raise
+            await self._reject(scope, receive, send, file_limit)
+
+    @staticmethod
+    async def _reject(scope, receive, send, file_limit: int):
+        response = JSONResponse(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            content={"detail": f"Dosya çok büyük (en fazla {file_limit // MB} MB)."},
+            headers={"Connection": "close"},
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,222 @@
+# app/versions.py
+"""
+Tablo başına içerik sürüm sayaçları.
+
+Sayaçlar veritabanındaki `table_versions` tablosunda tutulur; böylece tüm
+uvicorn worker'ları aynı değeri görür. Sürüm, yazmanın KENDİ transaction'ında,
+commit'ten hemen önce artırılır:
+
+- ORM ile eklenen/değişen/silinen nesnelerin tabloları flush sırasında,
+- `update(Model)` / `delete(Model)` gibi toplu ifadelerin tabloları
+  çalıştırılırken oturuma not edilir; `before_commit` hepsini tek bir
+  upsert ile artırır.
+
+Böylece veri commit edilip sürüm artmadan kalamaz, geri alınan (rollback)
+yazma da sürümü artırmaz. crud katmanının ayrıca bir şey çağırması gerekmez.
+Üst tabloyla birlikte sunulan alt tablolar (takım üyeleri) üst tablonun
+sürümünü artırır.
+
+Okuma tarafı her worker'da süreç içi bir görünüm tutar. Görünüm, worker
+başına en fazla VERSIONS_REFRESH_INTERVAL saniyede bir, tek sorguyla
+veritabanından tazelenir (`refresh` / `refresh_async`). Aralık içinde gelen
+istekler veritabanına hiç gitmez; önbellek isabeti sorgusuz ve bağlantısız
+döner. Bu worker'daki yazmalar görünüme commit anında işlenir. Başka bir
+worker'daki yazma ise en geç VERSIONS_REFRESH_INTERVAL saniye sonra görülür.
+"""
+import logging
+import math
+import os
+import threading
+import time
+from itertools import chain
+from typing import Dict, Iterable, Optional, Set
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, object_mapper
+from starlette.concurrency import run_in_threadpool
+
+from .database import async_engine, engine
+from .models import TableVersion
+
+logger = logging.getLogger("uvicorn.error")
+
+# --- ENV ---
+VERSIONS_REFRESH_INTERVAL = float(os.getenv("VERSIONS_REFRESH_INTERVAL", "1.0"))  # saniye
+
+# Alt tablo -> yanıtlarda birlikte sunulduğu üst tablo
+PARENT_TABLES = {"team_members": "teams"}
+# Hiçbir önbellekli yanıtta sunulmayan iç tablolar: her yüklemede ortak bir
+# sürüm satırını kilitlemeye gerek yok
+UNVERSIONED = {"table_versions", "upload_blobs", "admins", "revoked_tokens", "event_waitlist"}
+# Sürüm artırmayan toplu ifadeler: `.execution_options(bump_versions=False)`.
+# Önbellekli yanıtların güncel tutmak zorunda olmadığı sayaçlar içindir
+# (etkinlik kayıt sayısı; canlı değeri /events/{id}/seats verir).
+
+_PENDING = "versions_pending"  # session.info: bu transaction'da yazılan tablolar
+_BUMPED = "versions_bumped"    # session.info: commit'ten sonra yerel görünüme yazılacak sürümler
+
+_known: Dict[str, int] = {}
+_lock = threading.Lock()
+_refreshed_at = -math.inf  # son tazelemenin (ya da başlayan tazelemenin) zamanı
+_SELECT = select(TableVersion.table_name, TableVersion.version)
+
+
+def _observe(values: Dict[str, int]) -> None:
+    # Sürümler sadece artar; eşzamanlı okumalardan eskisi yenisini ezmesin
+    with _lock:
+        for table, version in values.items():
+            if version > _known.get(table, 0):
+                _known[table] = version
+
+
+def _upsert(conn, tables: Iterable[str]) -> Dict[str, int]:
+    # Satırlar her zaman aynı sırada kilitlenir (iki yazma birbirini beklemesin)
+    rows = [{"table_name": t, "version": 1} for t in sorted(set(tables))]
+    insert = postgresql.insert if conn.dialect.name == "postgresql" else sqlite.insert
+    stmt = insert(TableVersion).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TableVersion.table_name],
+        set_={"version": TableVersion.version + 1},
+    ).returning(TableVersion.table_name, TableVersion.version)
+    return dict(conn.execute(stmt).all())
+
+
+# --- YAZMA: OTURUM OLAYLARI ---
+def _mark(session: Session, tables: Iterable[str]) -> None:
+    pending: Set[str] = session.info.setdefault(_PENDING, set())
+    for table in tables:
+        if table not in UNVERSIONED:
+            pending.add(PARENT_TABLES.get(table, table))
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context) -> None:
+    # after_flush'ta new/dirty/deleted hâlâ flush öncesi durumu gösterir
+    tables = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        tables.update(t.name for t in object_mapper(obj).tables)
+    _mark(session, tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _do_orm_execute(state) -> None:
+    if not state.execution_options.get("bump_versions", True):
+        return
+    if state.is_update or state.is_delete or state.is_insert:
+        table = getattr(state.statement, "table", None)
+        if getattr(table, "name", None):
+            _mark(state.session, [table.name])
+
+
+@event.listens_for(Session, "before_commit")
+def _before_commit(session: Session) -> None:
+    session.flush()  # commit'in kendi flush'ındaki tablolar da not edilsin
+    tables = session.info.pop(_PENDING, None)
+    if tables:
+        session.info[_BUMPED] = _upsert(session.connection(), tables)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    bumped = session.info.pop(_BUMPED, None)
+    if bumped:
+        _observe(bumped)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+    session.info.pop(_BUMPED, None)
+
+
+def bump(*tables: str) -> None:
+    """Verilen tabloların sürümünü kendi transaction'ında artırır (elle geçersiz kılma)."""
+    with engine.begin() as conn:
+        _observe(_upsert(conn, tables))
+
+
+# --- OKUMA ---
+def fetch() -> Dict[str, int]:
+    """Tüm tabloların güncel sürümleri (tek sorgu). Bloklayan çağrıdır."""
+    with engine.connect() as conn:
+        values = dict(conn.execute(_SELECT).all())
+    _observe(values)
+    return values
+
+
+async def fetch_async() -> Dict[str, int]:
+    if async_engine is None:
+        return await run_in_threadpool(fetch)
+    async with async_engine.connect() as conn:
+        values = dict((await conn.execute(_SELECT)).all())
+    _observe(values)
+    return values
+
+
+def _claim_refresh() -> bool:
+    # Aralık dolduysa tazelemeyi bu çağıran üstlenir; aynı anda gelen diğerleri
+    # beklemeden mevcut görünümü kullanır (tek sorgu)
+    global _refreshed_at
+    with _lock:
+        now = time.monotonic()
+        if now - _refreshed_at < VERSIONS_REFRESH_INTERVAL:
+            return False
+        _refreshed_at = now
+        return True
+
+
+def _refresh_failed() -> None:
+    # Veritabanına ulaşılamadıysa önbellek eski görünümle hizmet vermeye devam
+    # eder; bir sonraki istek yeniden dener
+    global _refreshed_at
+    with _lock:
+        _refreshed_at = -math.inf
+    logger.warning("Tablo sürümleri okunamadı; yerel görünüm kullanılıyor", exc_info=True)
+
+
+def refresh() -> Dict[str, int]:
+    """Aralık dolduysa görünümü tazeler (bloklayan); güncel görünümü döndürür."""
+    if _claim_refresh():
+        try:
+            fetch()
+        except Exception:
+            _refresh_failed()
+    return all_versions()
+
+
+async def refresh_async() -> Dict[str, int]:
+    """`refresh`'in event loop'u bloklamayan hâli (önbellek isabet yolu)."""
+    if _claim_refresh():
+        try:
+            await fetch_async()
+        except Exception:
+            _refresh_failed()
+    return all_versions()
+
+
+def invalidate_view() -> None:
+    """Sonraki `refresh` aralığı beklemeden veritabanını okusun (testler, yönetim)."""
+    global _refreshed_at
+    with _lock:
+        _refreshed_at = -math.inf
+
+
+def current(table: str, values: Optional[Dict[str, int]] = None) -> int:
+    """`values` (istekte alınan görünüm) ya da bu süreçteki görünümde tablonun sürümü."""
+    if values is not None:
+        return values.get(table, 0)
+    with _lock:
+        return _known.get(table, 0)
+
+
+def snapshot(tables: Iterable[str], values: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+    """Verilen tabloların sürümleri."""
+    return {t: current(t, values) for t in tables}
+
+
+def all_versions() -> Dict[str, int]:
+    with _lock:
+        return dict(_known)
@@ -0,0 +1,97 @@
+"""
+Senkron (psycopg2 + threadpool) ve async (asyncpg) veritabanı modlarını
+aynı uç üzerinde karşılaştıran basit yük testi.
+
+Önce iki sunucuyu ayrı portlarda başlatın. Yanıt önbelleğini kapatın ki
+her istek gerçekten veritabanına gitsin:
+
+    RESPONSE_CACHE_ENABLED=false DATABASE_ASYNC=false uvicorn app.main:app --port 8000
+    RESPONSE_CACHE_ENABLED=false DATABASE_ASYNC=true  uvicorn app.main:app --port 8001
+
+Sonra:
+
+    python scripts/bench_db_modes.py --sync http://127.0.0.1:8000 \\
+        --async http://127.0.0.1:8001 --path /teams --concurrency 200 --duration 20
+
+Gereksinim: httpx (pip install httpx)
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+
+
+async def _worker(client: httpx.AsyncClient, url: str, deadline: float, latencies: List[float], errors: List[int]):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            r = await client.get(url)
+            if r.status_code >= 400:
+                errors.append(r.status_code)
+                continue
+        except httpx.HTTPError:
+            errors.append(0)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    idx = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[idx]
+
+
+async def run(base_url: str, path: str, concurrency: int, duration: float, warmup: float) -> Dict[str, float]:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        # Isınma: bağlantı havuzlarını doldur, ölçüme katma
+        await asyncio.gather(*[
+            _worker(client, path, time.perf_counter() + warmup, [], []) for _ in range(concurrency)
+        ])
+
+        latencies: List[float] = []
+        errors: List[int] = []
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*[
+            _worker(client, path, deadline, latencies, errors) for _ in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "mean_ms": (statistics.fmean(latencies) * 1000) if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sync", dest="sync_url", default="http://127.0.0.1:8000")
+    parser.add_argument("--async", dest="async_url", default="http://127.0.0.1:8001")
+    parser.add_argument("--path", default="/teams")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    args = parser.parse_args()
+
+    print(f"{args.path} | {args.concurrency} eşzamanlı istemci | {args.duration:.0f} sn")
+    print(f"{'mod':<6} {'istek':>8} {'hata':>6} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for name, url in (("sync", args.sync_url), ("async", args.async_url)):
+        res = asyncio.run(run(url, args.path, args.concurrency, args.duration, args.warmup))
+        print(
+            f"{name:<6} {res['requests']:>8} {res['errors']:>6} {res['rps']:>9.1f} "
+            f"{res['p50_ms']:>9.1f} {res['p99_ms']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Etkinlik kaydı (POST /events/{id}/register) için eşzamanlılık yük testi.
+
+Aynı etkinlik satırına aynı anda çok sayıda kayıt isteği gönderir ve:
+- fazla kayıt (overbooking) olmadığını: başarılı kayıt sayısı boş yer
+  sayısını aşmamalı ve son `registered` değeri `capacity`'yi geçmemeli,
+- sayacın kaybolmadığını: önceki `registered` + başarılı kayıt = sonraki,
+- her turda p50/p99 gecikmeyi (dolu etkinlikte hızlı 409 dahil) raporlar.
+
+Sayaçlar önbelleğe alınmayan GET /events/{id}/seats ile okunur. Test
+sunucusunu hız sınırı kapalı başlatın (tüm istekler tek IP'den gelir):
+
+    RATE_LIMIT_ENABLED=false \\
+        uvicorn app.main:app --port 8000 --workers 3
+
+Her worker'ın havuzu 30 bağlantıya (10 + 20 taşma) çıkabilir; worker sayısı
+x 30, PostgreSQL `max_connections` değerini (varsayılan 100) aşmamalıdır.
+
+Kapasitesi örn. 60 olan bir etkinlik oluşturduktan sonra:
+
+    python scripts/load_test_registration.py --base-url http://127.0.0.1:8000 \\
+        --event-id 12 --concurrency 500 --rounds 3
+
+İlk turda kontenjan dolar; sonraki turlar tamamen dolu satırda hızlı
+reddetmenin (409) gecikmesini ölçer. Fazla kayıt görülürse çıkış kodu 1'dir.
+
+Gereksinim: httpx (pip install httpx)
+"""
+import argparse
+import asyncio
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import httpx
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    idx = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[idx]
+
+
+async def _event_counts(client: httpx.AsyncClient, event_id: int) -> Tuple[int, int]:
+    r = await client.get(f"/events/{event_id}/seats")
+    r.raise_for_status()
+    data = r.json()
+    return data["registered"], data["capacity"]
+
+
+async def _register(client: httpx.AsyncClient, path: str, start: asyncio.Event, results: List[Tuple[int, float]]):
+    await start.wait()  # tüm istemciler aynı anda çıkar
+    began = time.perf_counter()
+    try:
+        r = await client.post(path)
+        code = r.status_code
+    except httpx.HTTPError:
+        code = 0
+    results.append((code, time.perf_counter() - began))
+
+
+async def run_round(client: httpx.AsyncClient, event_id: int, concurrency: int) -> Dict[str, object]:
+    before, capacity = await _event_counts(client, event_id)
+    results: List[Tuple[int, float]] = []
+    start = asyncio.Event()
+    tasks = [
+        asyncio.create_task(_register(client, f"/events/{event_id}/register", start, results))
+        for _ in range(concurrency)
+    ]
+    await asyncio.sleep(0.1)
+    start.set()
+    await asyncio.gather(*tasks)
+    after, _ = await _event_counts(client, event_id)
+
+    codes = Counter(code for code, _ in results)
+    latencies = [latency for _, latency in results]
+    return {
+        "before": before,
+        "after": after,
+        "capacity": capacity,
+        "codes": dict(codes),
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "overbooked": after > capacity or codes[200] > capacity - before or before + codes[200] != after,
+    }
+
+
+async def main_async(args) -> int:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    failed = False
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60.0) as client:
+        print(f"etkinlik {args.event_id} | {args.concurrency} eşzamanlı kayıt | {args.rounds} tur")
+        print(f"{'tur':<4} {'önce':>6} {'sonra':>6} {'kap.':>6} {'p50 ms':>9} {'p99 ms':>9}  kodlar")
+        for i in range(1, args.rounds + 1):
+            res = await run_round(client, args.event_id, args.concurrency)
+            failed |= res["overbooked"]
+            print(
+                f"{i:<4} {res['before']:>6} {res['after']:>6} {res['capacity']:>6} "
+                f"{res['p50_ms']:>9.1f} {res['p99_ms']:>9.1f}  {res['codes']}"
+                + ("  FAZLA KAYIT!" if res["overbooked"] else "")
+            )
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--event-id", type=int, required=True)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
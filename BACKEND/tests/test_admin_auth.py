@@ -0,0 +1,71 @@
+# tests/test_admin_auth.py
+"""
+Admin oturumlarının worker'lar arası iptali.
+
+İptal bilgisi veritabanındadır (bkz. app/security.py): çıkış `revoked_tokens`
+tablosuna yazılır, parola/2FA değişikliği adminin `token_version` değerini
+artırır. "Başka bir worker", bu sürecin kimlik önbelleği boşaltılarak taklit
+edilir: eski token o worker'a ilk kez (önbellek kaçırmasıyla) gelir.
+"""
+import pyotp
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.security import principal_cache
+
+
+def _me_with(token: str) -> int:
+    with TestClient(app) as other:
+        return other.get("/admin/me", headers={"Authorization": f"Bearer {token}"}).status_code
+
+
+def test_logout_is_rejected_on_other_workers(admin_client):
+    token = admin_client.cookies.get("admin_token")
+    assert admin_client.post("/admin/logout").status_code == 200
+    principal_cache.clear()
+    assert _me_with(token) == 401
+
+
+def test_password_change_ends_other_sessions(admin_client):
+    old = admin_client.cookies.get("admin_token")
+    assert _me_with(old) == 200  # önbellekte
+
+    r = admin_client.post(
+        "/admin/password",
+        json={"current_password": "test-parola-123", "new_password": "yeni-parola-456"},
+    )
+    assert r.status_code == 200, r.text
+    # Bu oturum yeni token ile sürer
+    assert admin_client.get("/admin/me").status_code == 200
+
+    principal_cache.clear()
+    assert _me_with(old) == 401
+    r = admin_client.post("/admin/login", json={"email": "admin@ayzek.test", "password": "yeni-parola-456"})
+    assert r.status_code == 200
+
+
+def test_password_change_requires_current_password(admin_client):
+    r = admin_client.post(
+        "/admin/password",
+        json={"current_password": "yanlis-parola", "new_password": "yeni-parola-456"},
+    )
+    assert r.status_code == 400
+
+
+@pytest.mark.parametrize("disable", [False, True])
+def test_2fa_change_ends_other_sessions(admin_client, disable):
+    old = admin_client.cookies.get("admin_token")
+    secret = pyotp.random_base32()
+    r = admin_client.post("/admin/2fa/enable", json={"secret": secret, "code": pyotp.TOTP(secret).now()})
+    assert r.status_code == 200, r.text
+    if disable:
+        old = admin_client.cookies.get("admin_token")
+        assert admin_client.post("/admin/2fa/disable").status_code == 200
+
+    me = admin_client.get("/admin/me")
+    assert me.status_code == 200
+    assert me.json()["is_2fa_enabled"] is not disable
+
+    principal_cache.clear()
+    assert _me_with(old) == 401
@@ -0,0 +1,38 @@
+# tests/test_blog.py
+"""Blog listesinde tam metin arama ve `highlight` parçaları (PostgreSQL)."""
+from datetime import date
+
+import pytest
+from sqlalchemy import func, text, update
+
+from app.crud.blog import SEARCH_CONFIG
+from app.database import engine
+from app.models import Blog
+
+pytestmark = pytest.mark.postgres
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _search_config():
+    # Yapılandırmayı 4c5504e8eed8 kurar (unaccent ile); create_all ile kurulan test
+    # şemasında yoksa, unaccent'siz bir Türkçe kopyası yeterlidir
+    with engine.begin() as conn:
+        if conn.execute(text("SELECT 1 FROM pg_ts_config WHERE cfgname = :n"), {"n": SEARCH_CONFIG}).first() is None:
+            conn.execute(text(f"CREATE TEXT SEARCH CONFIGURATION {SEARCH_CONFIG} (COPY = turkish)"))
+
+
+@pytest.mark.parametrize("include_content", [False, True])
+def test_search_highlight_in_list_items(client, db, include_content):
+    db.add(Blog(title="Sinir ağları", content="Derin öğrenme ve sinir ağları üzerine notlar.",
+                category="Yapay Zeka", date=date(2026, 10, 1)))
+    db.commit()
+    # Vektörü migration'daki tetikleyici doldurur; test şemasında elle
+    db.execute(update(Blog).values(search_vector=func.to_tsvector(SEARCH_CONFIG, Blog.title + " " + Blog.content)))
+    db.commit()
+
+    params = {"q": "öğrenme", "highlight": "true", "include_content": str(include_content).lower()}
+    r = client.get("/blogs", params=params)
+    assert r.status_code == 200, r.text
+    item = r.json()["items"][0]
+    assert "<mark>" in item["highlight"]
+    assert ("content" in item) is include_content
@@ -0,0 +1,34 @@
+# tests/test_cache.py
+"""
+Önbellekli yanıtların doğrulayıcıları (app/cache.py).
+
+Sıkıştırılmış her kodlama kendi güçlü ETag'ini alır; 304 kararı istemciye
+gönderilen değerle verilir.
+"""
+import pytest
+
+from app.models import Team
+
+
+def _seed(db, teams: int = 20):
+    # Gövde COMPRESSION_MIN_SIZE'ı aşsın
+    for i in range(teams):
+        db.add(Team(name=f"Takım {i}", slug=f"takim-{i}", project_name="P", category="K", description="D" * 100))
+    db.commit()
+
+
+@pytest.mark.parametrize("coding", ["gzip", "br"])
+def test_compressed_response_has_strong_per_coding_etag(client, db, coding):
+    _seed(db)
+    plain = client.get("/teams", headers={"Accept-Encoding": "identity"}).headers["ETag"]
+    r = client.get("/teams", headers={"Accept-Encoding": coding})
+    etag = r.headers["ETag"]
+    assert r.headers["Content-Encoding"] == coding
+    assert etag == plain[:-1] + f'-{coding}"' and not etag.startswith("W/")
+
+    again = client.get("/teams", headers={"Accept-Encoding": coding, "If-None-Match": etag})
+    assert again.status_code == 304 and again.headers["ETag"] == etag
+    # Başka bir gösterimin ETag'i bu gövdeyi doğrulamaz
+    other = client.get("/teams", headers={"Accept-Encoding": coding, "If-None-Match": plain})
+    assert other.status_code == 200
+    assert client.get("/teams", headers={"Accept-Encoding": "identity", "If-None-Match": plain}).status_code == 304
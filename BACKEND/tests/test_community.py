@@ -0,0 +1,7 @@
+# tests/test_community.py
+"""Topluluk başvurularının admin uçları."""
+
+
+def test_application_search_requires_admin(client):
+    r = client.get("/community/applications/search", params={"q": "mehmet"})
+    assert r.status_code == 401
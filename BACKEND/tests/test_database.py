@@ -0,0 +1,25 @@
+# tests/test_database.py
+"""Okuma oturumu bağımlılığının (get_read_db) bağlantıyı havuza iadesi."""
+import anyio
+import pytest
+from sqlalchemy import select
+
+from app.database import get_read_db
+
+
+def test_read_session_is_released_when_request_is_cancelled():
+    # İstemci koptuğunda istek iptal edilir; kapanış yine de çalışmalı, yoksa
+    # bağlantı "idle in transaction" kalır ve havuz tükenir
+    async def scenario():
+        deps = get_read_db()
+        db = await deps.__anext__()
+        db.execute(select(1))
+        assert db.in_transaction()
+        with anyio.CancelScope() as scope:
+            scope.cancel()
+            with pytest.raises(StopAsyncIteration):
+                await deps.__anext__()
+        return db
+
+    db = anyio.run(scenario)
+    assert not db.in_transaction()
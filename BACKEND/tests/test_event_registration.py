@@ -0,0 +1,108 @@
+# tests/test_event_registration.py
+"""
+Etkinlik kaydı: eşzamanlılık altında doğruluk (PostgreSQL) ve önbellek etkisi.
+
+Kayıtlar `claim_seat`'in tek koşullu UPDATE'iyle yer alır (bkz.
+crud/events.py); aynı satıra aynı anda gelen istekler satır kilidinde sıraya
+girer. Burada çok sayıda thread, her biri kendi oturumuyla, aynı etkinliğe
+aynı anda kayıt olur: kontenjan aşılmamalı, sayaç kaybolmamalı ve bekleme
+listesi sıraları tekil olmalıdır. HTTP üzerinden 500 eşzamanlı istemciyle
+ölçüm için: scripts/load_test_registration.py.
+
+Kayıt "events" tablo sürümünü artırmaz; önbellekli etkinlik yanıtları kayıt
+dalgasında boşalmaz, canlı sayı /events/{id}/seats'tedir.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import versions
+from app.crud import events as crud_events
+from app.database import SessionLocal
+from app.models import Event
+
+CAPACITY = 60
+ATTEMPTS = 300
+THREADS = 25  # havuz (10 + 20 taşma) tükenmesin
+
+
+def _event(db, capacity: int = CAPACITY) -> int:
+    event = Event(
+        slug=f"yuk-testi-{capacity}", title="Yük testi", description="D", cover_image_url="/x.jpg",
+        start_at=datetime.utcnow() + timedelta(days=7), location="L", category="Atölye",
+        capacity=capacity, registered=0, whatsapp_link="https://chat.whatsapp.com/x",
+    )
+    db.add(event)
+    db.commit()
+    return event.id
+
+
+def _all_at_once(fn, n: int):
+    barrier = threading.Barrier(min(n, THREADS))
+
+    def run(i):
+        if i < THREADS:
+            barrier.wait()  # ilk dalga aynı anda çıkar
+        with SessionLocal() as session:
+            return fn(session, i)
+
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        return list(pool.map(run, range(n)))
+
+
+def test_registration_does_not_bump_event_versions(client, db):
+    event_id = _event(db, capacity=2)
+    client.get(f"/events/{event_id}")
+    before = versions.fetch()
+
+    assert client.post(f"/events/{event_id}/register").status_code == 200
+    assert client.post(f"/events/{event_id}/register", json={"email": "a@example.com", "join_waitlist": True}).status_code == 200
+    assert client.post(f"/events/{event_id}/register", json={"email": "b@example.com", "join_waitlist": True}).status_code == 200
+    assert client.post(f"/events/{event_id}/register").status_code == 409
+
+    after = versions.fetch()
+    assert after.get("events") == before.get("events")
+    assert "event_waitlist" not in after
+    assert client.get(f"/events/{event_id}").headers["X-Cache"] == "HIT"
+
+
+def test_seat_claim_holds_lock_for_one_statement(db, count_queries):
+    # Satır kilidi UPDATE ile COMMIT arasında tutulur; araya sürüm upsert'i girmemeli
+    event_id = _event(db)
+    with SessionLocal() as session, count_queries() as q:
+        assert crud_events.claim_seat(session, event_id) is not None
+    assert q.count == 1 and q.statements[0].startswith("UPDATE events"), str(q)
+
+
+def test_seats_endpoint_is_live_and_uncached(client, db):
+    event_id = _event(db, capacity=2)
+    client.post(f"/events/{event_id}/register")
+    r = client.get(f"/events/{event_id}/seats")
+    assert r.status_code == 200
+    assert r.json() == {"registered": 1, "capacity": 2}
+    assert r.headers["Cache-Control"] == "no-store"
+    assert client.get("/events/999999/seats").status_code == 404
+
+
+@pytest.mark.postgres
+def test_concurrent_registrations_never_overbook(db):
+    event_id = _event(db)
+    seats = _all_at_once(lambda s, i: crud_events.claim_seat(s, event_id), ATTEMPTS)
+
+    taken = [seat for seat in seats if seat is not None]
+    assert len(taken) == CAPACITY
+    # Her başarılı kayıt farklı bir sayaç değeri görür: kayıp güncelleme yok
+    assert sorted(seat[0] for seat in taken) == list(range(1, CAPACITY + 1))
+    db.expire_all()
+    assert db.get(Event, event_id).registered == CAPACITY
+
+
+@pytest.mark.postgres
+def test_concurrent_waitlist_positions_are_unique(db):
+    event_id = _event(db, capacity=0)
+    positions = _all_at_once(
+        lambda s, i: crud_events.join_waitlist(s, event_id, f"kisi{i}@ayzek.test"), 100,
+    )
+    assert sorted(positions) == list(range(1, 101))
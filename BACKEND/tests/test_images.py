@@ -0,0 +1,71 @@
+# tests/test_images.py
+"""
+Yükleme dizini (`upload_blobs`) ve türev üretimi (app/images.py).
+
+Dosyalar geçici bir UPLOAD_DIR'a yazılır. Ham yükleme `<sha256>.<uzantı>`
+adıyla, `store_upload`'ın yaptığı gibi doğrudan diske konur.
+"""
+import hashlib
+import io
+import os
+
+import pytest
+from PIL import Image
+from sqlalchemy import select
+
+from app import images
+from app.database import SessionLocal
+from app.models import UploadBlob
+from app.uploads import PUBLIC_PREFIX
+
+OLD = 1_000_000_000  # 2001: çöp toplayıcının bekleme süresinden çok eski
+
+
+@pytest.fixture()
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(images, "UPLOAD_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _raw_upload(upload_dir, color=(200, 30, 30)) -> str:
+    buf = io.BytesIO()
+    Image.new("RGB", (400, 300), color).save(buf, "PNG")
+    data = buf.getvalue()
+    name = hashlib.sha256(data).hexdigest() + ".png"
+    (upload_dir / name).write_bytes(data)
+    return f"{PUBLIC_PREFIX}/{name}"
+
+
+def _paths(upload_dir, url, variants):
+    return [upload_dir / os.path.basename(u) for u in [url, *(v["url"] for v in variants)]]
+
+
+def test_reupload_refreshes_mtime_of_reused_files(upload_dir, db):
+    url, variants = images.indexed_variants(_raw_upload(upload_dir))
+    assert variants
+    for path in _paths(upload_dir, url, variants):
+        os.utime(path, (OLD, OLD))
+
+    # Aynı içerik tekrar yüklenir: dizindeki hazır sonuç kullanılır
+    again = images.indexed_variants(_raw_upload(upload_dir))
+    assert again == (url, variants)
+    for path in _paths(upload_dir, url, variants):
+        assert path.stat().st_mtime > OLD, path
+
+
+def test_row_is_not_locked_while_deriving(upload_dir, db, monkeypatch):
+    derive = images.make_variants
+    finished = {}
+
+    def other_worker_finishes_first(url):
+        # Türetme sürerken başka bir worker aynı kaydı tamamlar; satır kilitli
+        # olsaydı NOWAIT hemen hata verirdi (PostgreSQL)
+        finished["result"] = derive(url)
+        with SessionLocal() as other:
+            blob = other.scalars(select(UploadBlob).with_for_update(nowait=True)).one()
+            blob.url, blob.variants = finished["result"]
+            other.commit()
+        return None  # bu worker'ın türetmesi başarısız (ör. ham dosya diğerince silindi)
+
+    monkeypatch.setattr(images, "make_variants", other_worker_finishes_first)
+    assert images.indexed_variants(_raw_upload(upload_dir)) == finished["result"]
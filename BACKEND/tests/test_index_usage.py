@@ -0,0 +1,63 @@
+# tests/test_index_usage.py
+"""
+Sıcak liste sorgularının indeks kullandığını EXPLAIN ile doğrular (PostgreSQL).
+
+Crud katmanının ürettiği ifadelerin aynısı (aynı WHERE/ORDER BY) EXPLAIN
+olarak gönderilir ve planda beklenen indeksin adı aranır. Test tablolarında
+planlayıcı haklı olarak sıralı taramayı (Seq Scan) seçer ve istatistiklere göre
+tek kolonlu bir indeks + Sort da seçebilir; bu yüzden oturumda sıralı tarama,
+bitmap tarama ve Sort kapatılır. Böylece beklenen indeksin WHERE + ORDER BY'ı
+ayrı bir sıralama olmadan *karşılayabildiği* kontrol edilir. İndeksler
+modellerin `__table_args__`'ından kurulur; migration'lar (c8d2f6a4e917,
+f2b8d4a6c1e3) aynı adları ve kolonları kullanır.
+"""
+from typing import Callable, List, Tuple
+
+import pytest
+from sqlalchemy import select
+
+from app.crud import blog, crew, events, gallery_events, journey, poster, teams
+from app.database import engine
+from app.models import ApplicationStatus, CommunityApplication
+
+pytestmark = pytest.mark.postgres
+
+
+def _community_stmt():
+    # crud/community.py list_applications: status filtresi + created_at DESC, id DESC
+    return (
+        select(CommunityApplication)
+        .where(CommunityApplication.status == ApplicationStatus.pending)
+        .order_by(CommunityApplication.created_at.desc(), CommunityApplication.id.desc())
+        .limit(50)
+    )
+
+
+# (ad, ifade üreten fonksiyon, beklenen indeks)
+CHECKS: List[Tuple[str, Callable, str]] = [
+    ("events list", lambda: events._events_stmt(0, 20, None), "ix_events_start_at_id"),
+    ("events upcoming", lambda: events._upcoming_stmt(50), "ix_events_start_at_id"),
+    ("blogs list", lambda: blog._list_stmts(None, None, 1, 20, None)[0], "ix_blogs_date_id"),
+    ("posters active", lambda: poster._multi_stmt(0, 100, True), "ix_posters_active_order"),
+    ("crew grouped", crew._grouped_stmt, "ix_crew_members_category_order"),
+    ("journey grouped", journey._grouped_stmt, "ix_journey_people_year_order"),
+    ("gallery list", gallery_events._list_stmt, "ix_gallery_events_date"),
+    ("teams featured", lambda: teams._featured_stmt(4), "ix_teams_featured"),
+    ("community by status", _community_stmt, "ix_community_applications_status_created"),
+]
+
+
+def _explain(conn, stmt) -> str:
+    compiled = stmt.compile(dialect=conn.dialect)
+    rows = conn.exec_driver_sql("EXPLAIN " + str(compiled), compiled.params).all()
+    return "\n".join(r[0] for r in rows)
+
+
+@pytest.mark.parametrize("build, index", [c[1:] for c in CHECKS], ids=[c[0] for c in CHECKS])
+def test_hot_query_uses_index(build, index):
+    with engine.connect() as conn:
+        for setting in ("enable_seqscan", "enable_bitmapscan", "enable_sort"):
+            conn.exec_driver_sql(f"SET {setting} = off")
+        plan = _explain(conn, build())
+        conn.rollback()
+    assert index in plan, plan
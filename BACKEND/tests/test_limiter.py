@@ -0,0 +1,31 @@
+# tests/test_limiter.py
+"""
+Hız sınırı deposunun açılış kontrolü (app/limiter.py).
+"""
+import logging
+
+import pytest
+
+from app import limiter
+
+
+@pytest.fixture(autouse=True)
+def _enabled(monkeypatch):
+    monkeypatch.setattr(limiter, "RATE_LIMIT_ENABLED", True)
+
+
+def test_memory_storage_with_many_workers_warns(caplog):
+    caplog.set_level(logging.WARNING, logger="uvicorn.error")
+    limiter.check_storage("memory://", workers=4, require_shared=False)
+    assert "memory://, 4 worker" in caplog.text
+
+
+def test_memory_storage_with_many_workers_can_fail_closed():
+    with pytest.raises(RuntimeError):
+        limiter.check_storage("memory://", workers=4, require_shared=True)
+
+
+@pytest.mark.parametrize("uri, workers", [("redis://localhost:6379/1", 4), ("memory://", 1)])
+def test_shared_storage_or_single_worker_is_fine(caplog, uri, workers):
+    limiter.check_storage(uri, workers=workers, require_shared=True)
+    assert caplog.text == ""
@@ -0,0 +1,19 @@
+# tests/test_ordering.py
+"""Toplu yeniden sıralama ile "en sona ekle" aynı numaralandırmayı kullanır."""
+from app.crud import poster as crud_poster
+from app.schemas.poster import PosterCreate
+
+
+def _poster(db, title: str):
+    return crud_poster.create(db, PosterCreate(title=title))
+
+
+def test_reorder_and_append_share_one_based_positions(db):
+    ids = [_poster(db, f"Afiş {i}").id for i in range(3)]
+    assert [p.order_index for p in crud_poster.get_multi(db)] == [1, 2, 3]
+
+    reordered = crud_poster.reorder(db, list(reversed(ids)))
+    assert [(p.id, p.order_index) for p in reordered] == list(zip(reversed(ids), [1, 2, 3]))
+
+    # Yeni kayıt en sona gelir; sıralanmış bir kayıtla çakışmaz
+    assert _poster(db, "Yeni").order_index == 4
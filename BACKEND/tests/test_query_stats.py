@@ -0,0 +1,53 @@
+# tests/test_query_stats.py
+"""
+İstek başına SQL ölçümünün logları (app/query_stats.py).
+
+Rapor, istek sonunda toplanan `RequestQueries` üzerinden doğrudan çağrılır.
+"""
+import logging
+
+import pytest
+
+from app import query_stats
+from app.query_stats import QueryStatsMiddleware, RequestQueries
+
+SCOPE = {"type": "http", "method": "GET", "path": "/teams"}
+
+
+@pytest.fixture()
+def warnings(caplog):
+    caplog.set_level(logging.WARNING, logger="uvicorn.error")
+    return caplog
+
+
+def test_slow_request_log_names_slowest_statement(warnings, monkeypatch):
+    monkeypatch.setattr(query_stats, "SLOW_REQUEST_DB_MS", 100)
+    stats = RequestQueries()
+    stats.record("SELECT teams.id FROM teams", 0.02)
+    stats.record("SELECT team_members.id FROM team_members WHERE team_members.team_id IN (?)", 0.3)
+
+    QueryStatsMiddleware._report(SCOPE, stats)
+    assert "Yavaş istek: GET unmatched, 2 sorgu" in warnings.text
+    assert "(300.0 ms): SELECT team_members.id" in warnings.text
+
+
+def test_n_plus_one_is_reported_above_threshold(warnings, monkeypatch):
+    monkeypatch.setattr(query_stats, "SQL_N_PLUS_ONE_THRESHOLD", 3)
+    stats = RequestQueries()
+    stats.record("SELECT teams.id FROM teams", 0.001)
+    for n in range(1, 5):
+        # selectin/IN listeleri uzunluktan bağımsız tek şekil sayılır
+        params = ", ".join(f"%(p_{i})s" for i in range(n))
+        stats.record(f"SELECT * FROM team_members WHERE team_id IN ({params})", 0.001)
+
+    QueryStatsMiddleware._report(SCOPE, stats)
+    assert "Olası N+1: GET unmatched isteğinde aynı sorgu 4 kez" in warnings.text
+    assert "IN (?)" in warnings.text
+
+
+def test_quiet_request_logs_nothing(warnings):
+    stats = RequestQueries()
+    for _ in range(query_stats.SQL_N_PLUS_ONE_THRESHOLD):
+        stats.record("SELECT 1", 0.001)
+    QueryStatsMiddleware._report(SCOPE, stats)
+    assert warnings.text == ""
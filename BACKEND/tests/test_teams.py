@@ -0,0 +1,77 @@
+# tests/test_teams.py
+"""
+Takım okuma uçlarının sorgu bütçesi.
+
+Üyeler `selectinload` ile tek bir `IN (...)` sorgusunda yüklenir (bkz.
+crud/teams.py); sorgu sayısı takım ve üye sayısından bağımsız olmalıdır.
+Serileştirme sırasında takım başına lazy-load (N+1) olursa bu testler düşer.
+"""
+import pytest
+
+from app.models import Team, TeamMember
+
+# takımlar + üyeler
+TEAM_QUERY_BUDGET = 2
+
+
+def _seed(db, teams: int = 5, members: int = 3, featured: int = 2):
+    for i in range(teams):
+        db.add(Team(
+            name=f"Takım {i}",
+            slug=f"takim-{i}",
+            project_name=f"Proje {i}",
+            category="Yazılım",
+            description="Açıklama",
+            is_featured=i < featured,
+            members=[TeamMember(name=f"Üye {i}-{j}", role="Geliştirici") for j in range(members)],
+        ))
+    db.commit()
+    return db.query(Team).order_by(Team.id).first().id
+
+
+@pytest.mark.parametrize("path, expected", [("/teams", 5), ("/teams/featured", 2)])
+def test_team_lists_query_budget(client, db, count_queries, path, expected):
+    _seed(db)
+    with count_queries() as q:
+        r = client.get(path)
+    assert r.status_code == 200
+    assert len(r.json()) == expected
+    assert all(len(team["members"]) == 3 for team in r.json())
+    assert q.count == TEAM_QUERY_BUDGET, str(q)
+
+
+def test_team_detail_query_budget(client, db, count_queries):
+    team_id = _seed(db)
+    with count_queries() as q:
+        r = client.get(f"/teams/{team_id}")
+    assert r.status_code == 200
+    assert len(r.json()["members"]) == 3
+    assert q.count == TEAM_QUERY_BUDGET, str(q)
+
+
+def test_team_list_budget_does_not_grow_with_rows(client, db, count_queries):
+    _seed(db, teams=2, members=1)
+    with count_queries() as small:
+        client.get("/teams")
+    extra = [
+        Team(
+            name=f"Ek {i}", slug=f"ek-{i}", project_name="P", category="K", description="D",
+            members=[TeamMember(name=f"Ek üye {i}-{j}", role="R") for j in range(10)],
+        )
+        for i in range(20)
+    ]
+    db.add_all(extra)
+    db.commit()
+    with count_queries() as large:
+        r = client.get("/teams")
+    assert len(r.json()) == 22
+    assert small.count == large.count == TEAM_QUERY_BUDGET, str(large)
+
+
+def test_cached_team_list_runs_no_queries(client, db, count_queries):
+    _seed(db)
+    client.get("/teams")
+    with count_queries() as q:
+        r = client.get("/teams")
+    assert r.headers["X-Cache"] == "HIT"
+    assert q.count == 0, str(q)
@@ -0,0 +1,94 @@
+# tests/test_upload_gc.py
+"""
+Yetim yükleme dosyalarının temizliği (app/upload_gc.py).
+
+Dosyalar geçici bir klasöre yazılır; referanslar veritabanındaki kayıtlardan
+gelir. Eski dosyalar mtime'ları geriye alınarak taklit edilir.
+"""
+import os
+
+from app.models import Team, UploadBlob
+from app.upload_gc import collect_garbage
+from app.uploads import PUBLIC_PREFIX
+
+OLD = 1_000_000_000  # bekleme süresinden çok eski
+KEPT = "a" * 64
+ORPHAN = "b" * 64
+
+
+def _file(directory, name: str, old: bool = True):
+    path = directory / name
+    path.write_bytes(b"x" * 10)
+    if old:
+        os.utime(path, (OLD, OLD))
+    return path
+
+
+def _reference(db, name: str) -> None:
+    db.add(Team(
+        name="Takım", slug="takim", project_name="P", category="K", description="D",
+        photo_url=f"{PUBLIC_PREFIX}/{name}",
+    ))
+    db.commit()
+
+
+def _gc(db, tmp_path, **kw):
+    upload_dir = tmp_path / "uploads"
+    return collect_garbage(
+        db, upload_dir=str(upload_dir), quarantine_dir=str(tmp_path / "quarantine"), grace_hours=24, **kw,
+    )
+
+
+def _uploads(tmp_path):
+    upload_dir = tmp_path / "uploads"
+    upload_dir.mkdir(exist_ok=True)
+    return upload_dir
+
+
+def test_referenced_file_and_its_variants_are_kept(db, tmp_path):
+    uploads = _uploads(tmp_path)
+    _reference(db, f"{KEPT}.jpg")
+    kept = [_file(uploads, f"{KEPT}.jpg"), _file(uploads, f"{KEPT}-640.webp"), _file(uploads, f"{KEPT}-320.avif")]
+    orphan = _file(uploads, f"{ORPHAN}.jpg")
+
+    report = _gc(db, tmp_path, apply=True)
+    assert report.kept_referenced == 3
+    assert report.removed == 1 and report.orphans == [orphan.name]
+    assert all(path.exists() for path in kept)
+    assert not orphan.exists()
+
+
+def test_recent_file_is_kept(db, tmp_path):
+    recent = _file(_uploads(tmp_path), f"{ORPHAN}.jpg", old=False)
+    report = _gc(db, tmp_path, apply=True)
+    assert report.kept_recent == 1 and report.removed == 0
+    assert recent.exists()
+
+
+def test_dry_run_removes_nothing(db, tmp_path):
+    orphan = _file(_uploads(tmp_path), f"{ORPHAN}.jpg")
+    report = _gc(db, tmp_path)
+    assert report.dry_run and report.orphans == [orphan.name]
+    assert report.removed == 0
+    assert orphan.exists()
+
+
+def test_quarantine_moves_file_and_drops_index_row(db, tmp_path):
+    uploads = _uploads(tmp_path)
+    name = f"{ORPHAN}.jpg"
+    db.add(UploadBlob(sha256=ORPHAN, url=f"{PUBLIC_PREFIX}/{name}", content_type="image/jpeg", size=10))
+    db.commit()
+    _file(uploads, name)
+
+    first = _gc(db, tmp_path, apply=True, quarantine=True)
+    assert first.removed == 1 and first.index_rows_removed == 1
+    assert not (uploads / name).exists()
+    assert os.path.isfile(os.path.join(first.quarantine_path, name))
+    assert db.get(UploadBlob, ORPHAN) is None
+
+    # Aynı adlı dosya tekrar karantinaya alınır: öncekinin üzerine yazılmaz
+    _file(uploads, name)
+    second = _gc(db, tmp_path, apply=True, quarantine=True)
+    assert second.quarantine_path != first.quarantine_path
+    assert os.path.isfile(os.path.join(first.quarantine_path, name))
+    assert os.path.isfile(os.path.join(second.quarantine_path, name))
@@ -0,0 +1,100 @@
+# tests/test_versions.py
+"""
+Veritabanındaki tablo sürümleri ve önbelleğin worker'lar arası geçersizliği.
+
+Sürüm yazmanın kendi transaction'ında artar (bkz. app/versions.py); önbellek
+kararı en fazla VERSIONS_REFRESH_INTERVAL'da bir veritabanından tazelenen
+sürümlerle verilir. "Başka bir
+worker"ın yazması burada, bu sürecin yerel görünümüne dokunmadan doğrudan
+veritabanında yapılan bir güncellemeyle taklit edilir.
+"""
+from sqlalchemy import select, update
+
+from app import versions
+from app.crud import event_suggestions
+from app.database import engine
+from app.models import EventSuggestion, TableVersion, Team
+
+
+def _db_version(db, table: str) -> int:
+    return db.scalar(select(TableVersion.version).where(TableVersion.table_name == table)) or 0
+
+
+def _team(**kw) -> Team:
+    return Team(name="Takım", slug=kw.pop("slug", "takim"), project_name="P", category="K", description="D", **kw)
+
+
+def test_commit_bumps_version_in_same_transaction(db):
+    before = _db_version(db, "teams")
+    db.add(_team())
+    db.commit()
+    assert _db_version(db, "teams") == before + 1
+    assert versions.current("teams") == before + 1
+
+
+def test_bulk_update_bumps_version(db):
+    db.add(_team())
+    db.commit()
+    before = _db_version(db, "teams")
+    db.execute(update(Team).values(is_featured=True))
+    db.commit()
+    assert _db_version(db, "teams") == before + 1
+
+
+def test_rollback_does_not_bump(db):
+    before = _db_version(db, "teams")
+    db.add(_team())
+    db.flush()
+    db.rollback()
+    db.commit()
+    assert _db_version(db, "teams") == before
+
+
+def test_write_from_another_worker_invalidates_cache(client, db):
+    db.add(_team())
+    db.commit()
+    first = client.get("/teams")
+    assert client.get("/teams").headers["X-Cache"] == "HIT"
+
+    # Diğer worker: veriyi ve sürümü bu sürecin haberi olmadan değiştirir
+    with engine.begin() as conn:
+        conn.execute(update(Team.__table__).values(name="Yeni ad"))
+        conn.execute(
+            update(TableVersion.__table__)
+            .where(TableVersion.table_name == "teams")
+            .values(version=TableVersion.version + 1)
+        )
+
+    # Aralık dolmadan bu worker eski görünümle hizmet verir
+    assert client.get("/teams").headers["X-Cache"] == "HIT"
+
+    versions.invalidate_view()  # VERSIONS_REFRESH_INTERVAL doldu
+    r = client.get("/teams", headers={"If-None-Match": first.headers["ETag"]})
+    assert r.status_code == 200
+    assert r.headers["X-Cache"] == "MISS"
+    assert r.json()[0]["name"] == "Yeni ad"
+
+
+def test_view_is_refreshed_at_most_once_per_interval(count_queries):
+    versions.invalidate_view()
+    with count_queries() as q:
+        versions.refresh()
+        versions.refresh()
+    assert q.count == 1 and "table_versions" in q.statements[0], str(q)
+
+
+def test_count_cache_follows_versions_from_another_worker(db):
+    db.add(EventSuggestion(title="Öneri", description="D", contact="a@example.com"))
+    db.commit()
+    assert event_suggestions.list_suggestions(db).total == 1
+
+    with engine.begin() as conn:
+        conn.execute(EventSuggestion.__table__.insert().values(title="Öneri 2", description="D", contact="b@example.com"))
+        conn.execute(
+            update(TableVersion.__table__)
+            .where(TableVersion.table_name == "event_suggestions")
+            .values(version=TableVersion.version + 1)
+        )
+
+    versions.invalidate_view()  # VERSIONS_REFRESH_INTERVAL doldu
+    assert event_suggestions.list_suggestions(db).total == 2
@@ -70,7 +70,7 @@ export function BlogManagement({ onNotify }: { onNotify: (msg: string) => void }
     setLoading(true)
     try {
       // api.get kullanıyoruz (Cookie otomatik gider)
-      const { data } = await api.get<BlogListResponse>("/blogs", { params: { page: 1, page_size: 100 } })
+      const { data } = await api.get<BlogListResponse>("/blogs", { params: { page: 1, page_size: 100, include_content: true } })
       setItems(data.items || [])
     } catch (e) {
       console.error("Blog list hata:", e)
@@ -42,7 +42,7 @@ function normalizeImageUrl(v: string | null | undefined) {
 type BlogFromAPI = {
   id: number
   title: string
-  content: string
+  content?: string // liste kartlarında gelmez, sadece /blogs/{id}
   author: string
   category: string
   cover_image?: string | null
@@ -64,7 +64,6 @@ type BlogPost = {
   category: string
   date: string
   excerpt: string
-  content: string
   authorName: string
   coverImage?: string | null
 }
@@ -84,6 +83,19 @@ export function BlogExplorer() {
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState<string>("")
   const [selectedPost, setSelectedPost] = useState<BlogPost | null>(null)
+  // Liste içerik taşımaz; yazı açılınca tam metin bir kez çekilip saklanır
+  const [contents, setContents] = useState<Record<number, string>>({})
+
+  const openPost = async (post: BlogPost) => {
+    setSelectedPost(post)
+    if (contents[post.id] !== undefined) return
+    try {
+      const { data } = await api.get<BlogFromAPI>(`/blogs/${post.id}`)
+      setContents((prev) => ({ ...prev, [post.id]: data.content || "" }))
+    } catch (e) {
+      console.error(e)
+    }
+  }
 
   // Kategori şeridi scroll
   const catsRef = useRef<HTMLDivElement | null>(null)
@@ -113,10 +125,7 @@ export function BlogExplorer() {
           title: b.title,
           category: (b.category || "").toString().trim(),
           date: b.date,
-          excerpt:
-            (b.preview && b.preview.trim()) ||
-            (b.content ? b.content.replace(/\s+/g, " ").slice(0, 160) + "…" : ""),
-          content: b.content,
+          excerpt: (b.preview || "").replace(/\s+/g, " ").trim().slice(0, 160),
           authorName: b.author || "AYZEK Ekibi",
           coverImage: normalizeImageUrl(b.cover_image),
         }))
@@ -275,7 +284,7 @@ export function BlogExplorer() {
 
               <Dialog>
                 <DialogTrigger asChild>
-                  <Button className="w-full text-xs sm:text-sm h-8 sm:h-9 md:h-10" onClick={() => setSelectedPost(post)}>
+                  <Button className="w-full text-xs sm:text-sm h-8 sm:h-9 md:h-10" onClick={() => openPost(post)}>
                     Yazıyı Oku
                   </Button>
                 </DialogTrigger>
@@ -310,7 +319,7 @@ export function BlogExplorer() {
                     )}
                     {/* DÜZELTME: break-words eklendi */}
                     <article className="text-[15px] leading-7 text-foreground/90 whitespace-pre-wrap break-words">
-                      {post.content}
+                      {contents[post.id] ?? "Yükleniyor…"}
                     </article>
                   </div>
                 </DialogContent>